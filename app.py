@@ -1,12 +1,12 @@
-from fastapi import FastAPI, HTTPException, Request, Form
+from fastapi import FastAPI, HTTPException, Request, Form, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware 
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, JSONResponse, StreamingResponse
 import sys, os
 import json 
 import logging 
 import datetime as dt
+from typing import List, Optional
 from fastapi.responses import FileResponse
-import tempfile
 
 # Add logger configuration
 logging.basicConfig(level=logging.INFO)
@@ -14,12 +14,34 @@ logger = logging.getLogger(__name__)
 
 sys.path.append(os.path.dirname(__file__) + "/ncaafFiles/")
 from ncaafGamelines import *
-from ncaafGetData import get_team_stats, get_player_stats
+from ncaafGetData import get_player_stats
 from ncaafTeams import NcaafTeam
 from ncaafEvents import ncaaf_events_manager
+from ncaafData import scrape_team_season, NCAAF_TEAMS, YEARS
+from ncaafTeamRegistry import canonical_id
+from ncaafStats import game_log_store
+from ncaafHttp import http_client
+from ncaafLifecycle import lifecycle
+from ncaafBackfill import backfill_status
+from ncaafScheduler import gameline_scheduler
+from ncaafIngest import ingest_chunks_async, iter_upload_chunks
+from ncaafExecutors import run_db, run_http
+from ncaafJobs import job_store
+from ncaafChanges import change_broadcaster, parse_cursor
+from ncaafOdds import fair_lines, fair_columns
+from ncaafScanner import line_scanner
 
 app = FastAPI()
 
+@app.on_event("startup")
+def start_refresh_lifecycle():
+    """Start scheduled refreshes (only one worker becomes the owner)"""
+    lifecycle.start()
+
+@app.on_event("shutdown")
+def stop_refresh_lifecycle():
+    lifecycle.stop()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -28,58 +50,166 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# COMPREHENSIVE NCAAF TEAMS LIST - UPDATED
-NCAAF_TEAMS = [
-    "Alabama", "Ohio State", "Georgia", "Michigan", "Clemson", "Texas", "Oklahoma",
-    "Notre Dame", "LSU", "USC", "Penn State", "Florida State", "Oregon", "Texas A&M",
-    "Tennessee", "Utah", "Washington", "Miami", "Wisconsin", "Auburn", "Florida",
-    "Michigan State", "Iowa", "Oklahoma State", "Arkansas", "Kentucky", "UCLA",
-    "North Carolina", "Baylor", "Mississippi", "Kansas State", "TCU", "Pittsburgh",
-    "Louisville", "NC State", "Texas Tech", "South Carolina", "West Virginia",
-    "Stanford", "Boise State", "Cincinnati", "Houston", "UCF", "BYU", "San Diego State",
-    "Fresno State", "Appalachian State", "Coastal Carolina", "Liberty", "Army", "Navy",
-    "Air Force", "Tulane", "Memphis", "SMU", "East Carolina", "Tulsa", "Temple",
-    "South Florida", "Connecticut", "Massachusetts", "Old Dominion", "Charlotte",
-    "Florida Atlantic", "Florida International", "Marshall", "Western Kentucky",
-    "Middle Tennessee", "Louisiana Tech", "Rice", "UTSA", "North Texas", "UTEP",
-    "Southern Miss", "Arkansas State", "Louisiana", "Louisiana-Monroe", "Troy",
-    "South Alabama", "Georgia State", "Georgia Southern", "James Madison",
-    "Jacksonville State", "Sam Houston", "Kennesaw State", "Delaware", "Missouri",
-    "Vanderbilt", "Mississippi State", "South Carolina", "Kentucky", "Arkansas",
-    "Arizona", "Arizona State", "Colorado", "Utah", "UCLA", "USC", "California",
-    "Stanford", "Oregon", "Oregon State", "Washington", "Washington State",
-    "Illinois", "Indiana", "Iowa", "Maryland", "Michigan", "Michigan State",
-    "Minnesota", "Nebraska", "Northwestern", "Ohio State", "Penn State",
-    "Purdue", "Rutgers", "Wisconsin", "Boston College", "Clemson", "Duke",
-    "Florida State", "Georgia Tech", "Louisville", "Miami", "NC State",
-    "North Carolina", "Pittsburgh", "Syracuse", "Virginia", "Virginia Tech",
-    "Wake Forest", "Baylor", "Iowa State", "Kansas", "Kansas State",
-    "Oklahoma", "Oklahoma State", "TCU", "Texas", "Texas Tech", "West Virginia",
-    "UAB", "UTEP", "New Mexico State", "Samford", "Eastern Illinois", "Charlotte"
-]
-
-# Remove duplicates and sort
-NCAAF_TEAMS = sorted(list(set(NCAAF_TEAMS)))
-
-# Years for dropdown
-YEARS = [str(year) for year in range(2020, 2026)]  # Extended to 2025
-
 @app.get("/ncaaf/gamelines")
-def get_lines():
-    """Main gamelines endpoint"""
+async def get_lines(request: Request, source: str = None, team: str = None, start: str = None,
+              end: str = None, limit: int = None, cursor: str = None):
+    """
+    Main gamelines endpoint.
+    
+    Without parameters the whole table is served from an in-memory snapshot
+    (supports If-None-Match). source, team, start/end (YYYY-MM-DD) filter it;
+    limit pages it, with next_cursor to pass back as cursor.
+    """
+    if source or team or start or end or cursor or limit is not None:
+        return await run_db(query_gamelines, source, team, start, end, limit, cursor)
+    
     try:
-        manager = GamelineManager()
-        db_gamelines = manager.read_gamelines()
+        snapshot = await run_db(GamelineManager().read_snapshot)
+        headers = {"ETag": snapshot.etag}
         
-        if db_gamelines:
-            return {"Gamelines": {"manual": db_gamelines}}
-        else:
-            return {"Gamelines": {"manual": []}}
+        if_none_match = request.headers.get("if-none-match", "")
+        if snapshot.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=snapshot.body, media_type="application/json", headers=headers)
         
     except Exception as e:
         print(f"Error in /ncaaf/gamelines: {e}")
         return {"Gamelines": {"manual": []}}
 
+def validate_dates(*values):
+    """400 unless every given date is YYYY-MM-DD"""
+    for value in values:
+        if value:
+            try:
+                dt.date.fromisoformat(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid date '{value}', expected YYYY-MM-DD")
+
+def job_accepted(job_id, created):
+    """Body for endpoints that hand their work to a background job"""
+    return {
+        "job_id": job_id,
+        "status": "queued" if created else "already running",
+        "status_url": f"/ncaaf/jobs/{job_id}"
+    }
+
+def query_gamelines(source, team, start, end, limit, cursor):
+    """Filtered / paged read for /ncaaf/gamelines (blocking, run it on the db pool)"""
+    validate_dates(start, end)
+    
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if cursor and limit is None:
+        limit = MAX_PAGE_SIZE
+    
+    try:
+        after = parse_gameline_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    gamelines = GamelineManager().read_gamelines(
+        source=source, team=team, start_date=start, end_date=end, after=after, limit=limit
+    )
+    next_cursor = gameline_cursor(gamelines[-1]) if limit and len(gamelines) == limit else None
+    
+    return {"Gamelines": {"manual": gamelines}, "next_cursor": next_cursor}
+
+@app.get("/ncaaf/gamelines/books")
+async def get_lines_by_game(team: str = None, start: str = None, end: str = None):
+    """Every sportsbook's line for each game side by side, for price comparison"""
+    validate_dates(start, end)
+    gamelines = await run_db(GamelineManager().read_gamelines, team=team, start_date=start, end_date=end)
+    return {"games": merge_gamelines(gamelines)}
+
+FAIR_GAME_FIELDS = ['id', 'source', 'game_day', 'start_time', 'home_team', 'away_team',
+                    'home_spread', 'away_spread', 'over_under']
+
+def fair_gamelines(source, team, start, end, layout):
+    """Gamelines with odds analytics for /ncaaf/gamelines/fair (blocking, run it on the db pool)"""
+    gamelines = GamelineManager().read_gamelines(source=source, team=team, start_date=start, end_date=end)
+    games = [{field: gameline[field] for field in FAIR_GAME_FIELDS} for gameline in gamelines]
+    if layout == "columns":
+        return {"games": games, "markets": fair_columns(gamelines)}
+    return {"games": [{**game, **markets} for game, markets in zip(games, fair_lines(gamelines))]}
+
+@app.get("/ncaaf/gamelines/fair")
+async def get_fair_lines(source: str = None, team: str = None, start: str = None, end: str = None,
+                         layout: str = "rows"):
+    """
+    Implied probabilities, overround and no-vig fair prices for the moneyline,
+    spread and total of every stored line (filters as /ncaaf/gamelines).
+    layout=columns returns each market as arrays parallel to "games".
+    """
+    validate_dates(start, end)
+    if layout not in ("rows", "columns"):
+        raise HTTPException(status_code=400, detail="layout must be 'rows' or 'columns'")
+    return await run_db(fair_gamelines, source, team, start, end, layout)
+
+@app.get("/ncaaf/gamelines/best")
+async def get_best_lines(team: str = None, start: str = None, end: str = None, kind: str = None):
+    """
+    Best price on each side of every game across books, with the arbitrages
+    and middles they make. Rescans only the games written since the last call.
+    kind=arbitrage or kind=middle keeps only games that have one.
+    """
+    validate_dates(start, end)
+    if kind not in (None, "arbitrage", "middle"):
+        raise HTTPException(status_code=400, detail="kind must be 'arbitrage' or 'middle'")
+    games = await run_db(line_scanner.read, team=team, start_date=start, end_date=end, kind=kind)
+    return {"games": games}
+
+def parse_timestamp(value):
+    """400 unless value is an ISO date/datetime; returns it in the stored 'YYYY-MM-DD HH:MM:SS' form"""
+    if not value:
+        return None
+    try:
+        return dt.datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp '{value}', expected YYYY-MM-DD[THH:MM:SS]")
+
+@app.get("/ncaaf/gamelines/history")
+async def get_line_history(home: str, away: str, game_day: str = None, source: str = None,
+                           start: str = None, end: str = None, interval: int = None, points: int = None):
+    """
+    Line movement for one game: every price change per sportsbook, oldest first.
+
+    start/end (UTC) bound the time range. interval (seconds) or points
+    downsample to the line standing at the end of each interval.
+    """
+    validate_dates(game_day)
+    start, end = parse_timestamp(start), parse_timestamp(end)
+    if interval is not None and interval < 1:
+        raise HTTPException(status_code=400, detail="interval must be at least 1 second")
+    if points is not None and not 1 <= points <= MAX_HISTORY_POINTS:
+        raise HTTPException(status_code=400, detail=f"points must be between 1 and {MAX_HISTORY_POINTS}")
+
+    history = await run_db(
+        GamelineManager().read_history, home, away, game_day=game_day, source=source,
+        start=start, end=end, interval=interval, points=points
+    )
+    return {"home_team": canonical_name(home), "away_team": canonical_name(away), "history": history}
+
+@app.get("/ncaaf/gamelines/stream")
+async def stream_changes(request: Request, cursor: str = None):
+    """
+    Server-Sent Events feed of gameline and event changes, instead of polling
+    /ncaaf/gamelines. Each message's id is a resume cursor: reconnect with it
+    as ?cursor= (or Last-Event-ID, which EventSource sends by itself) to get
+    only what was missed. A 'reset' event means the gap is too old to replay.
+    """
+    cursor = cursor or request.headers.get("last-event-id")
+    try:
+        positions = parse_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        change_broadcaster.stream(positions),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/ncaaf/gamelines/manual", response_class=HTMLResponse)
 def manual_input_form():
     """Serve HTML form for manual NCAAF gameline input with upcoming events"""
@@ -354,13 +484,32 @@ def manual_input_form():
                     const statusElement = document.getElementById('update-status');
                     statusElement.innerHTML = 'Updating events...';
                     
+                    // The update runs as a background job: poll it until it finishes
+                    function pollJob(statusUrl) {{
+                        fetch(statusUrl)
+                            .then(response => response.json())
+                            .then(job => {{
+                                if (job.status === 'done') {{
+                                    statusElement.innerHTML = `✅ Updated ${{job.result}} events`;
+                                    // Reload the page to show new events
+                                    setTimeout(() => location.reload(), 1000);
+                                }} else if (job.status === 'queued' || job.status === 'running') {{
+                                    setTimeout(() => pollJob(statusUrl), 1000);
+                                }} else {{
+                                    statusElement.innerHTML = `❌ Failed to update events${{job.error ? ': ' + job.error : ''}}`;
+                                }}
+                            }})
+                            .catch(error => {{
+                                statusElement.innerHTML = '❌ Error checking update status';
+                                console.error('Error:', error);
+                            }});
+                    }}
+                    
                     fetch('/ncaaf/events/update?days=7&use_gamelines=false')
                         .then(response => response.json())
                         .then(data => {{
-                            if (data.status === 'success') {{
-                                statusElement.innerHTML = `✅ Updated ${{data.events_updated}} events`;
-                                // Reload the page to show new events
-                                setTimeout(() => location.reload(), 1000);
+                            if (data.status_url) {{
+                                pollJob(data.status_url);
                             }} else {{
                                 statusElement.innerHTML = '❌ Failed to update events';
                             }}
@@ -496,77 +645,39 @@ def generate_basic_form():
 
 @app.post("/ncaaf/gamelines/manual/dumps")
 async def bulk_gamelines_dump(request: Request):
-    """Bulk dump gamelines from Python list - handles both JSON and Python literal syntax"""
+    """
+    Bulk dump gamelines from Python list - handles JSON, JSON lines and Python literal syntax.
+    The body is parsed as it streams in and written in batches, so any size upload is fine.
+    """
     try:
-        # Get the raw request body
-        body = await request.body()
-        body_text = body.decode('utf-8')
+        manager = GamelineManager()
+        
+        async def write_batch(batch):
+            return await run_db(manager.upsert_many, batch, default_source='manual_dump')
         
-        # Try to parse as JSON first
         try:
-            data = json.loads(body_text)
-            gamelines = data.get('gamelines', [])
-        except json.JSONDecodeError:
-            # If JSON fails, try to parse as Python literal
-            # Remove variable assignment and clean up Python syntax
-            cleaned_text = body_text.strip()
-            
-            # Remove 'gamelines = ' prefix if present
-            if cleaned_text.startswith('gamelines'):
-                cleaned_text = cleaned_text.split('=', 1)[1].strip()
-            
-            # Convert Python literal to JSON
-            cleaned_text = cleaned_text.replace("'", '"')  # Single to double quotes
-            cleaned_text = cleaned_text.replace('None', 'null')  # None to null
-            cleaned_text = cleaned_text.replace('True', 'true')  # True to true
-            cleaned_text = cleaned_text.replace('False', 'false')  # False to false
-            
-            # Parse the cleaned JSON
-            gamelines = json.loads(cleaned_text)
-            
-            # If it's not a list yet, try to get the gamelines key
-            if isinstance(gamelines, dict) and 'gamelines' in gamelines:
-                gamelines = gamelines['gamelines']
+            summary = await ingest_chunks_async(request.stream(), write_batch)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid gamelines dump: {e}")
         
-        if not gamelines or not isinstance(gamelines, list):
+        if not summary['total_processed']:
             raise HTTPException(status_code=400, detail="No valid gamelines list provided")
         
-        manager = GamelineManager()
-        success_count = 0
-        
-        for gameline in gamelines:
-            try:
-                game_data = {
-                    'home': gameline.get('home_team'),
-                    'away': gameline.get('away_team'),
-                    'game_day': gameline.get('game_day'),
-                    'start_time': gameline.get('start_time'),
-                    'home_ml': gameline.get('home_ml'),
-                    'away_ml': gameline.get('away_ml'),
-                    'home_spread': gameline.get('home_spread'),
-                    'away_spread': gameline.get('away_spread'),
-                    'home_spread_odds': gameline.get('home_spread_odds'),
-                    'away_spread_odds': gameline.get('away_spread_odds'),
-                    'over_under': gameline.get('over_under'),
-                    'over_odds': gameline.get('over_odds'),
-                    'under_odds': gameline.get('under_odds')
-                }
-                
-                source = gameline.get('source', 'manual_dump')
-                manager.update_gameline(source, game_data)
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing gameline {gameline}: {e}")
-                continue
+        for result in summary['rejected']:
+            logger.error(f"Error processing gameline {result['index']}: {result['error']}")
         
         return {
             "status": "success",
-            "message": f"Successfully added {success_count} gamelines to database",
-            "gamelines_added": success_count,
-            "total_processed": len(gamelines)
+            "message": f"Successfully added {summary['accepted']} gamelines to database",
+            "gamelines_added": summary['accepted'],
+            "written": summary['written'],
+            "skipped": summary['skipped'],
+            "total_processed": summary['total_processed'],
+            "rejected": summary['rejected']
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing bulk gamelines dump: {str(e)}")
 
@@ -606,7 +717,7 @@ async def submit_quick_gameline(
         }
 
         manager = GamelineManager()
-        manager.update_gameline(source, game_data)
+        await run_db(manager.update_gameline, source, game_data)
         
         return {
             "status": "success",
@@ -618,25 +729,23 @@ async def submit_quick_gameline(
         raise HTTPException(status_code=500, detail=f"Error submitting quick gameline: {str(e)}")
 
 # Add events management endpoints
-@app.get("/ncaaf/events/update")
-def update_ncaaf_events(days: int = 7, use_gamelines: bool = False):
-    """Update NCAAF events with schedule data"""
+@app.get("/ncaaf/events/update", status_code=202)
+async def update_ncaaf_events(days: int = 7, use_gamelines: bool = False):
+    """Update NCAAF events with schedule data in the background; poll the returned job"""
     try:
-        updated_count = ncaaf_events_manager.update_events(days, use_gamelines)
-        return {
-            "status": "success", 
-            "sport": "ncaaf",
-            "events_updated": updated_count,
-            "use_gamelines": use_gamelines
-        }
+        job_id, created = await run_db(
+            job_store.submit, 'events_update', f'{days}:{use_gamelines}',
+            ncaaf_events_manager.update_events, days, use_gamelines
+        )
+        return {"sport": "ncaaf", "use_gamelines": use_gamelines, **job_accepted(job_id, created)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ncaaf/events/upcoming")
-def get_upcoming_events(days: int = 7):
+async def get_upcoming_events(days: int = 7):
     """Get upcoming TBD events"""
     try:
-        events = ncaaf_events_manager.get_upcoming_tbd_events(days)
+        events = await run_db(ncaaf_events_manager.get_upcoming_tbd_events, days)
         return {"sport": "ncaaf", "upcoming_events": events}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -677,7 +786,7 @@ async def submit_manual_gameline(
         }
 
         manager = GamelineManager()
-        manager.update_gameline(source, game_data)
+        await run_db(manager.update_gameline, source, game_data)
         
         return {
             "status": "success",
@@ -736,8 +845,25 @@ def team_select_form():
                 
                 if (team && year) {{
                     try {{
-                        const response = await fetch(`/ncaaf/team-stats?team=${{encodeURIComponent(team)}}&year=${{year}}`);
-                        const data = await response.json();
+                        const url = `/ncaaf/team-stats?team=${{encodeURIComponent(team)}}&year=${{year}}`;
+                        let response = await fetch(url);
+                        let data = await response.json();
+                        
+                        // 202: the season is being scraped in a background job; wait for it, then fetch again
+                        if (response.status === 202) {{
+                            const results = document.getElementById('results');
+                            let job = data;
+                            while (job.status !== 'done') {{
+                                if (job.status === 'failed' || job.status === 'lost') {{
+                                    throw new Error(job.error || 'scrape failed');
+                                }}
+                                results.innerHTML = '<p>Scraping stats, please wait...</p>';
+                                await new Promise(resolve => setTimeout(resolve, 2000));
+                                job = await (await fetch(data.status_url)).json();
+                            }}
+                            response = await fetch(url);
+                            data = await response.json();
+                        }}
                         
                         let html = '<h3>Team Statistics:</h3>';
                         
@@ -777,20 +903,21 @@ def team_select_form():
     return HTMLResponse(content=html_content)
 
 @app.get("/ncaaf/team-stats")
-def get_team_stats_via_form(team: str, year: str):
-    """Get team stats via form parameters"""
+async def get_team_stats_via_form(team: str, year: str):
+    """Get a stored team-season via form parameters (202 with a scrape job id if it isn't stored yet)"""
+    if not year.isdigit():
+        raise HTTPException(status_code=400, detail="year must be a season, e.g. 2024")
     try:
-        print(f"Fetching stats for {team} in {year}")
-        results = get_team_stats(team, year)
-        
-        if not results or "error" in results:
-            # Try to scrape data first
-            team_url = team.lower().replace(' ', '-').replace('(', '').replace(')', '')
-            if ncaafdb(team_url, year):
-                results = get_team_stats(team, year)
-            else:
-                raise HTTPException(status_code=404, detail=f"Could not retrieve stats for {team} {year}")
-        
+        results = await run_db(NcaafTeam().season_report, team, year)
+
+        if results is None:
+            # Never scrape inside the request: the job fills game_log_store, then the page asks again
+            team_url = canonical_id(team)
+            job_id, created = await run_db(
+                job_store.submit, 'scrape', f'{team_url}:{year}', scrape_team_season, team_url, year
+            )
+            return JSONResponse(status_code=202, content=job_accepted(job_id, created))
+
         return results
         
     except HTTPException:
@@ -798,16 +925,11 @@ def get_team_stats_via_form(team: str, year: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/ncaaf/{team}/{year}")
-def get_team_stats_endpoint(team: str, year: str):
-    """Original team stats endpoint - maintained for compatibility"""
-    return get_team_stats_via_form(team, year)
-
 @app.get("/ncaaf/player-stats")
-def get_player_stats_endpoint(player: str, season: str = None):
+async def get_player_stats_endpoint(player: str, season: str = None):
     """Get player stats"""
     try:
-        results = get_player_stats(player, season)
+        results = await run_http(get_player_stats, player, season)
         if not results:
             raise HTTPException(status_code=404, detail="Player stats not found")
         return {"Player_Stats": results}
@@ -815,17 +937,17 @@ def get_player_stats_endpoint(player: str, season: str = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ncaaf/team/recent/{team}/{year}/{games}")
-def get_recent_games(team: str, year: str, games: int):
+async def get_recent_games(team: str, year: str, games: int):
     """Get recent games data using NcaafTeam class"""
     try:
         ncaaf_team = NcaafTeam()
         
         if games == 2:
-            success = ncaaf_team.last2(team, year)
+            success = await run_db(ncaaf_team.last2, team, year)
         elif games == 4:
-            success = ncaaf_team.last4(team, year)
+            success = await run_db(ncaaf_team.last4, team, year)
         elif games == 8:
-            success = ncaaf_team.last8(team, year)
+            success = await run_db(ncaaf_team.last8, team, year)
         else:
             raise HTTPException(status_code=400, detail="Games must be 2, 4, or 8")
         
@@ -844,21 +966,27 @@ def get_recent_games(team: str, year: str, games: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/ncaaf/scrape/{team}/{year}")
-def scrape_team_data(team: str, year: str):
-    """Endpoint to manually trigger data scraping"""
+@app.get("/ncaaf/scrape/{team}/{year}", status_code=202)
+async def scrape_team_data(team: str, year: str):
+    """Start scraping a team's season in the background; poll /ncaaf/jobs/{job_id} for the outcome"""
     try:
-        team_url = team.lower().replace(' ', '-').replace('(', '').replace(')', '')
-        success = ncaafdb(team_url, year)
-        
-        if success:
-            return {"status": "success", "message": f"Data scraped for {team} {year}"}
-        else:
-            raise HTTPException(status_code=500, detail=f"Failed to scrape data for {team} {year}")
+        team_url = canonical_id(team)
+        job_id, created = await run_db(
+            job_store.submit, 'scrape', f'{team_url}:{year}', scrape_team_season, team_url, year
+        )
+        return {"message": f"Scraping {team} {year}", **job_accepted(job_id, created)}
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ncaaf/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a background job: queued, running, done (with its result), failed or lost"""
+    job = await run_db(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
 # Add the manual events routes
 @app.get("/ncaaf/events/manual", response_class=HTMLResponse)
 def manual_events_form():
@@ -1031,22 +1159,13 @@ async def bulk_events_dump(data: dict):
                 'start_time': game.get('start_time', 'TBD'),
                 'home_team': game.get('home_team'),
                 'away_team': game.get('away_team'),
-                'home_ml': '---',
-                'away_ml': '---',
-                'home_spread': '---',
-                'away_spread': '---',
-                'home_spread_odds': '---',
-                'away_spread_odds': '---',
-                'over_under': '---',
-                'over_odds': '---',
-                'under_odds': '---',
                 'status': 'TBD',
                 'source': game.get('source', 'manual_dump')
             }
             events.append(event)
         
         # Update database
-        updated_count = ncaaf_events_manager._update_database(events)
+        updated_count = await run_db(ncaaf_events_manager._update_database, events)
         
         return {
             "status": "success",
@@ -1173,13 +1292,13 @@ def player_select_form():
     return HTMLResponse(content=html_content)
 
 @app.get("/ncaaf/gamelines/export")
-def export_ncaaf_gamelines():
+async def export_ncaaf_gamelines():
     """Export all NCAAF gamelines to a JSON file"""
     try:
         manager = GamelineManager()
         
         # Export gamelines using the manager method
-        export_filepath = manager.export_gamelines()
+        export_filepath = await run_db(manager.export_gamelines)
         
         if not export_filepath:
             raise HTTPException(status_code=404, detail="No gamelines to export")
@@ -1204,30 +1323,29 @@ async def import_ncaaf_gamelines(file: UploadFile = File(...)):
         if not file.filename.endswith('.json'):
             raise HTTPException(status_code=400, detail="Only JSON files are supported")
         
-        # Create a temporary file to save the upload
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        manager = GamelineManager()
+        
+        async def write_batch(batch):
+            return await run_db(manager.upsert_many, batch)
         
+        # Stream the upload straight into the database in batches
         try:
-            manager = GamelineManager()
-            success = manager.import_gamelines(temp_file_path)
-            
-            if success:
-                return {
-                    "status": "success",
-                    "message": "Gamelines imported successfully",
-                    "filename": file.filename
-                }
-            else:
-                raise HTTPException(status_code=400, detail="Failed to import gamelines - invalid file format")
-                
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                
+            summary = await ingest_chunks_async(iter_upload_chunks(file), write_batch)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Failed to import gamelines - invalid file format: {e}")
+        
+        logger.info(f"Imported {summary['accepted']} NCAAF gamelines from {file.filename}")
+        return {
+            "status": "success",
+            "message": "Gamelines imported successfully",
+            "filename": file.filename,
+            "imported": summary['accepted'],
+            "written": summary['written'],
+            "skipped": summary['skipped'],
+            "total_processed": summary['total_processed'],
+            "rejected": summary['rejected']
+        }
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -1469,6 +1587,43 @@ def download_export_file(filename: str):
         logger.error(f"Error downloading export file: {e}")
         raise HTTPException(status_code=500, detail=f"Error downloading file: {str(e)}")
 
+@app.get("/ncaaf/refresh/{job}")
+def trigger_refresh(job: str):
+    """Run a refresh job now in the background"""
+    try:
+        started = lifecycle.trigger(job)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown refresh job: {job}")
+    return {"job": job, "started": started, "message": "started" if started else "already running"}
+
+@app.get("/ncaaf/refresh")
+def refresh_status():
+    """Show refresh owner and job status for this worker"""
+    return lifecycle.get_status()
+
+@app.get("/ncaaf/gamelines/refresh")
+def gamelines_refresh_status():
+    """Per-sportsbook refresh schedule: last run, next run, failures and backoff"""
+    return {
+        "seconds_to_kickoff": gameline_scheduler.seconds_to_kickoff(),
+        "sources": gameline_scheduler.get_status()
+    }
+
+@app.post("/ncaaf/backfill")
+def start_backfill(teams: Optional[List[str]] = Query(None), years: Optional[List[int]] = Query(None)):
+    """Start the season backfill in the background (all teams x YEARS unless narrowed)"""
+    started = lifecycle.trigger('backfill', teams=teams, years=years)
+    if not started:
+        raise HTTPException(status_code=409, detail="Backfill is already running")
+    return {"job": "backfill", "status": "started"}
+
+@app.get("/ncaaf/backfill")
+def get_backfill_status():
+    """Backfill progress (pages/min, ETA, failures) and job status"""
+    status = backfill_status()
+    status['job'] = lifecycle.get_status()['jobs'].get('backfill')
+    return status
+
 @app.get("/ncaaf/db-check")
 def db_check():
     """Check database status"""
@@ -1477,20 +1632,21 @@ def db_check():
         manager = GamelineManager()
         gamelines = manager.read_gamelines()
         
-        # Check if ncaafDb directory exists and has files
-        db_files = []
-        if os.path.exists('ncaafDb'):
-            db_files = os.listdir('ncaafDb')
-        
         return {
             "db_gamelines": gamelines, 
             "count": len(gamelines),
-            "ncaafDb_files": db_files,
-            "ncaafDb_count": len(db_files)
+            "stats_store": game_log_store.summary(),
+            "http_cache": http_client.stats()
         }
     except Exception as e:
         return {"error": str(e)}
 
+# Catch-all team/year route goes last so it doesn't shadow /ncaaf/<section>/<action> routes
+@app.get("/ncaaf/{team}/{year}")
+async def get_team_stats_endpoint(team: str, year: str):
+    """Original team stats endpoint - maintained for compatibility"""
+    return await get_team_stats_via_form(team, year)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
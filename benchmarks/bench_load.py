@@ -0,0 +1,150 @@
+"""
+Read latency under write load: p50/p99 for GET /ncaaf/gamelines while bulk dumps run.
+
+Usage:
+    python benchmarks/bench_load.py [--clients 16] [--seconds 10] [--seed-rows 1000] [--dump-rows 20000]
+
+Starts the app under uvicorn in a scratch directory, seeds the gamelines
+table, then measures /ncaaf/gamelines latency twice: idle, and while
+POST /ncaaf/gamelines/manual/dumps uploads run back to back.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import datetime as dt
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_games(count, prefix):
+    start = dt.date.today() + dt.timedelta(days=1)
+    return [{
+        'home': f'{prefix} Home {i}',
+        'away': f'{prefix} Away {i}',
+        'game_day': (start + dt.timedelta(days=i % 60)).isoformat(),
+        'start_time': '19:30Z',
+        'home_ml': -150 - i % 50,
+        'away_ml': 130,
+        'home_spread': -3.5,
+        'away_spread': 3.5,
+        'over_under': 51.5,
+    } for i in range(count)]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    env = dict(os.environ, NCAAF_REFRESH_ENABLED='0', PYTHONPATH=ROOT)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=tempfile.mkdtemp(prefix='ncaaf_bench_'), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/ncaaf/refresh', timeout=1)
+            return server
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(url, clients, seconds):
+    """Latencies (ms) of back-to-back GETs from `clients` threads for `seconds`"""
+    latencies = []
+    errors = []
+    stop = time.monotonic() + seconds
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            try:
+                session.get(url, timeout=30).raise_for_status()
+            except requests.exceptions.RequestException as e:
+                errors.append(e)
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def report(label, latencies, errors, seconds):
+    if not latencies:
+        print(f"{label:>18}: no successful requests ({len(errors)} errors)")
+        return
+    print(f"{label:>18}: {len(latencies) / seconds:7.0f} req/s  p50 {percentile(latencies, 0.5):7.1f} ms  "
+          f"p99 {percentile(latencies, 0.99):7.1f} ms  max {max(latencies):7.1f} ms  errors {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--seed-rows', type=int, default=1000)
+    parser.add_argument('--dump-rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    server = start_server(port)
+    try:
+        requests.post(f'{base}/ncaaf/gamelines/manual/dumps',
+                      data=json.dumps(make_games(args.seed_rows, 'Seed')), timeout=120).raise_for_status()
+        url = f'{base}/ncaaf/gamelines'
+
+        report('idle', *measure(url, args.clients, args.seconds), args.seconds)
+
+        dump = json.dumps(make_games(args.dump_rows, 'Dump'))
+        dumping = threading.Event()
+        dumps = []
+
+        def dumper():
+            while dumping.is_set():
+                started = time.perf_counter()
+                requests.post(f'{base}/ncaaf/gamelines/manual/dumps', data=dump, timeout=300).raise_for_status()
+                dumps.append(time.perf_counter() - started)
+
+        dumping.set()
+        thread = threading.Thread(target=dumper)
+        thread.start()
+        time.sleep(0.5)
+        results = measure(url, args.clients, args.seconds)
+        dumping.clear()
+        thread.join()
+
+        report('during bulk dump', *results, args.seconds)
+        if dumps:
+            print(f"{'bulk dumps':>18}: {len(dumps)} x {args.dump_rows} rows, "
+                  f"{sum(dumps) / len(dumps):.2f}s each")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Odds analytics throughput: vectorized ncaafOdds vs the same math per row in Python.
+
+Usage:
+    python benchmarks/bench_odds.py [--rows 100000]
+
+"per_row" builds the same dicts fair_lines returns (decimal, fractional,
+implied probability, overround, no-vig fair prices for each market) one
+price at a time. "fair_columns" is the NumPy path with the columnar
+layout, "fair_lines" the same plus the per-row dicts
+/ncaaf/gamelines/fair returns by default.
+"""
+import os
+import sys
+import math
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ncaafFiles'))
+
+from ncaafOdds import MARKETS, MAX_FRACTION_DENOMINATOR, FRACTION_TOLERANCE, fair_columns, fair_lines
+
+
+def make_rows(count):
+    def price():
+        value = random.randint(-400, 400)
+        return value if abs(value) >= 100 else None
+    columns = [column for sides in MARKETS.values() for _, column in sides]
+    return [{column: price() for column in columns} for _ in range(count)]
+
+
+def per_row(rows):
+    """The fair_lines output computed one price at a time in plain Python"""
+    def decimal(american):
+        if american is None or abs(american) < 100:
+            return None
+        return 1 + american / 100 if american > 0 else 1 + 100 / -american
+
+    def american(decimal):
+        return (decimal - 1) * 100 if decimal >= 2 else -100 / (decimal - 1)
+
+    def fractional(decimal):
+        profit = decimal - 1
+        closest = None
+        for denominator in range(1, MAX_FRACTION_DENOMINATOR + 1):
+            numerator = round(profit * denominator)
+            error = abs(numerator / denominator - profit)
+            if error <= FRACTION_TOLERANCE:
+                return f'{numerator}/{denominator}'
+            if closest is None or error < closest[0]:
+                closest = (error, f'{numerator}/{denominator}')
+        return closest[1]
+
+    results = []
+    for row in rows:
+        result = {}
+        for market, ((first, first_column), (second, second_column)) in MARKETS.items():
+            prices = {first: row.get(first_column), second: row.get(second_column)}
+            decimals = {side: decimal(price) for side, price in prices.items()}
+            priced = None not in decimals.values()
+            total = sum(1 / value for value in decimals.values()) if priced else None
+            result[market] = {'overround': round(total - 1, 4) if priced else None}
+            for side, value in decimals.items():
+                fair = 1 / value / total if priced else None
+                result[market][side] = {
+                    'american': prices[side] if value else None,
+                    'decimal': round(value, 3) if value else None,
+                    'fractional': fractional(value) if value else None,
+                    'implied_probability': round(1 / value, 4) if value else None,
+                    'fair_probability': round(fair, 4) if priced else None,
+                    'fair_decimal': round(1 / fair, 3) if priced else None,
+                    'fair_american': round(american(1 / fair), 1) if priced else None,
+                }
+        results.append(result)
+    return results
+
+
+def same(first, second):
+    """Equal up to the last rounded digit (NumPy and Python round halves differently)"""
+    if isinstance(first, dict):
+        return first.keys() == second.keys() and all(same(first[key], second[key]) for key in first)
+    if isinstance(first, float) and isinstance(second, float):
+        return math.isclose(first, second, abs_tol=0.1)
+    return first == second
+
+
+def timed(label, rows, function):
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>12}: {rows} rows in {elapsed:.3f}s = {rows / elapsed:,.0f} rows/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    assert all(map(same, per_row(rows[:1000]), fair_lines(rows[:1000]))), "per_row and fair_lines disagree"
+    timed('per_row', args.rows, lambda: per_row(rows))
+    timed('fair_columns', args.rows, lambda: fair_columns(rows))
+    timed('fair_lines', args.rows, lambda: fair_lines(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Game log parsing: legacy flatten-and-stride vs the data-stat row parser.
+
+Usage:
+    python benchmarks/bench_parse.py [--repeat 20] [--html saved_page.html ...]
+
+It builds sports-reference style gamelog pages (page chrome, a second
+table, a repeated header row, and a variant with the table inside an HTML
+comment) from known games, so correctness can be checked field by field.
+Pages in benchmarks/fixtures/ are parsed and asserted against the rows in
+the .json beside them, then timed too. Other saved pages given with --html
+are timed and their parsed games summarized.
+"""
+import os
+import sys
+import time
+import json
+import random
+import logging
+import argparse
+import tempfile
+import datetime as dt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ncaafFiles'))
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+CHECKED_FIELDS = ['Date', 'Opp', 'Tm', 'Opp2', 'Cmp', 'PassYds', 'RushYds', 'Turnovers']
+
+# data-stat, header label, value(game)
+COLUMNS = [
+    ('date_game', 'Date', lambda g: g['Date']),
+    ('game_location', '', lambda g: g['Location']),
+    ('opp_name', 'Opponent', lambda g: g['Opp']),
+    ('game_result', 'Result', lambda g: f"{'W' if g['Tm'] > g['Opp2'] else 'L'} {g['Tm']}-{g['Opp2']}"),
+    ('pass_cmp', 'Cmp', lambda g: g['Cmp']),
+    ('pass_att', 'Att', lambda g: g['Att']),
+    ('pass_cmp_pct', 'Pct', lambda g: f"{100 * g['Cmp'] / g['Att']:.1f}"),
+    ('pass_yds', 'Yds', lambda g: g['PassYds']),
+    ('pass_td', 'TD', lambda g: g['PassTD']),
+    ('rush_att', 'Att', lambda g: g['RushAtt']),
+    ('rush_yds', 'Yds', lambda g: g['RushYds']),
+    ('rush_yds_per_att', 'Avg', lambda g: f"{g['RushYds'] / g['RushAtt']:.1f}"),
+    ('rush_td', 'TD', lambda g: g['RushTD']),
+    ('tot_plays', 'Plays', lambda g: g['Att'] + g['RushAtt']),
+    ('tot_yds', 'Yds', lambda g: g['PassYds'] + g['RushYds']),
+    ('tot_yds_per_play', 'Avg', lambda g: f"{(g['PassYds'] + g['RushYds']) / (g['Att'] + g['RushAtt']):.1f}"),
+    ('first_down_pass', 'Pass', lambda g: 10),
+    ('first_down_rush', 'Rush', lambda g: 8),
+    ('first_down_penalty', 'Pen', lambda g: 1),
+    ('first_down', 'Tot', lambda g: 19),
+    ('penalty', 'No.', lambda g: 6),
+    ('penalty_yds', 'Yds', lambda g: 55),
+    ('fumbles_lost', 'Fum', lambda g: g['Turnovers'] - 1),
+    ('pass_int', 'Int', lambda g: 1),
+    ('turnovers', 'Tot', lambda g: g['Turnovers']),
+]
+
+
+def make_games(count):
+    random.seed(count)
+    start = dt.date(2024, 8, 31)
+    return [{
+        'Week': i + 1,
+        'Date': (start + dt.timedelta(days=7 * i)).isoformat(),
+        'Location': random.choice(['', '@', 'N']),
+        'Opp': random.choice(['Akron', 'Penn State', 'Oregon', 'Michigan', 'Purdue', 'Iowa']),
+        'Tm': random.randint(0, 56),
+        'Opp2': random.randint(0, 56),
+        'Cmp': random.randint(10, 30),
+        'Att': random.randint(31, 45),
+        'PassYds': random.randint(100, 400),
+        'PassTD': random.randint(0, 4),
+        'RushAtt': random.randint(20, 45),
+        'RushYds': random.randint(50, 300),
+        'RushTD': random.randint(0, 4),
+        'Turnovers': random.randint(1, 4),
+    } for i in range(count)]
+
+
+def render_table(table_id, games):
+    header = ''.join(f'<th data-stat="{stat}">{label}</th>' for stat, label, _ in COLUMNS)
+    rows = []
+    for index, game in enumerate(games):
+        if index == 7:
+            rows.append(f'<tr class="thead"><th data-stat="ranker">Rk</th>{header}</tr>')
+        cells = ''.join(f'<td data-stat="{stat}">{value(game)}</td>' for stat, _, value in COLUMNS)
+        rows.append(f'<tr><th data-stat="ranker">{game["Week"]}</th>{cells}</tr>')
+    return (
+        f'<table id="{table_id}" class="stats_table">'
+        '<thead><tr class="over_header"><th colspan="5"></th><th colspan="5">Passing</th></tr>'
+        f'<tr><th data-stat="ranker">Rk</th>{header}</tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table>'
+    )
+
+
+def render_page(games, commented=False):
+    chrome = ''.join(
+        f'<div class="nav"><ul>{"".join(f"<li><a href=/cfb/{i}-{j}>Link {j}</a></li>" for j in range(40))}</ul></div>'
+        for i in range(40)
+    )
+    offense = render_table('offense', games)
+    if commented:
+        offense = f'<div class="placeholder"></div><!--\n{offense}\n-->'
+    defense = render_table('defense', games)
+    return f'<html><head><title>Game Log</title></head><body>{chrome}{offense}{defense}{chrome}</body></html>'
+
+
+def legacy_parse(html):
+    """The original ncaafdb parsing: every th then every td, sliced with a stride of 35"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'id': 'offense'})
+    if not table:
+        return []
+    sample_list = [cell.text.strip() for cell in table.find_all('th') + table.find_all('td')]
+    stride = 35
+    names = ['Week', 'Day', 'Date', None, 'OT', 'Opp', 'Tm', 'Opp2', 'Cmp', 'Att', 'PassYds']
+    columns = {name: sample_list[k::stride] for k, name in enumerate(names) if name}
+    return [{name: values[i] if i < len(values) else '' for name, values in columns.items()}
+            for i in range(len(columns['Date']))]
+
+
+def score(parsed, games):
+    correct = 0
+    for index, game in enumerate(games):
+        record = parsed[index] if index < len(parsed) else {}
+        for field in CHECKED_FIELDS:
+            if str(record.get(field)) == str(game[field]):
+                correct += 1
+    return correct, len(games) * len(CHECKED_FIELDS)
+
+
+def load_fixtures():
+    """(name, html, expected rows) for every fixtures/*.html with a .json beside it"""
+    fixtures = []
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if not filename.endswith('.html'):
+            continue
+        path = os.path.join(FIXTURES_DIR, filename)
+        with open(path, 'rb') as f:
+            html = f.read()
+        with open(path[:-len('.html')] + '.json') as f:
+            fixtures.append((filename, html, json.load(f)))
+    return fixtures
+
+
+def check_fixture(name, parsed, expected):
+    """Every field in the expected rows must come out of parse_game_log as is"""
+    assert len(parsed) == len(expected), f"{name}: parsed {len(parsed)} games, expected {len(expected)}"
+    for index, (record, want) in enumerate(zip(parsed, expected)):
+        wrong = {field: (record.get(field), value) for field, value in want.items() if record.get(field) != value}
+        assert not wrong, f"{name} game {index + 1}: (parsed, expected) {wrong}"
+
+
+def timed(repeat, function):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)[len(samples) // 2] * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--html', nargs='*', default=[])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    os.chdir(tempfile.mkdtemp(prefix='ncaaf_bench_'))
+    from ncaafData import parse_game_log, HTML_PARSER
+    print(f"parse_game_log backend: {HTML_PARSER}")
+
+    pages = []
+    for name, count, commented in [('13 games', 13, False), ('15 games, commented table', 15, True)]:
+        games = make_games(count)
+        pages.append((name, render_page(games, commented).encode('utf-8'), games))
+    for name, html, expected in load_fixtures():
+        check_fixture(name, parse_game_log(html), expected)
+        print(f"{name}: {len(expected)} games parsed as expected")
+        pages.append((name, html, None))
+    for path in args.html:
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read(), None))
+
+    for name, html, games in pages:
+        legacy_ms, legacy = timed(args.repeat, lambda: legacy_parse(html))
+        new_ms, parsed = timed(args.repeat, lambda: parse_game_log(html))
+        print(f"{name} ({len(html) // 1024} KB)")
+        print(f"  {'legacy':>8}: {legacy_ms:7.2f} ms  {len(legacy)} rows", end='')
+        print(f"  fields correct {'%d/%d' % score(legacy, games)}" if games else '')
+        print(f"  {'data-stat':>8}: {new_ms:7.2f} ms  {len(parsed)} rows", end='')
+        print(f"  fields correct {'%d/%d' % score(parsed, games)}" if games else '')
+        if not games and parsed:
+            print(f"  first game: {parsed[0]}")
+
+
+if __name__ == "__main__":
+    main()
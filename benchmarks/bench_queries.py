@@ -0,0 +1,154 @@
+"""
+Gamelines / events read latency against a large historical table.
+
+Usage:
+    python benchmarks/bench_queries.py [--rows 100000] [--repeat 20] [--no-indexes]
+
+Seeds --rows historical gamelines (plus a matching events table) and a
+schedule of --rows / 20 games spread over several seasons, every other
+one with a gameline, then times the reads the app does: the date-window
+scans, the unlined-schedule probe across both databases, the filtered API
+reads and a keyset page. --no-indexes drops the secondary indexes first,
+for a before/after comparison.
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+import datetime as dt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ncaafFiles'))
+
+SOURCES = ['draftkings', 'espn_bets', 'manual', 'manual_dump']
+TEAMS = [f'Team {i}' for i in range(260)]
+SECONDARY_INDEXES = [
+    'idx_gamelines_day', 'idx_gamelines_source_day',
+    'idx_gamelines_home', 'idx_gamelines_away',
+]
+
+
+def seed(manager, events_manager, rows):
+    """Returns how many schedule games in the next 30 days have no gameline"""
+    random.seed(7)
+    start = dt.date.today() - dt.timedelta(days=5 * 365)
+    games = []
+    for i in range(rows):
+        home, away = random.sample(TEAMS, 2)
+        games.append({
+            'source': SOURCES[i % len(SOURCES)],
+            'home': home,
+            'away': away,
+            'game_day': (start + dt.timedelta(days=random.randrange(5 * 365 + 30))).isoformat(),
+            'start_time': random.choice([None, '16:00Z', '19:30Z', '23:00Z']),
+            'home_ml': -150,
+            'away_ml': 130,
+            'home_spread': -3.5,
+            'away_spread': 3.5,
+            'over_under': 51.5,
+        })
+    manager.upsert_many(games, chunk_size=5000)
+
+    from ncaafDatabase import get_connection
+    conn = get_connection(events_manager.db_file)
+    with conn:
+        conn.executemany(
+            'INSERT OR IGNORE INTO events (game_day, start_time, home_team, away_team) VALUES (?, ?, ?, ?)',
+            [(game['game_day'], game['start_time'], game['home'], game['away']) for game in games]
+        )
+
+    # Schedule from five seasons back to 60 days out; every other game gets a
+    # line, so the NOT EXISTS probe has both hits and misses
+    today = dt.date.today()
+    count = max(1, rows // 20)
+    schedule, lined, unlined = [], [], 0
+    for i in range(count):
+        offset = -5 * 365 + (5 * 365 + 60) * i // count
+        game = {'game_day': (today + dt.timedelta(days=offset)).isoformat(), 'start_time': '19:30Z',
+                'home': f'Home {i}', 'away': f'Away {i}'}
+        schedule.append((today.year - 5 + i * 6 // count, 2, i % 15 + 1,
+                         game['game_day'], game['start_time'], game['home'], game['away']))
+        if i % 2:
+            lined.append({**game, 'home_ml': -150, 'away_ml': 130})
+        elif 0 <= offset <= 30:
+            unlined += 1
+    with conn:
+        conn.executemany('''
+            INSERT INTO schedule_games (season_year, season_type, week, game_day, start_time, home_team, away_team)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', schedule)
+    manager.upsert_many(lined, source='espn_bets', chunk_size=5000)
+    return unlined
+
+
+def timed(label, repeat, function):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    median = samples[len(samples) // 2] * 1000
+    worst = samples[-1] * 1000
+    print(f"{label:>28}: median {median:8.2f} ms  max {worst:8.2f} ms  ({len(result)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--no-indexes', action='store_true')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    os.chdir(tempfile.mkdtemp(prefix='ncaaf_bench_'))
+    from ncaafGamelines import GamelineManager
+    from ncaafEvents import NCAAFEventsManager
+    from ncaafDatabase import get_connection
+
+    manager = GamelineManager()
+    events_manager = NCAAFEventsManager()
+    started = time.perf_counter()
+    unlined = seed(manager, events_manager, args.rows)
+    print(f"Seeded {args.rows} gamelines in {time.perf_counter() - started:.1f}s")
+
+    if args.no_indexes:
+        conn = get_connection(manager.db_file)
+        for index in SECONDARY_INDEXES:
+            conn.execute(f'DROP INDEX IF EXISTS {index}')
+        for index in ('idx_events_day', 'idx_schedule_games_day'):
+            get_connection(events_manager.db_file).execute(f'DROP INDEX IF EXISTS {index}')
+    for db_file in (manager.db_file, events_manager.db_file):
+        get_connection(db_file).execute('ANALYZE')
+
+    week_start = dt.date.today() - dt.timedelta(days=400)
+    week_end = week_start + dt.timedelta(days=7)
+    season_start = dt.date.today() - dt.timedelta(days=365)
+
+    timed('existing gamelines (7d)', args.repeat, lambda: events_manager.get_existing_gamelines(7))
+    timed('events (30d)', args.repeat, lambda: events_manager.get_events(30))
+    assert len(events_manager._query_unlined_schedule(30)) == unlined, "unlined schedule count is wrong"
+    timed('unlined schedule (30d)', args.repeat, lambda: events_manager._query_unlined_schedule(30) or [])
+    timed('date range (1 week)', args.repeat, lambda: manager.read_gamelines(
+        start_date=week_start.isoformat(), end_date=week_end.isoformat()))
+    timed('source + date range', args.repeat, lambda: manager.read_gamelines(
+        source='espn_bets', start_date=week_start.isoformat(), end_date=week_end.isoformat()))
+    timed('team (season)', args.repeat, lambda: manager.read_gamelines(
+        team='Team 42', start_date=season_start.isoformat()))
+    timed('first page (limit 100)', args.repeat, lambda: manager.read_gamelines(limit=100))
+
+    page = manager.read_gamelines(limit=100)
+    for _ in range(args.rows // 200):
+        last = page[-1]
+        page = manager.read_gamelines(after=(last['game_day'], last['start_time'], last['id']), limit=100)
+    last = page[-1]
+    timed('mid-table page (keyset)', args.repeat, lambda: manager.read_gamelines(
+        after=(last['game_day'], last['start_time'], last['id']), limit=100))
+    timed('full table', max(1, args.repeat // 5), lambda: manager.read_gamelines())
+
+
+if __name__ == "__main__":
+    main()
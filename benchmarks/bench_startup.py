@@ -0,0 +1,61 @@
+"""
+Startup benchmark: import app.py and fail if the import touches the network.
+
+Usage:
+    python benchmarks/bench_startup.py [--max-seconds 2.0]
+
+Exits non-zero if any socket connection or DNS lookup is attempted while
+importing the app, or if the import takes longer than --max-seconds.
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+network_calls = []
+
+
+def _blocked(name):
+    def guard(*args, **kwargs):
+        network_calls.append((name, args[:2]))
+        raise OSError(f"network access during import: {name}{args[:2]}")
+    return guard
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--max-seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    socket.socket.connect = _blocked('connect')
+    socket.socket.connect_ex = _blocked('connect_ex')
+    socket.create_connection = _blocked('create_connection')
+    socket.getaddrinfo = _blocked('getaddrinfo')
+
+    # Run from a scratch directory so the import doesn't touch real databases
+    os.chdir(tempfile.mkdtemp(prefix='ncaaf_bench_'))
+    sys.path.insert(0, ROOT)
+
+    started = time.perf_counter()
+    import app  # noqa: F401
+    elapsed = time.perf_counter() - started
+
+    print(f"import app: {elapsed * 1000:.1f} ms")
+    if network_calls:
+        print(f"FAIL: {len(network_calls)} network call(s) during import:")
+        for name, call_args in network_calls:
+            print(f"  {name}{call_args}")
+        return 1
+    if elapsed > args.max_seconds:
+        print(f"FAIL: import took longer than {args.max_seconds:.1f}s")
+        return 1
+    print("OK: no network calls during import")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Gameline write throughput: per-row update_gameline vs batched upsert_many.
+
+Usage:
+    python benchmarks/bench_upsert.py [--rows 3000] [--chunk-size 500]
+
+"legacy" replays the original write path (new connection, INSERT OR REPLACE
+and commit per row). "update_gameline" is the current per-row method and
+"upsert_many" is the batched single-transaction path. "refresh 1% moved"
+re-sends the same games with 1% of prices changed, where unchanged rows
+are skipped by fingerprint.
+"""
+import os
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+import tempfile
+import datetime as dt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ncaafFiles'))
+
+
+def make_games(count):
+    start = dt.date.today()
+    return [{
+        'home': f'Home {i}',
+        'away': f'Away {i}',
+        'game_day': (start + dt.timedelta(days=i % 60)).isoformat(),
+        'start_time': '19:30Z',
+        'home_ml': -150,
+        'away_ml': 130,
+        'home_spread': -3.5,
+        'away_spread': 3.5,
+        'home_spread_odds': -110,
+        'away_spread_odds': -110,
+        'over_under': 51.5,
+        'over_odds': -110,
+        'under_odds': -110,
+    } for i in range(count)]
+
+
+def legacy_update(db_file, source, game_data):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT OR REPLACE INTO gamelines
+        (source, game_day, start_time, home_team, away_team, home_ml, away_ml,
+         home_spread, away_spread, home_spread_odds, away_spread_odds,
+         over_under, over_odds, under_odds, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', (source, game_data['game_day'], game_data['start_time'], game_data['home'], game_data['away'],
+          game_data['home_ml'], game_data['away_ml'], game_data['home_spread'], game_data['away_spread'],
+          game_data['home_spread_odds'], game_data['away_spread_odds'], game_data['over_under'],
+          game_data['over_odds'], game_data['under_odds']))
+    conn.commit()
+    conn.close()
+
+
+def timed(label, rows, function):
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>16}: {rows} rows in {elapsed:.3f}s = {rows / elapsed:,.0f} rows/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=3000)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    os.chdir(tempfile.mkdtemp(prefix='ncaaf_bench_'))
+    from ncaafGamelines import GamelineManager
+
+    games = make_games(args.rows)
+
+    # The legacy path ran on a default (rollback journal) database
+    conn = sqlite3.connect('legacy.db')
+    GamelineManager._create_schema(conn)
+    conn.commit()
+    conn.close()
+    timed('legacy', args.rows, lambda: [legacy_update('legacy.db', 'bench', game) for game in games])
+
+    per_row = GamelineManager('per_row.db')
+    timed('update_gameline', args.rows, lambda: [per_row.update_gameline('bench', game) for game in games])
+
+    batched = GamelineManager('batched.db')
+    timed('upsert_many', args.rows, lambda: batched.upsert_many(games, source='bench', chunk_size=args.chunk_size))
+
+    # A typical refresh: the same lines again with a handful of prices moved
+    refresh = [dict(game, home_ml=game['home_ml'] - 5) if i % 100 == 0 else game for i, game in enumerate(games)]
+    timed('refresh 1% moved', args.rows, lambda: batched.upsert_many(refresh, source='bench', chunk_size=args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
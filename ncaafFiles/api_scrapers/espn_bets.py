@@ -7,6 +7,13 @@ from time import sleep
 from pprint import pprint
 import logging
 import sqlite3
+import os
+import sys
+
+# ncaafFiles/ for the shared HTTP client when run on its own
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ncaafHttp import http_client
+from ncaafTeamRegistry import canonical_name
 
 source1 = 'https://www.espn.com/college-football/odds'
 source2 = 'https://site.api.espn.com/apis/site/v2/sports/football/college-football/scoreboard'
@@ -21,7 +28,7 @@ def get_espn_bets_gamelines():
     url = "https://site.api.espn.com/apis/site/v2/sports/football/college-football/scoreboard"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()  # Raise an exception for bad status codes
         data = response.json()
     except requests.exceptions.RequestException as e:
@@ -42,10 +49,13 @@ def get_espn_bets_gamelines():
                     
                     if 'competitors' in competition:
                         for competitor in competition['competitors']:
+                            team = competitor.get('team', {})
+                            # location ("Ohio State") resolves more reliably than abbreviations ("OSU")
+                            team_name = canonical_name(team.get('location') or team.get('abbreviation') or team.get('name', ''))
                             if competitor.get('homeAway') == 'home':
-                                home_team = competitor.get('team', {}).get('abbreviation', '') or competitor.get('team', {}).get('name', '')
+                                home_team = team_name
                             elif competitor.get('homeAway') == 'away':
-                                away_team = competitor.get('team', {}).get('abbreviation', '') or competitor.get('team', {}).get('name', '')
+                                away_team = team_name
                     
                     # Only process if we have both teams
                     if home_team and away_team:
@@ -110,31 +120,36 @@ def restructure_gameline_data(raw_data):
                     logger.warning(f"Could not parse team names from: {game['short_name']}")
                     continue
             
-            # Extract spread data
-            home_spread_odds = '-110'
-            away_spread_odds = '-110'
+            # Default to standard -110 juice
+            home_spread_odds = -110
+            away_spread_odds = -110
 
-            # Extract moneyline data
-            home_moneyline = game.get('home_moneyline', 'N/A')
-            away_moneyline = game.get('away_moneyline', 'N/A')
+            # Extract moneyline data (None when the book hasn't posted one)
+            home_moneyline = game.get('home_moneyline')
+            away_moneyline = game.get('away_moneyline')
 
             # Handle spread logic for NCAAF
-            spread = game.get('spread', 0)
-            if home_moneyline != 'N/A' and away_moneyline != 'N/A' and spread:
+            spread = game.get('spread')
+            if spread is None:
+                home_spread = None
+                away_spread = None
+            elif home_moneyline is not None and away_moneyline is not None:
+                spread = abs(float(spread))
                 if home_moneyline < away_moneyline:  # Home team is favorite
-                    home_spread = f"-{spread}"
-                    away_spread = f"+{spread}"
+                    home_spread = -spread
+                    away_spread = spread
                 else:  # Away team is favorite
-                    home_spread = f"+{spread}"
-                    away_spread = f"-{spread}"
+                    home_spread = spread
+                    away_spread = -spread
             else:
-                home_spread = f"{spread}" if spread else 'N/A'
-                away_spread = f"{spread}" if spread else 'N/A'
+                # ESPN quotes the spread from the home team's side
+                home_spread = float(spread)
+                away_spread = -home_spread
 
             # Extract Over/Under (total) data
-            over_under = game.get('over_under', 'N/A')
-            over_odds = '-110'
-            under_odds = '-110'
+            over_under = game.get('over_under')
+            over_odds = -110
+            under_odds = -110
 
             # Create a new dictionary for the game
             new_game_entry = {
@@ -146,7 +161,7 @@ def restructure_gameline_data(raw_data):
                 'away_spread': away_spread,
                 'home_spread_odds': home_spread_odds,
                 'away_spread_odds': away_spread_odds,
-                'total': over_under,
+                'over_under': over_under,
                 'over_odds': over_odds,
                 'under_odds': under_odds,
                 'game_day': game.get('game_day', ''),
@@ -200,10 +215,12 @@ def get_all_ncaaf_gamelines():
     }
 
 
-ncaaf_games = get_espn_bets_gamelines()
-if ncaaf_games:
-    print(f"Successfully fetched {len(ncaaf_games)} NCAAF games")
-    for game in ncaaf_games:
-        print(f"{game['away']} @ {game['home']} - Spread: {game['home_spread']} | Total: {game['total']}")
-else:
-    print("No NCAAF games found")
+if __name__ == "__main__":
+    ncaaf_games = get_espn_bets_gamelines()
+    if ncaaf_games:
+        print(f"Successfully fetched {len(ncaaf_games)} NCAAF games")
+        for game in ncaaf_games:
+            print(f"{game['away']} @ {game['home']} - Spread: {game['home_spread']} | Total: {game['over_under']}")
+    else:
+        print("No NCAAF games found")
+
@@ -1,9 +1,11 @@
-import requests
 import json
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
 
+from ncaafHttp import http_client
+from ncaafTeamRegistry import canonical_id
+
 logger = logging.getLogger(__name__)
 
 def get_ncaaf_team_stats(team, year):
@@ -12,13 +14,13 @@ def get_ncaaf_team_stats(team, year):
     """
     try:
         # Use sports-reference for NCAAF data
-        url = f'https://www.sports-reference.com/cfb/schools/{team}/{year}.html'
+        url = f'https://www.sports-reference.com/cfb/schools/{canonical_id(team)}/{year}.html'
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -80,7 +82,7 @@ def get_ncaaf_team_gamelog(team, year):
         
         # Ensure data is scraped first
         if ncaafdb(team, year):
-            from ncaafTeam import NcaafTeam
+            from ncaafTeams import NcaafTeam
             ncaaf_team = NcaafTeam()
             stats = ncaaf_team.get_stats(team, year)
             
@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+import datetime as dt
+
+from ncaafData import NCAAF_TEAMS, YEARS, game_log_url, store_game_log
+from ncaafStats import game_log_store
+from ncaafFetch import AsyncFetcher, run_async
+from ncaafHttp import current_season
+from ncaafTeamRegistry import canonical_id
+from ncaafClock import clock
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+BACKFILL_CONCURRENCY = 3
+BACKFILL_RATE_PER_HOST = 0.3     # sports-reference blocks clients going much past 20 requests a minute
+BACKFILL_CHECKPOINT_FILE = os.environ.get('NCAAF_BACKFILL_CHECKPOINT', 'ncaaf_backfill_checkpoint.json')
+MAX_REPORTED_FAILURES = 50
+
+
+def _key(team, year):
+    return f'{team}:{year}'
+
+
+def read_checkpoint(checkpoint_file=BACKFILL_CHECKPOINT_FILE):
+    """Saved backfill state, or an empty one"""
+    try:
+        with open(checkpoint_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'done': [], 'missing': [], 'failed': {}, 'progress': None}
+
+
+class SeasonBackfill:
+    """
+    Scrape every team x season game log into the stats store.
+
+    Requests go through AsyncFetcher (bounded concurrency, process-wide
+    per-host rate) and the shared HTTP cache. Finished keys are checkpointed after
+    every page, so an interrupted run resumes where it stopped. Past seasons
+    already in the store are skipped; the current season is always refreshed.
+    """
+
+    def __init__(self, teams=None, years=None, checkpoint_file=BACKFILL_CHECKPOINT_FILE,
+                 concurrency=BACKFILL_CONCURRENCY, rate_per_host=BACKFILL_RATE_PER_HOST):
+        self.teams = [canonical_id(team) for team in (teams or NCAAF_TEAMS)]
+        self.years = [int(year) for year in (years or YEARS)]
+        self.checkpoint_file = checkpoint_file
+        self.fetcher = AsyncFetcher(concurrency=concurrency, rate_per_host=rate_per_host, burst_per_host=1)
+        self._lock = threading.Lock()
+
+    def plan(self, checkpoint):
+        """(pending (team, year) pairs, number skipped)"""
+        finished = set(checkpoint['done']) | set(checkpoint['missing'])
+        stored = game_log_store.stored_seasons()
+        season = current_season()
+
+        pending = []
+        skipped = 0
+        for year in self.years:
+            for team in self.teams:
+                complete = year < season and (stored.get((team, year)) or _key(team, year) in finished)
+                if complete:
+                    skipped += 1
+                else:
+                    pending.append((team, year))
+        return pending, skipped
+
+    def run(self):
+        """Run (or resume) the backfill. Returns the final progress report."""
+        checkpoint = read_checkpoint(self.checkpoint_file)
+        pending, skipped = self.plan(checkpoint)
+        started = time.monotonic()
+        progress = {
+            'started_at': clock.now().isoformat(),
+            'finished_at': None,
+            'total': len(pending),
+            'skipped': skipped,
+            'completed': 0,
+            'games_stored': 0,
+            'failed': 0,
+            'pages_per_minute': None,
+            'eta_seconds': None
+        }
+        checkpoint['progress'] = progress
+        self._save(checkpoint)
+        logger.info(f"Backfill: {len(pending)} team-seasons to scrape, {skipped} already complete")
+
+        def handle(key, response):
+            team, year = key
+            error = None
+            games = 0
+            if response is None:
+                error = 'request failed'
+            elif response.status_code == 404:
+                pass
+            elif response.status_code != 200:
+                error = f'HTTP {response.status_code}'
+            else:
+                try:
+                    games = store_game_log(team, year, response.content)
+                except Exception as e:
+                    error = str(e)
+
+            with self._lock:
+                name = _key(team, year)
+                checkpoint['failed'].pop(name, None)
+                if error:
+                    if len(checkpoint['failed']) < MAX_REPORTED_FAILURES:
+                        checkpoint['failed'][name] = error
+                    progress['failed'] += 1
+                elif games:
+                    if name not in checkpoint['done']:
+                        checkpoint['done'].append(name)
+                elif name not in checkpoint['missing']:
+                    # No gamelog for that school/season (404 or empty page), don't ask again
+                    checkpoint['missing'].append(name)
+                progress['completed'] += 1
+                progress['games_stored'] += games
+
+                elapsed = time.monotonic() - started
+                rate = progress['completed'] / elapsed if elapsed else 0
+                progress['pages_per_minute'] = round(rate * 60, 1)
+                progress['eta_seconds'] = round((progress['total'] - progress['completed']) / rate) if rate else None
+                self._save(checkpoint)
+
+            if progress['completed'] % 10 == 0 or progress['completed'] == progress['total']:
+                logger.info(
+                    f"Backfill {progress['completed']}/{progress['total']} "
+                    f"({progress['pages_per_minute']}/min, ETA {progress['eta_seconds']}s)"
+                )
+
+        items = [((team, year), game_log_url(team, year)) for team, year in pending]
+        run_async(self.fetcher.fetch_all(items, handle))
+
+        progress['finished_at'] = clock.now().isoformat()
+        self._save(checkpoint)
+        return progress
+
+    def _save(self, checkpoint):
+        tmp_file = f'{self.checkpoint_file}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, self.checkpoint_file)
+
+
+def backfill_status(checkpoint_file=BACKFILL_CHECKPOINT_FILE):
+    """Progress of the current or last backfill (readable from any worker)"""
+    checkpoint = read_checkpoint(checkpoint_file)
+    return {
+        'progress': checkpoint['progress'],
+        'done': len(checkpoint['done']),
+        'missing': len(checkpoint['missing']),
+        'failed': checkpoint['failed']
+    }
+
+
+def run_backfill(teams=None, years=None):
+    """Lifecycle job entry point"""
+    return SeasonBackfill(teams=teams, years=years).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape every NCAAF team x season game log into the stats store")
+    parser.add_argument('--teams', nargs='*', help="team names or sports-reference slugs (default: all)")
+    parser.add_argument('--years', nargs='*', help="seasons (default: YEARS)")
+    parser.add_argument('--concurrency', type=int, default=BACKFILL_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=BACKFILL_RATE_PER_HOST, help="requests per second")
+    parser.add_argument('--checkpoint', default=BACKFILL_CHECKPOINT_FILE)
+    parser.add_argument('--reset', action='store_true', help="forget the checkpoint and start over")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    backfill = SeasonBackfill(teams=args.teams, years=args.years, checkpoint_file=args.checkpoint,
+                              concurrency=args.concurrency, rate_per_host=args.rate)
+    print(json.dumps(backfill.run(), indent=2))
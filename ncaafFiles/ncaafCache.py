@@ -0,0 +1,213 @@
+import os
+import json
+import fcntl
+import hashlib
+import logging
+import threading
+
+from ncaafDatabase import get_connection, init_schema
+from ncaafClock import clock
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CACHE_BACKEND = os.environ.get('NCAAF_CACHE_BACKEND', 'sqlite')     # 'sqlite' or 'file'
+CACHE_DIR = os.environ.get('NCAAF_CACHE_DIR', 'ncaaf_cache')
+
+
+def _boot_id():
+    """Identifies this boot; monotonic timestamps from another boot mean nothing"""
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+BOOT_ID = _boot_id()
+
+
+class FileLock:
+    """Exclusive flock shared by every process (and thread) on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, blocking=False):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class FileCacheStore:
+    """One JSON file per key, replaced atomically so readers never see half a write"""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def get(self, key):
+        """(value, stored_at monotonic, boot id), or None"""
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            return entry['value'], entry['stored_at'], entry['boot_id']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key, value):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': key, 'value': value, 'stored_at': clock.monotonic(), 'boot_id': BOOT_ID}, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteCacheStore:
+    """Cache rows in a WAL database: atomic writes, concurrent readers"""
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or os.path.join(CACHE_DIR, 'cache.db')
+
+    def _conn(self):
+        os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
+        init_schema(self.db_file, 'cache', self._create_schema)
+        return get_connection(self.db_file)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                boot_id TEXT NOT NULL
+            )
+        ''')
+
+    def get(self, key):
+        row = self._conn().execute(
+            'SELECT value, stored_at, boot_id FROM cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, key, value):
+        with self._conn() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, stored_at, boot_id) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), clock.monotonic(), BOOT_ID)
+            )
+
+    def delete(self, key):
+        with self._conn() as conn:
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+
+def make_cache_store(backend=CACHE_BACKEND):
+    if backend == 'file':
+        return FileCacheStore()
+    if backend == 'sqlite':
+        return SQLiteCacheStore()
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+class SharedCache:
+    """
+    JSON values with TTLs, shared by every worker through a store.
+
+    Ages use the host's monotonic clock (the same for every process, immune
+    to wall clock jumps); entries from before a reboot count as expired.
+    get_or_refresh is single-flight across processes: one caller takes the
+    key's lock and refreshes while the others serve the stale value, or wait
+    for the refresh if there is nothing to serve yet.
+    """
+
+    def __init__(self, store=None, lock_dir=CACHE_DIR):
+        self.store = store or make_cache_store()
+        self.lock_dir = lock_dir
+
+    def _lock(self, key):
+        os.makedirs(self.lock_dir, exist_ok=True)
+        return FileLock(os.path.join(self.lock_dir, hashlib.sha1(key.encode()).hexdigest() + '.lock'))
+
+    def _entry(self, key):
+        try:
+            entry = self.store.get(key)
+        except Exception as e:
+            logger.error(f"Error reading cache entry {key}: {e}")
+            return None
+        if entry is None:
+            return None
+        value, stored_at, boot_id = entry
+        age = clock.monotonic() - stored_at if boot_id == BOOT_ID else float('inf')
+        return value, age
+
+    def get(self, key, ttl):
+        """Cached value if younger than ttl seconds, else None"""
+        entry = self._entry(key)
+        if entry is not None and entry[1] < ttl:
+            return entry[0]
+        return None
+
+    def set(self, key, value):
+        try:
+            self.store.set(key, value)
+        except Exception as e:
+            logger.error(f"Error writing cache entry {key}: {e}")
+
+    def delete(self, key):
+        self.store.delete(key)
+
+    def get_or_refresh(self, key, ttl, refresh, keep_empty=False, serve_stale=True):
+        """
+        Cached value for key, calling refresh() to replace it once it is older
+        than ttl seconds. Empty results aren't cached unless keep_empty. Without
+        serve_stale, callers always wait for a refresh in flight instead of
+        taking the expired value.
+        """
+        entry = self._entry(key)
+        if entry is not None and entry[1] < ttl:
+            return entry[0]
+
+        lock = self._lock(key)
+        if not lock.acquire():
+            if entry is not None and serve_stale:
+                logger.info(f"Serving stale {key} (age {entry[1]:.0f}s) while another worker refreshes it")
+                return entry[0]
+            # Nothing to serve yet: wait for the refresh in flight, then use its result
+            lock.acquire(blocking=True)
+        try:
+            # Someone may have refreshed while we waited for the lock
+            entry = self._entry(key)
+            if entry is not None and entry[1] < ttl:
+                return entry[0]
+
+            value = refresh()
+            if value or keep_empty:
+                self.set(key, value)
+            return value
+        finally:
+            lock.release()
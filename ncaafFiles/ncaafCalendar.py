@@ -0,0 +1,73 @@
+import datetime as dt
+from typing import Dict, List, Optional, Tuple
+
+REGULAR_SEASON = 2
+POSTSEASON = 3
+
+# Estimated ranges are widened by this much since they're only a guess
+ESTIMATE_PADDING_DAYS = 1
+
+
+def _week_one_saturday(year: int) -> dt.date:
+    """Saturday of regular season week 1: the first Saturday on or after August 27"""
+    day = dt.date(year, 8, 27)
+    return day + dt.timedelta(days=(5 - day.weekday()) % 7)
+
+
+class SeasonCalendar:
+    """
+    Maps (season_type, week) to the date range that week's games are played in.
+
+    Weeks already scraped use the first/last game day seen on their ESPN page.
+    Other weeks are projected from the nearest scraped week of the same season
+    type, or from the usual season start if nothing has been scraped yet.
+    """
+
+    def __init__(self, year: int, known: Optional[Dict[Tuple[int, int], Tuple[Optional[str], Optional[str]]]] = None):
+        self.year = year
+        self.known = {}
+        for key, (first_day, last_day) in (known or {}).items():
+            self.known[key] = (
+                dt.date.fromisoformat(first_day) if first_day else None,
+                dt.date.fromisoformat(last_day) if last_day else None
+            )
+
+    def week_range(self, season_type: int, week: int) -> Tuple[dt.date, dt.date]:
+        """Date range for a week (padded when it's only an estimate)"""
+        first_day, last_day = self.known.get((season_type, week), (None, None))
+        if first_day is not None:
+            return first_day, last_day
+
+        # Not scraped yet, or scraped before any games were listed
+        start, end = self._estimate(season_type, week)
+        padding = dt.timedelta(days=ESTIMATE_PADDING_DAYS)
+        return start - padding, end + padding
+
+    def weeks_overlapping(self, start: dt.date, end: dt.date, weeks: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """The subset of weeks whose games could fall between start and end"""
+        overlapping = []
+        for season_type, week in weeks:
+            first_day, last_day = self.week_range(season_type, week)
+            if first_day <= end and last_day >= start:
+                overlapping.append((season_type, week))
+        return overlapping
+
+    def _estimate(self, season_type: int, week: int) -> Tuple[dt.date, dt.date]:
+        # Project from the closest scraped week of the same season type
+        anchors = [
+            (abs(known_week - week), known_week, first_day)
+            for (known_type, known_week), (first_day, _) in self.known.items()
+            if known_type == season_type and first_day is not None
+        ]
+        if anchors:
+            _, anchor_week, anchor_day = min(anchors)
+            start = anchor_day + dt.timedelta(weeks=week - anchor_week)
+            return start, start + dt.timedelta(days=6)
+
+        if season_type == POSTSEASON:
+            # Bowl season, mid December through the title game in January
+            start = dt.date(self.year, 12, 13) + dt.timedelta(weeks=week - 1)
+            return start, dt.date(self.year + 1, 1, 21)
+
+        saturday = _week_one_saturday(self.year) + dt.timedelta(weeks=week - 1)
+        return saturday - dt.timedelta(days=5), saturday + dt.timedelta(days=2)
@@ -0,0 +1,238 @@
+import json
+import base64
+import asyncio
+import logging
+import datetime as dt
+
+from ncaafDatabase import get_connection, init_schema, data_version
+from ncaafExecutors import run_db
+from ncaafClock import clock
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CHANGE_FEEDS = {                 # feed name -> (database file, table whose writes it carries)
+    'gamelines': ('ncaaf_gamelines.db', 'gamelines'),
+    'events': ('ncaaf_events.db', 'events'),
+}
+CHANGE_POLL_SECONDS = 0.5        # how often the broadcaster checks data_version for new writes
+CHANGE_PAGE_SIZE = 500
+CHANGE_RETENTION_HOURS = 24      # resume cursors older than this get a reset instead of a replay
+KEEPALIVE_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 1000     # a client further behind than this catches up from the database
+
+
+def _create_change_log(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_change_log_created ON change_log (created_at)')
+
+
+def install_change_log(conn, table):
+    """
+    Record every insert, update and delete on table in the database's change_log,
+    with the row already serialized as JSON. Call from the table's schema setup,
+    after any migration, so the triggers see the current columns.
+    """
+    _create_change_log(conn)
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+    for timing, ref, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE', 'NEW', 'upsert'), ('DELETE', 'OLD', 'delete')):
+        row = ', '.join(f"'{column}', {ref}.{column}" for column in columns)
+        trigger = f'{table}_change_log_{timing.lower()}'
+        conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        conn.execute(f'''
+            CREATE TRIGGER {trigger} AFTER {timing} ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, op, row_id, payload)
+                VALUES ('{table}', '{op}', {ref}.id, json_object({row}));
+            END
+        ''')
+
+
+def _conn(db_file):
+    init_schema(db_file, 'change_log', _create_change_log)
+    return get_connection(db_file)
+
+
+def latest_seq(db_file):
+    return _conn(db_file).execute('SELECT COALESCE(MAX(seq), 0) FROM change_log').fetchone()[0]
+
+
+def oldest_seq(db_file):
+    """Lowest seq still kept, None if the log is empty"""
+    return _conn(db_file).execute('SELECT MIN(seq) FROM change_log').fetchone()[0]
+
+
+def read_changes(db_file, after, limit=CHANGE_PAGE_SIZE):
+    """[(seq, op, payload JSON)] after seq `after`, oldest first"""
+    return _conn(db_file).execute(
+        'SELECT seq, op, payload FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?', (after, limit)
+    ).fetchall()
+
+
+def prune_changes(retention_hours=CHANGE_RETENTION_HOURS):
+    """Drop change_log rows older than the retention window from every feed; returns the count"""
+    cutoff = dt.datetime.utcfromtimestamp(clock.time() - retention_hours * 3600).strftime('%Y-%m-%d %H:%M:%S')
+    deleted = 0
+    for db_file, _ in CHANGE_FEEDS.values():
+        with _conn(db_file) as conn:
+            deleted += conn.execute('DELETE FROM change_log WHERE created_at < ?', (cutoff,)).rowcount
+    return deleted
+
+
+def encode_cursor(positions):
+    return base64.urlsafe_b64encode(json.dumps(positions, sort_keys=True).encode('utf-8')).decode('ascii')
+
+
+def parse_cursor(cursor):
+    """Inverse of encode_cursor, raises ValueError on anything malformed"""
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(positions, dict) or not all(
+        feed in CHANGE_FEEDS and isinstance(seq, int) for feed, seq in positions.items()
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return positions
+
+
+def _frame(feed, seq, op, payload, positions):
+    """One SSE message; its id is the cursor to resume after it"""
+    data = f'{{"feed": "{feed}", "seq": {seq}, "op": "{op}", "row": {payload}}}'
+    return f'id: {encode_cursor(positions)}\nevent: {feed}\ndata: {data}\n\n'.encode('utf-8')
+
+
+class _Subscriber:
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class ChangeBroadcaster:
+    """
+    Fans change_log rows out to every connected stream.
+
+    One task per process watches each feed's data_version, so writes from any
+    worker are seen. New rows are read once and serialized once into SSE
+    frames that every subscriber's queue shares. A subscriber whose queue
+    fills up is dropped and catches up from the database instead.
+    """
+
+    def __init__(self, feeds=CHANGE_FEEDS, poll_seconds=CHANGE_POLL_SECONDS, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.feeds = feeds
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.positions = {}
+        self._task = None
+
+    def _task_running(self):
+        return (self._task is not None and not self._task.done()
+                and self._task.get_loop() is asyncio.get_running_loop())
+
+    async def subscribe(self):
+        """
+        Queue for new frames; starts the watcher task (it stops once nobody is
+        subscribed). A new task starts from the latest seqs read here, before
+        the caller's catch-up read, so nothing committed in between is skipped.
+        """
+        if not self._task_running():
+            positions = {feed: await run_db(latest_seq, db_file) for feed, (db_file, _) in self.feeds.items()}
+            # Another subscriber may have started it while we read
+            if not self._task_running():
+                self.positions = positions
+                self._task = asyncio.get_running_loop().create_task(self._run())
+        subscriber = _Subscriber(self.queue_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    def _publish(self, frame):
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self.subscribers.discard(subscriber)
+
+    async def _run(self):
+        versions = {}
+        while self.subscribers:
+            try:
+                for feed, (db_file, _) in self.feeds.items():
+                    version = await run_db(data_version, db_file)
+                    if versions.get(feed) == version:
+                        continue
+                    versions[feed] = version
+                    while True:
+                        rows = await run_db(read_changes, db_file, self.positions[feed])
+                        for seq, op, payload in rows:
+                            self.positions[feed] = seq
+                            self._publish((feed, seq, _frame(feed, seq, op, payload, self.positions)))
+                        if len(rows) < CHANGE_PAGE_SIZE:
+                            break
+            except Exception as e:
+                logger.error(f"Error broadcasting NCAAF changes: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def stream(self, positions=None):
+        """
+        SSE bytes for one client: the changes after `positions` (from
+        parse_cursor; None for only new changes), then live ones. Delivery is
+        at least once, clients dedupe on (feed, seq).
+        """
+        positions = dict(positions or {})
+        start_live = not positions
+        ready = False
+        while True:
+            subscriber = await self.subscribe()
+            try:
+                for feed, (db_file, _) in self.feeds.items():
+                    if start_live or feed not in positions:
+                        positions[feed] = await run_db(latest_seq, db_file)
+                        continue
+                    oldest = await run_db(oldest_seq, db_file)
+                    if oldest is not None and oldest > positions[feed] + 1:
+                        # What the client missed has been pruned: it has to reload
+                        positions[feed] = await run_db(latest_seq, db_file)
+                        yield (f'id: {encode_cursor(positions)}\nevent: reset\n'
+                               f'data: {{"feed": "{feed}"}}\n\n').encode('utf-8')
+                    while True:
+                        rows = await run_db(read_changes, db_file, positions[feed])
+                        for seq, op, payload in rows:
+                            positions[feed] = seq
+                            yield _frame(feed, seq, op, payload, positions)
+                        if len(rows) < CHANGE_PAGE_SIZE:
+                            break
+                start_live = False
+                if not ready:
+                    # Caught up: everything after this is live
+                    ready = True
+                    yield f'id: {encode_cursor(positions)}\nevent: ready\ndata: {{}}\n\n'.encode('utf-8')
+
+                while not subscriber.overflowed:
+                    try:
+                        feed, seq, frame = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield b': keepalive\n\n'
+                        continue
+                    if seq > positions[feed]:
+                        positions[feed] = seq
+                        yield frame
+            finally:
+                self.unsubscribe(subscriber)
+
+
+# Global instance
+change_broadcaster = ChangeBroadcaster()
@@ -0,0 +1,62 @@
+import time
+import datetime as dt
+
+
+class Clock:
+    """Real time. Everything that asks what time it is goes through `clock`."""
+
+    def now(self):
+        return dt.datetime.now()
+
+    def today(self):
+        return self.now().date()
+
+    def time(self):
+        """Unix timestamp"""
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+
+class FakeClock(Clock):
+    """Clock that only moves when told to, for simulating days of uptime in tests"""
+
+    def __init__(self, start=None):
+        self._now = start or dt.datetime.now()
+        self._monotonic = 0.0
+
+    def now(self):
+        return self._now
+
+    def time(self):
+        return self._now.timestamp()
+
+    def monotonic(self):
+        return self._monotonic
+
+    def advance(self, **kwargs):
+        """Move time forward by a timedelta's kwargs (days=1, minutes=5, ...)"""
+        delta = dt.timedelta(**kwargs)
+        self._now += delta
+        self._monotonic += delta.total_seconds()
+
+
+class _CurrentClock:
+    """The process-wide clock; clock.use(FakeClock(...)) swaps it everywhere at once"""
+
+    def __init__(self):
+        self._clock = Clock()
+
+    def use(self, clock):
+        self._clock = clock
+
+    def reset(self):
+        self._clock = Clock()
+
+    def __getattr__(self, name):
+        return getattr(self._clock, name)
+
+
+# Global instance
+clock = _CurrentClock()
@@ -1,217 +1,228 @@
-import sqlite3
+import re
 import datetime as dt
-import requests
-from bs4 import BeautifulSoup
-import os
-import pandas as pd
-
-current_year = dt.datetime.now().year
-
-# Database field lists
-Week = []
-Day = []
-Date = []
-OT = []
-Opp = []
-Tm = []
-Opp2 = []
-Cmp = []
-Att = []
-PassYds = []
-PassTD = []
-Int = []
-Sk = []
-SkYds = []
-PassYA = []
-PassNYA = []
-CmpPct = []
-PasserRate = []
-RushAtt = []
-RushYds = []
-RushYA = []
-RushTD = []
-FGM = []
-FGA = []
-XPM = []
-XPA = []
-Pnt = []
-PuntYds = []
-ThirdDownConv = []
-ThirdDownAtt = []
-FourthDownConv = []
-FourthDownAtt = []
-ToP = []
-
-def ncaafdb(team, year=current_year):
+from bs4 import BeautifulSoup, SoupStrainer
+
+from ncaafStats import game_log_store, STAT_NAMES, STAT_TYPES
+from ncaafHttp import http_client, current_season
+from ncaafTeamRegistry import team_registry, canonical_id
+
+# lxml (pinned in requirements.txt) is the tree builder parse_game_log is benchmarked with; html.parser is a fallback
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+GAME_LOG_TABLE_ID = 'offense'
+
+# Game log column -> sports-reference data-stat names it can come from (first found wins)
+GAME_LOG_STATS = {
+    'Week': ('week_num', 'ranker', 'game_num'),
+    'Day': ('game_day_of_week',),
+    'Date': ('date_game', 'date'),
+    'Location': ('game_location',),
+    'Opp': ('opp_name', 'opp'),
+    'Result': ('game_result',),
+    'Tm': ('pts_off', 'points'),
+    'Opp2': ('pts_def', 'opp_points'),
+    'OT': ('overtimes',),
+    'Cmp': ('pass_cmp',),
+    'Att': ('pass_att',),
+    'CmpPct': ('pass_cmp_pct',),
+    'PassYds': ('pass_yds',),
+    'PassTD': ('pass_td',),
+    'Int': ('pass_int',),
+    'Sk': ('pass_sacked',),
+    'SkYds': ('pass_sacked_yds',),
+    'PassYA': ('pass_yds_per_att',),
+    'PassNYA': ('pass_net_yds_per_att',),
+    'PasserRate': ('pass_rating',),
+    'RushAtt': ('rush_att',),
+    'RushYds': ('rush_yds',),
+    'RushYA': ('rush_yds_per_att',),
+    'RushTD': ('rush_td',),
+    'TotPlays': ('tot_plays',),
+    'TotYds': ('tot_yds',),
+    'TotYA': ('tot_yds_per_play',),
+    'FirstDownPass': ('first_down_pass',),
+    'FirstDownRush': ('first_down_rush',),
+    'FirstDownPen': ('first_down_penalty',),
+    'FirstDowns': ('first_down',),
+    'Penalties': ('penalty',),
+    'PenaltyYds': ('penalty_yds',),
+    'FumblesLost': ('fumbles_lost',),
+    'Turnovers': ('turnovers',),
+    'FGM': ('fgm',),
+    'FGA': ('fga',),
+    'XPM': ('xpm',),
+    'XPA': ('xpa',),
+    'Pnt': ('punt',),
+    'PuntYds': ('punt_yds',),
+    'ThirdDownConv': ('third_down_success',),
+    'ThirdDownAtt': ('third_down_att',),
+    'FourthDownConv': ('fourth_down_success',),
+    'FourthDownAtt': ('fourth_down_att',),
+    'ToP': ('time_of_poss',),
+}
+_COLUMN_BY_DATA_STAT = {
+    data_stat: column
+    for column, data_stats in GAME_LOG_STATS.items()
+    for data_stat in data_stats
+}
+
+# "W 52-6", "L (24-27)", "W 35-34 (2OT)"
+_RESULT = re.compile(r'([WLT])\W*(\d+)\s*-\s*(\d+)\W*(\d*OT)?')
+_OPP_RANK = re.compile(r'^\(\d+\)\s*')
+
+
+def _typed(column, text):
+    """Cell text as the store's type for column, None when blank or unparseable"""
+    text = text.strip()
+    if not text:
+        return None
+    kind = STAT_TYPES.get(column, 'TEXT')
+    if kind == 'TEXT':
+        return text
+    try:
+        number = float(text.replace(',', '').replace('%', ''))
+    except ValueError:
+        return None
+    return int(number) if kind == 'INTEGER' else number
+
+
+def _find_game_log_table(html, table_id):
     """
-    Scrape NCAAF team stats and store in SQLite database
+    Parse just the target table: slice its markup out of the page (this also
+    finds tables sports-reference ships inside HTML comments) and only fall
+    back to a SoupStrainer pass over the whole page if that fails.
     """
-    team = team.lower()
-    year = year
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
     
-    # Create ncaafDb directory if it doesn't exist
-    os.makedirs('ncaafDb', exist_ok=True)
+    marker = html.find(f'id="{table_id}"')
+    start = html.rfind('<table', 0, marker) if marker != -1 else -1
+    end = html.find('</table>', marker) if marker != -1 else -1
+    if start != -1 and end != -1:
+        table = BeautifulSoup(html[start:end + len('</table>')], HTML_PARSER).find('table')
+        if table is not None:
+            return table
     
-    sample_list = []
-    s = 'stats'
-    a = 0
+    strainer = SoupStrainer('table', id=table_id)
+    return BeautifulSoup(html, HTML_PARSER, parse_only=strainer).find('table')
+
+
+def parse_game_log(html, table_id=GAME_LOG_TABLE_ID):
+    """
+    One typed record (dict keyed by STAT_NAMES) per game in a sports-reference
+    gamelog table, read row by row through the cells' data-stat attributes.
+    Returns [] when the page doesn't have the table.
+    """
+    table = _find_game_log_table(html, table_id)
+    if table is None:
+        return []
+
+    body = table.find('tbody') or table
+    games = []
+    for tr in body.find_all('tr', recursive=False):
+        # Repeated header rows inside the body
+        if 'thead' in (tr.get('class') or []):
+            continue
+
+        record = dict.fromkeys(STAT_NAMES)
+        for cell in tr.find_all(('th', 'td'), recursive=False):
+            column = _COLUMN_BY_DATA_STAT.get(cell.get('data-stat'))
+            if column and record[column] is None:
+                record[column] = _typed(column, cell.get_text())
+        if record['Date'] is None and record['Opp'] is None:
+            continue
+
+        if record['Week'] is None:
+            record['Week'] = len(games) + 1
+        if record['Opp']:
+            record['Opp'] = _OPP_RANK.sub('', record['Opp'])
+        result = _RESULT.search(record['Result'] or '')
+        if result:
+            if record['Tm'] is None:
+                record['Tm'] = int(result.group(2))
+            if record['Opp2'] is None:
+                record['Opp2'] = int(result.group(3))
+            if record['OT'] is None:
+                record['OT'] = result.group(4)
+        if record['Day'] is None and record['Date']:
+            try:
+                record['Day'] = dt.date.fromisoformat(record['Date']).strftime('%a')
+            except ValueError:
+                pass
+
+        games.append(record)
+    return games
+
+
+def game_log_url(team, year):
+    return f'https://www.sports-reference.com/cfb/schools/{team}/{year}/gamelog/'
+
+
+def store_game_log(team, year, html):
+    """Parse a gamelog page into the game log store. Returns the number of games stored."""
+    games = parse_game_log(html)
+    if not games:
+        return 0
+    # One row per (team, season, week) in the stats store, re-scrapes replace rows
+    return game_log_store.upsert_games(team, year, games)
+
+
+def ncaafdb(team, year=None):
+    """
+    Scrape NCAAF team stats (default: the season in progress) and store them in the game log store
+    """
+    team = canonical_id(team)
+    year = year or current_season()
     
     try:
-        # NCAAF stats URL (using Sports Reference format)
-        url = f'https://www.sports-reference.com/cfb/schools/{team}/{year}/gamelog/'
-        
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        content = requests.get(url, headers=headers)
+        content = http_client.get(game_log_url(team, year), headers=headers)
         content.raise_for_status()
         
-        soup = BeautifulSoup(content.content, 'html.parser')
-        
-        # Find the offensive stats table
-        table = soup.find('table', {'id': 'offense'})
-        if not table:
+        stored = store_game_log(team, year, content.content)
+        if not stored:
             print(f"No offensive stats table found for {team} {year}")
             return False
-            
-        # Extract all table cells
-        td = table.find_all('td')
-        th = table.find_all('th')
-        
-        # Combine all cells for processing
-        all_cells = th + td
-        
-        for cell in all_cells:
-            sample_list.append(cell.text.strip())
-        
-        # NCAAF typically has around 30+ stats per game
-        # Adjust slice indices based on actual table structure
-        stats_per_game = 35  # This may need adjustment
-        
-        if len(sample_list) < stats_per_game:
-            print(f"Not enough data found for {team} {year}")
-            return False
-        
-        # Extract stats by slicing the list (adjust indices based on actual data)
-        Week = sample_list[0::stats_per_game]
-        Day = sample_list[1::stats_per_game]
-        Date = sample_list[2::stats_per_game]
-        OT = sample_list[4::stats_per_game] if len(sample_list) > 4 else []
-        Opp = sample_list[5::stats_per_game] if len(sample_list) > 5 else []
-        Tm = sample_list[6::stats_per_game] if len(sample_list) > 6 else []
-        Opp2 = sample_list[7::stats_per_game] if len(sample_list) > 7 else []
-        Cmp = sample_list[8::stats_per_game] if len(sample_list) > 8 else []
-        Att = sample_list[9::stats_per_game] if len(sample_list) > 9 else []
-        PassYds = sample_list[10::stats_per_game] if len(sample_list) > 10 else []
-        PassTD = sample_list[11::stats_per_game] if len(sample_list) > 11 else []
-        Int = sample_list[12::stats_per_game] if len(sample_list) > 12 else []
-        Sk = sample_list[13::stats_per_game] if len(sample_list) > 13 else []
-        SkYds = sample_list[14::stats_per_game] if len(sample_list) > 14 else []
-        PassYA = sample_list[15::stats_per_game] if len(sample_list) > 15 else []
-        PassNYA = sample_list[16::stats_per_game] if len(sample_list) > 16 else []
-        CmpPct = sample_list[17::stats_per_game] if len(sample_list) > 17 else []
-        PasserRate = sample_list[18::stats_per_game] if len(sample_list) > 18 else []
-        RushAtt = sample_list[19::stats_per_game] if len(sample_list) > 19 else []
-        RushYds = sample_list[20::stats_per_game] if len(sample_list) > 20 else []
-        RushYA = sample_list[21::stats_per_game] if len(sample_list) > 21 else []
-        RushTD = sample_list[22::stats_per_game] if len(sample_list) > 22 else []
-        FGM = sample_list[23::stats_per_game] if len(sample_list) > 23 else []
-        FGA = sample_list[24::stats_per_game] if len(sample_list) > 24 else []
-        XPM = sample_list[25::stats_per_game] if len(sample_list) > 25 else []
-        XPA = sample_list[26::stats_per_game] if len(sample_list) > 26 else []
-        Pnt = sample_list[27::stats_per_game] if len(sample_list) > 27 else []
-        PuntYds = sample_list[28::stats_per_game] if len(sample_list) > 28 else []
-        ThirdDownConv = sample_list[29::stats_per_game] if len(sample_list) > 29 else []
-        ThirdDownAtt = sample_list[30::stats_per_game] if len(sample_list) > 30 else []
-        FourthDownConv = sample_list[31::stats_per_game] if len(sample_list) > 31 else []
-        FourthDownAtt = sample_list[32::stats_per_game] if len(sample_list) > 32 else []
-        ToP = sample_list[33::stats_per_game] if len(sample_list) > 33 else []
-        
-        # Create database connection
-        db_path = os.path.join('ncaafDb', f'{team}-{year}-{s}.db')
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
         
-        # Create table
-        cur.execute("""CREATE TABLE IF NOT EXISTS Stats(
-            Week TEXT, Day TEXT, Date TEXT, OT TEXT, Opp TEXT, Tm TEXT, Opp2 TEXT,
-            Cmp TEXT, Att TEXT, PassYds TEXT, PassTD TEXT, Int TEXT, Sk TEXT, SkYds TEXT,
-            PassYA TEXT, PassNYA TEXT, CmpPct TEXT, PasserRate TEXT, RushAtt TEXT, RushYds TEXT,
-            RushYA TEXT, RushTD TEXT, FGM TEXT, FGA TEXT, XPM TEXT, XPA TEXT, Pnt TEXT,
-            PuntYds TEXT, ThirdDownConv TEXT, ThirdDownAtt TEXT, FourthDownConv TEXT,
-            FourthDownAtt TEXT, ToP TEXT)""")
-        
-        # Insert data
-        for i in range(len(Date)):
-            try:
-                cur.execute("""INSERT INTO Stats VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                          (Week[i] if i < len(Week) else '',
-                           Day[i] if i < len(Day) else '',
-                           Date[i] if i < len(Date) else '',
-                           OT[i] if i < len(OT) else '',
-                           Opp[i] if i < len(Opp) else '',
-                           Tm[i] if i < len(Tm) else '',
-                           Opp2[i] if i < len(Opp2) else '',
-                           Cmp[i] if i < len(Cmp) else '',
-                           Att[i] if i < len(Att) else '',
-                           PassYds[i] if i < len(PassYds) else '',
-                           PassTD[i] if i < len(PassTD) else '',
-                           Int[i] if i < len(Int) else '',
-                           Sk[i] if i < len(Sk) else '',
-                           SkYds[i] if i < len(SkYds) else '',
-                           PassYA[i] if i < len(PassYA) else '',
-                           PassNYA[i] if i < len(PassNYA) else '',
-                           CmpPct[i] if i < len(CmpPct) else '',
-                           PasserRate[i] if i < len(PasserRate) else '',
-                           RushAtt[i] if i < len(RushAtt) else '',
-                           RushYds[i] if i < len(RushYds) else '',
-                           RushYA[i] if i < len(RushYA) else '',
-                           RushTD[i] if i < len(RushTD) else '',
-                           FGM[i] if i < len(FGM) else '',
-                           FGA[i] if i < len(FGA) else '',
-                           XPM[i] if i < len(XPM) else '',
-                           XPA[i] if i < len(XPA) else '',
-                           Pnt[i] if i < len(Pnt) else '',
-                           PuntYds[i] if i < len(PuntYds) else '',
-                           ThirdDownConv[i] if i < len(ThirdDownConv) else '',
-                           ThirdDownAtt[i] if i < len(ThirdDownAtt) else '',
-                           FourthDownConv[i] if i < len(FourthDownConv) else '',
-                           FourthDownAtt[i] if i < len(FourthDownAtt) else '',
-                           ToP[i] if i < len(ToP) else ''))
-            except Exception as e:
-                print(f"Error inserting row {i}: {e}")
-                continue
-                
-        conn.commit()
-        conn.close()
-        
-        print(f"Successfully stored {len(Date)} games for {team} {year}")
+        print(f"Successfully stored {stored} games for {team} {year}")
         return True
         
     except Exception as e:
         print(f"Error scraping {team} {year}: {e}")
         return False
 
+def scrape_team_season(team, year=None):
+    """
+    ncaafdb as a background job body: a failed scrape raises, so the job is marked failed
+    """
+    year = year or current_season()
+    if not ncaafdb(team, year):
+        raise RuntimeError(f"Failed to scrape data for {team} {year}")
+    return {"team": canonical_id(team), "year": year}
+
 def ncaafAddGame(team, game_data):
     """
     Add a single game to NCAAF database
     """
     try:
-        db_path = os.path.join('ncaafDb', f'{team}-{current_year}-stats.db')
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        
-        cur.execute("""INSERT INTO Stats VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                  game_data)
-        
-        conn.commit()
-        conn.close()
-        return True
+        return game_log_store.upsert_games(team, current_season(), [game_data]) == 1
     except Exception as e:
         print(f"Error adding game: {e}")
         return False
 
+# Team display names offered in dropdowns (see ncaafTeamRegistry)
+NCAAF_TEAMS = team_registry.display_names()
+
+# Seasons offered in dropdowns and covered by the backfill
+YEARS = [str(year) for year in range(2020, 2026)]  # Extended to 2025
+
 # Common NCAAF teams for reference
 NCAF_COMMON_TEAMS = [
     "alabama", "ohio-state", "clemson", "oklahoma", "georgia", 
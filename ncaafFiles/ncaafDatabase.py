@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_SECONDS = 10
+PRAGMAS = [
+    ('journal_mode', 'WAL'),          # readers don't block the writer
+    ('synchronous', 'NORMAL'),        # fsync at checkpoints only, safe with WAL
+    ('cache_size', -16000),           # 16 MB page cache per connection
+    ('mmap_size', 128 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+]
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_initialized_schemas = set()
+_watchers = {}
+_watcher_lock = threading.Lock()
+
+
+def _connect(db_file):
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT_SECONDS, cached_statements=STATEMENT_CACHE_SIZE)
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def _thread_connections():
+    # Connections must not be shared with a forked child, so start fresh after a fork
+    if getattr(_local, 'pid', None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+    return _local.connections
+
+
+def get_connection(db_file):
+    """
+    Long-lived connection to db_file for the calling thread.
+
+    Don't close it. Use `with conn:` around writes so they commit (or roll
+    back) as one transaction.
+    """
+    connections = _thread_connections()
+    key = os.path.abspath(db_file)
+    conn = connections.get(key)
+    if conn is None:
+        conn = connections[key] = _connect(db_file)
+    return conn
+
+
+def init_schema(db_file, name, create):
+    """Run create(conn) once per process for the named schema in db_file"""
+    key = (os.path.abspath(db_file), name)
+    if key in _initialized_schemas:
+        return False
+    with _schema_lock:
+        if key in _initialized_schemas:
+            return False
+        conn = get_connection(db_file)
+        with conn:
+            create(conn)
+        _initialized_schemas.add(key)
+    return True
+
+
+def attach(conn, db_file, alias):
+    """Attach another database to a pooled connection (only the first call does anything)"""
+    attached = {row[1] for row in conn.execute('PRAGMA database_list')}
+    if alias not in attached:
+        conn.execute('ATTACH DATABASE ? AS ' + alias, (db_file,))
+
+
+def close_connections():
+    """Close every connection held by the calling thread"""
+    connections = _thread_connections()
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
+
+def data_version(db_file):
+    """
+    Change counter for db_file: it moves whenever any connection, in any
+    thread or process, commits a write. Cheap enough to call per request
+    (no table is read), so it's used to validate in-memory caches.
+    """
+    key = os.path.abspath(db_file)
+    with _watcher_lock:
+        watcher = _watchers.get(key)
+        if watcher is None or watcher[0] != os.getpid():
+            watcher = _watchers[key] = (os.getpid(), sqlite3.connect(db_file, check_same_thread=False))
+        return watcher[1].execute('PRAGMA data_version').fetchone()[0]
@@ -1,52 +1,128 @@
-import sqlite3
 import datetime as dt
-import requests
 from bs4 import BeautifulSoup
 import logging
-from typing import List, Dict
-import time
+from typing import List, Dict, Optional
+
+from ncaafDatabase import get_connection, init_schema, attach
+from ncaafFetch import AsyncFetcher, run_async
+from ncaafCalendar import SeasonCalendar, REGULAR_SEASON, POSTSEASON
+from ncaafLines import PRICE_FIELDS, normalize_gameline, clean_stored_prices
+from ncaafTeamRegistry import canonical_id, canonical_name, migrate_stored_teams
+from ncaafClock import clock
+from ncaafChanges import install_change_log
 
 logger = logging.getLogger(__name__)
 
+# Schedule store configuration
+SCHEDULE_SEASON_TYPES = [REGULAR_SEASON, POSTSEASON]
+SCHEDULE_WEEKS = {
+    REGULAR_SEASON: range(1, 16),
+    POSTSEASON: range(1, 2),  # ESPN lists every bowl under postseason week 1
+}
+SCHEDULE_LOOKAHEAD_DAYS = 30
+SCHEDULE_TTL_HOURS = 6
+SCHEDULE_RETENTION_DAYS = 7    # past schedule games kept before the expiry job prunes them
+
+# Prices are numbers, NULL until a line exists
+EVENTS_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_day DATE NOT NULL,
+        start_time TEXT,
+        home_team TEXT NOT NULL,
+        away_team TEXT NOT NULL,
+        home_ml INTEGER,
+        away_ml INTEGER,
+        home_spread REAL,
+        away_spread REAL,
+        home_spread_odds INTEGER,
+        away_spread_odds INTEGER,
+        over_under REAL,
+        over_odds INTEGER,
+        under_odds INTEGER,
+        status TEXT DEFAULT 'TBD',
+        source TEXT DEFAULT 'schedule',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(game_day, home_team, away_team)
+    )
+'''
+
+# Columns an events refresh can change
+EVENT_COLUMNS = ['start_time', *PRICE_FIELDS, 'status', 'source']
+
 class NCAAFEventsManager:
     def __init__(self):
         self.sport = 'ncaaf'
         self.db_file = 'ncaaf_events.db'
         self.gameline_db_file = 'ncaaf_gamelines.db'
+        self.fetcher = AsyncFetcher()
         self.init_database()
     
     def init_database(self):
-        """Initialize NCAAF events database"""
-        conn = sqlite3.connect(self.db_file)
+        """Initialize NCAAF events database (runs once per process)"""
+        if init_schema(self.db_file, 'events', self._create_schema):
+            logger.info("NCAAF events database initialized")
+
+    def _create_schema(self, conn):
         cursor = conn.cursor()
         
+        cursor.execute(EVENTS_TABLE_SQL.format(table='events'))
+        self._migrate_text_prices(cursor)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_day
+            ON events (game_day, start_time)
+        ''')
+
+        # Scraped schedule, one row per game, refreshed a week at a time
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS events (
+            CREATE TABLE IF NOT EXISTS schedule_games (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
+                season_year INTEGER NOT NULL,
+                season_type INTEGER NOT NULL,
+                week INTEGER NOT NULL,
                 game_day DATE NOT NULL,
                 start_time TEXT,
                 home_team TEXT NOT NULL,
                 away_team TEXT NOT NULL,
-                home_ml TEXT DEFAULT '---',
-                away_ml TEXT DEFAULT '---',
-                home_spread TEXT DEFAULT '---',
-                away_spread TEXT DEFAULT '---',
-                home_spread_odds TEXT DEFAULT '---',
-                away_spread_odds TEXT DEFAULT '---',
-                over_under TEXT DEFAULT '---',
-                over_odds TEXT DEFAULT '---',
-                under_odds TEXT DEFAULT '---',
-                status TEXT DEFAULT 'TBD',
-                source TEXT DEFAULT 'schedule',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                source TEXT DEFAULT 'espn',
                 UNIQUE(game_day, home_team, away_team)
             )
         ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_schedule_games_day
+            ON schedule_games (game_day, start_time)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schedule_weeks (
+                season_year INTEGER NOT NULL,
+                season_type INTEGER NOT NULL,
+                week INTEGER NOT NULL,
+                fetched_at TIMESTAMP NOT NULL,
+                game_count INTEGER DEFAULT 0,
+                first_day DATE,
+                last_day DATE,
+                PRIMARY KEY (season_year, season_type, week)
+            )
+        ''')
+        migrate_stored_teams(conn, ['events', 'schedule_games'])
+        install_change_log(conn, 'events')
+
+    @staticmethod
+    def _migrate_text_prices(cursor):
+        """Rebuild an events table from before prices were typed (TEXT columns, '---' defaults)"""
+        columns = {row[1]: row[2] for row in cursor.execute('PRAGMA table_info(events)')}
+        if columns.get('home_ml', '').upper() != 'TEXT':
+            return
         
-        conn.commit()
-        conn.close()
-        logger.info("NCAAF events database initialized")
+        logger.info("Migrating events prices from TEXT to numeric columns")
+        names = ', '.join(columns)
+        cursor.execute('DROP TABLE IF EXISTS events_typed')
+        cursor.execute(EVENTS_TABLE_SQL.format(table='events_typed'))
+        cursor.execute(f'INSERT INTO events_typed ({names}) SELECT {names} FROM events')
+        clean_stored_prices(cursor.connection, 'events_typed')
+        cursor.execute('DROP TABLE events')
+        cursor.execute('ALTER TABLE events_typed RENAME TO events')
 
     def scrape_espn_schedule_simple(self, days: int = 30) -> List[Dict]:
         """
@@ -54,71 +130,26 @@ class NCAAFEventsManager:
         """
         try:
             games = []
-            current_year = dt.datetime.now().year
+            current_year = clock.today().year
             
-            # Try current season (2) and next season (3 if available)
-            for season_type in [2, 3]:
-                for week in range(1, 16):  # Try weeks 1-15
-                    url = f"https://www.espn.com/college-football/schedule/_/week/{week}/year/{current_year}/seasontype/{season_type}"
-                    
-                    logger.info(f"Scraping ESPN week {week}, season {season_type}")
-                    
-                    try:
-                        headers = {
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                        }
-                        response = requests.get(url, headers=headers, timeout=10)
-                        if response.status_code != 200:
-                            continue
-                            
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        # Look for schedule tables
-                        tables = soup.find_all('table', class_='Table')
-                        
-                        for table in tables:
-                            # Get date from table header
-                            date_header = table.find_previous('div', class_='Table__Title')
-                            if not date_header:
-                                continue
-                                
-                            date_text = date_header.get_text().strip()
-                            game_date = self._parse_simple_date(date_text, week, current_year)
-                            
-                            # Skip if too far in future
-                            if not self._is_within_days(game_date, days):
-                                continue
-                            
-                            # Parse game rows
-                            rows = table.find_all('tr')[1:]  # Skip header row
-                            
-                            for row in rows:
-                                try:
-                                    # Get team cells - ESPN usually has team names in anchors
-                                    team_cells = row.find_all('a', class_='AnchorLink')
-                                    if len(team_cells) >= 2:
-                                        away_team = self._clean_team_name(team_cells[0].get_text().strip())
-                                        home_team = self._clean_team_name(team_cells[1].get_text().strip())
-                                        
-                                        if away_team and home_team:
-                                            game_data = {
-                                                'game_day': game_date.strftime('%Y-%m-%d'),
-                                                'start_time': 'TBD',
-                                                'home_team': home_team,
-                                                'away_team': away_team,
-                                                'source': 'espn'
-                                            }
-                                            games.append(game_data)
-                                            logger.info(f"Found: {away_team} @ {home_team} on {game_date}")
-                                            
-                                except Exception as e:
-                                    continue
-                                    
-                        time.sleep(1)  # Be respectful
-                        
-                    except Exception as e:
-                        logger.debug(f"Error scraping week {week}: {e}")
-                        continue
+            # Only request the regular season (2) and postseason (3) weeks that overlap the window
+            today = clock.today()
+            weeks = self.get_season_calendar(current_year).weeks_overlapping(
+                today, today + dt.timedelta(days=days), self._all_schedule_weeks()
+            )
+            scraped = self._scrape_espn_weeks(weeks, current_year, days)
+            
+            # Every fetched week also sharpens the season calendar
+            for (season_type, week), week_games in scraped.items():
+                if week_games is not None:
+                    self._store_schedule_week(current_year, season_type, week, week_games)
+            
+            for key in weeks:
+                # Skip if too far in future
+                games.extend(
+                    game for game in scraped.get(key) or []
+                    if self._is_within_days(dt.date.fromisoformat(game['game_day']), days)
+                )
             
             logger.info(f"Found {len(games)} total games from ESPN")
             return games
@@ -127,6 +158,176 @@ class NCAAFEventsManager:
             logger.error(f"Error in simple ESPN scraper: {e}")
             return []
 
+    def _scrape_espn_weeks(self, weeks: List[tuple], year: int, days: Optional[int] = None) -> Dict[tuple, Optional[List[Dict]]]:
+        """
+        Scrape ESPN schedule weeks concurrently.
+        Returns {(season_type, week): games}, with None for weeks that couldn't be fetched.
+        With `days`, weeks after one that starts past the window are never requested.
+        """
+        results = {}
+        window_end = (clock.today() + dt.timedelta(days=days)).isoformat() if days is not None else None
+        past_window = {}  # season_type -> first week found to start after the window
+        
+        def skip(key):
+            season_type, week = key
+            return season_type in past_window and week > past_window[season_type]
+        
+        def handle(key, response):
+            season_type, week = key
+            if response is None or response.status_code != 200:
+                results[key] = None
+                return
+            
+            week_games = self._parse_espn_week(response.content, season_type, week, year)
+            results[key] = week_games
+            if window_end and week_games and min(game['game_day'] for game in week_games) > window_end:
+                past_window[season_type] = min(week, past_window.get(season_type, week))
+        
+        items = []
+        for season_type, week in weeks:
+            logger.info(f"Scraping ESPN week {week}, season {season_type}")
+            url = f"https://www.espn.com/college-football/schedule/_/week/{week}/year/{year}/seasontype/{season_type}"
+            items.append(((season_type, week), url))
+        
+        run_async(self.fetcher.fetch_all(items, handle, skip))
+        return results
+
+    def _parse_espn_week(self, content, season_type: int, week: int, year: int) -> List[Dict]:
+        """Parse the games out of an ESPN schedule week page"""
+        games = []
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Look for schedule tables
+        tables = soup.find_all('table', class_='Table')
+        
+        for table in tables:
+            # Get date from table header
+            date_header = table.find_previous('div', class_='Table__Title')
+            if not date_header:
+                continue
+                
+            date_text = date_header.get_text().strip()
+            game_date = self._parse_simple_date(date_text, week, year)
+            
+            # Parse game rows
+            rows = table.find_all('tr')[1:]  # Skip header row
+            
+            for row in rows:
+                try:
+                    # Get team cells - ESPN usually has team names in anchors
+                    team_cells = row.find_all('a', class_='AnchorLink')
+                    if len(team_cells) >= 2:
+                        away_team = canonical_name(team_cells[0].get_text())
+                        home_team = canonical_name(team_cells[1].get_text())
+                        
+                        if away_team and home_team:
+                            games.append({
+                                'game_day': game_date.strftime('%Y-%m-%d'),
+                                'start_time': 'TBD',
+                                'home_team': home_team,
+                                'away_team': away_team,
+                                'source': 'espn',
+                                'season_type': season_type,
+                                'week': week
+                            })
+                            logger.info(f"Found: {away_team} @ {home_team} on {game_date}")
+                            
+                except Exception as e:
+                    continue
+        
+        return games
+
+    def refresh_schedule(self, days: int = SCHEDULE_LOOKAHEAD_DAYS, force: bool = False) -> int:
+        """
+        Re-fetch stale weeks into the schedule store.
+        Only weeks overlapping the next X days are considered; of those, a week is
+        stale if it was never fetched or was fetched more than SCHEDULE_TTL_HOURS ago.
+        """
+        year = clock.today().year
+        stale_weeks = self._stale_schedule_weeks(year, days, force)
+        logger.info(f"Refreshing {len(stale_weeks)} stale NCAAF schedule weeks")
+        
+        scraped = self._scrape_espn_weeks(stale_weeks, year, days)
+        
+        refreshed = 0
+        for (season_type, week), week_games in scraped.items():
+            if week_games is None:
+                continue
+            self._store_schedule_week(year, season_type, week, week_games)
+            refreshed += 1
+        
+        return refreshed
+
+    def get_season_calendar(self, year: int) -> SeasonCalendar:
+        """Season calendar built from the weeks already in the schedule store"""
+        rows = get_connection(self.db_file).execute(
+            'SELECT season_type, week, first_day, last_day FROM schedule_weeks WHERE season_year = ?',
+            (year,)
+        ).fetchall()
+        
+        return SeasonCalendar(year, {(row[0], row[1]): (row[2], row[3]) for row in rows})
+
+    def _all_schedule_weeks(self) -> List[tuple]:
+        return [(season_type, week) for season_type in SCHEDULE_SEASON_TYPES for week in SCHEDULE_WEEKS[season_type]]
+
+    def _stale_schedule_weeks(self, year: int, days: int, force: bool = False) -> List[tuple]:
+        """List the (season_type, week) pairs in the window that need re-fetching"""
+        rows = get_connection(self.db_file).execute(
+            'SELECT season_type, week, fetched_at FROM schedule_weeks WHERE season_year = ?',
+            (year,)
+        ).fetchall()
+        
+        fetched_at = {(row[0], row[1]): dt.datetime.fromisoformat(row[2]) for row in rows}
+        now = clock.now()
+        today = now.date()
+        in_window = self.get_season_calendar(year).weeks_overlapping(
+            today, today + dt.timedelta(days=days), self._all_schedule_weeks()
+        )
+        
+        ttl = dt.timedelta(hours=SCHEDULE_TTL_HOURS)
+        return [
+            key for key in in_window
+            if force or key not in fetched_at or now - fetched_at[key] > ttl
+        ]
+
+    def _store_schedule_week(self, year: int, season_type: int, week: int, games: List[Dict]):
+        """Replace one week of the schedule store in a single transaction"""
+        game_days = [game['game_day'] for game in games]
+        conn = get_connection(self.db_file)
+        
+        try:
+            with conn:
+                conn.execute(
+                    'DELETE FROM schedule_games WHERE season_year = ? AND season_type = ? AND week = ?',
+                    (year, season_type, week)
+                )
+                conn.executemany('''
+                    INSERT OR REPLACE INTO schedule_games
+                    (season_year, season_type, week, game_day, start_time, home_team, away_team, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    year, season_type, week,
+                    game['game_day'],
+                    game.get('start_time', 'TBD'),
+                    game['home_team'],
+                    game['away_team'],
+                    game.get('source', 'espn')
+                ) for game in games])
+                conn.execute('''
+                    INSERT OR REPLACE INTO schedule_weeks
+                    (season_year, season_type, week, fetched_at, game_count, first_day, last_day)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    year, season_type, week,
+                    clock.now().isoformat(),
+                    len(games),
+                    min(game_days) if game_days else None,
+                    max(game_days) if game_days else None
+                ))
+            
+        except Exception as e:
+            logger.error(f"Error storing schedule week {week}: {e}")
+
     def _parse_simple_date(self, date_text: str, week: int, year: int) -> dt.date:
         """Simple date parser"""
         try:
@@ -146,7 +347,7 @@ class NCAAFEventsManager:
             return season_start + dt.timedelta(weeks=week-1)
             
         except:
-            return dt.date.today()
+            return clock.today()
 
     def get_real_2025_schedule(self) -> List[Dict]:
         """Get the real 2025 schedule you provided"""
@@ -186,16 +387,15 @@ class NCAAFEventsManager:
     def get_schedule(self, days: int = 30) -> List[Dict]:
         """
         Main function to get NCAAF schedule
-        Tries web scraping first, falls back to known 2025 schedule
+        Reads the schedule store (kept fresh by refresh_schedule), falls back to known 2025 schedule
         """
         logger.info(f"Getting NCAAF schedule for next {days} days")
-        
-        # Try to scrape from web
-        games = self.scrape_espn_schedule_simple(days)
-        
-        # If no games found, use the real 2025 schedule
+
+        games = self.get_stored_schedule(days)
+
+        # If no games stored, use the real 2025 schedule
         if not games:
-            logger.info("No games from web scraping, using real 2025 schedule")
+            logger.info("No games in schedule store, using real 2025 schedule")
             games = self.get_real_2025_schedule()
         
         # Remove duplicates
@@ -210,53 +410,57 @@ class NCAAFEventsManager:
         logger.info(f"Returning {len(unique_games)} unique games")
         return unique_games
 
+    def get_stored_schedule(self, days: int = 30) -> List[Dict]:
+        """Get scheduled games for the next X days from the schedule store"""
+        conn = get_connection(self.db_file)
+
+        try:
+            cursor = conn.execute('''
+                SELECT game_day, start_time, home_team, away_team, source
+                FROM schedule_games
+                WHERE game_day BETWEEN ? AND ?
+                ORDER BY game_day, start_time
+            ''', self._window(days))
+
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"Error reading schedule store: {e}")
+            return []
+
+    @staticmethod
+    def _window(days: int) -> tuple:
+        """(today, today + days) as ISO dates for game_day BETWEEN ? AND ?"""
+        today = clock.today()
+        return today.isoformat(), (today + dt.timedelta(days=days)).isoformat()
+
     def _is_within_days(self, date: dt.date, days: int) -> bool:
         """Check if date is within the next X days"""
-        today = dt.date.today()
+        today = clock.today()
         future_date = today + dt.timedelta(days=days)
         return today <= date <= future_date
 
-    def _clean_team_name(self, team_name: str) -> str:
-        """Clean team names"""
-        if not team_name:
-            return ""
-        
-        # Remove rankings
-        team_name = team_name.lstrip('1234567890 ')
-        
-        # Standardize names
-        name_map = {
-            'Ohio St.': 'Ohio State',
-            'Michigan St.': 'Michigan State', 
-            'Kansas St.': 'Kansas State',
-            'Miami (FL)': 'Miami',
-            'Florida St.': 'Florida State',
-        }
-        
-        return name_map.get(team_name, team_name)
-
     # KEEP YOUR EXISTING DATABASE METHODS - THEY WORK FINE
 
     def get_existing_gamelines(self, days: int = 7) -> List[Dict]:
         """Get existing NCAAF gamelines from gamelines database"""
         try:
-            conn = sqlite3.connect(self.gameline_db_file)
-            cursor = conn.cursor()
+            conn = get_connection(self.gameline_db_file)
             
-            cursor.execute('''
+            cursor = conn.execute('''
                 SELECT game_day, start_time, home_team, away_team, 
                        home_ml, away_ml, home_spread, away_spread,
                        home_spread_odds, away_spread_odds, over_under,
                        over_odds, under_odds, source
                 FROM gamelines 
-                WHERE game_day BETWEEN date('now') AND date('now', ?)
+                WHERE game_day BETWEEN ? AND ?
                 ORDER BY game_day, start_time
-            ''', (f'+{days} days',))
+            ''', self._window(days))
             
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
             
-            conn.close()
             logger.info(f"Found {len(results)} existing NCAAF gamelines")
             return results
             
@@ -269,7 +473,8 @@ class NCAAFEventsManager:
         Update NCAAF events with schedule data
         """
         try:
-            # Get scheduled games
+            # Bring stale schedule weeks up to date, then read the store
+            self.refresh_schedule(max(days, SCHEDULE_LOOKAHEAD_DAYS))
             scheduled_games = self.get_schedule(days)
             
             if use_gamelines:
@@ -300,15 +505,7 @@ class NCAAFEventsManager:
             'start_time': game.get('start_time', 'TBD'),
             'home_team': game['home_team'],
             'away_team': game['away_team'],
-            'home_ml': '---',
-            'away_ml': '---',
-            'home_spread': '---',
-            'away_spread': '---',
-            'home_spread_odds': '---',
-            'away_spread_odds': '---',
-            'over_under': '---',
-            'over_odds': '---',
-            'under_odds': '---',
+            **dict.fromkeys(PRICE_FIELDS),
             'status': 'TBD',
             'source': game.get('source', 'schedule')
         } for game in scheduled_games]
@@ -317,23 +514,18 @@ class NCAAFEventsManager:
         """Merge scheduled games with existing gamelines"""
         merged_events = self._create_tbd_events(scheduled_games)
         
-        # Update with existing gamelines
-        gameline_map = {(gl['game_day'], gl['home_team'], gl['away_team']): gl for gl in existing_gamelines}
+        # Update with existing gamelines, matched on canonical team ids
+        gameline_map = {
+            (gl['game_day'], canonical_id(gl['home_team']), canonical_id(gl['away_team'])): gl
+            for gl in existing_gamelines
+        }
         
         for event in merged_events:
-            key = (event['game_day'], event['home_team'], event['away_team'])
+            key = (event['game_day'], canonical_id(event['home_team']), canonical_id(event['away_team']))
             if key in gameline_map:
                 gl = gameline_map[key]
                 event.update({
-                    'home_ml': gl.get('home_ml', '---'),
-                    'away_ml': gl.get('away_ml', '---'),
-                    'home_spread': gl.get('home_spread', '---'),
-                    'away_spread': gl.get('away_spread', '---'),
-                    'home_spread_odds': gl.get('home_spread_odds', '---'),
-                    'away_spread_odds': gl.get('away_spread_odds', '---'),
-                    'over_under': gl.get('over_under', '---'),
-                    'over_odds': gl.get('over_odds', '---'),
-                    'under_odds': gl.get('under_odds', '---'),
+                    **normalize_gameline(gl, strict=False),
                     'status': 'OPEN',
                     'source': gl.get('source', 'unknown')
                 })
@@ -341,60 +533,55 @@ class NCAAFEventsManager:
         return merged_events
 
     def _update_database(self, events: List[Dict]) -> int:
-        """Update events in the database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        updated_count = 0
+        """Update events in the database (prices are normalized to numbers/NULL first)"""
+        conn = get_connection(self.db_file)
+        
+        rows = []
+        for event in events:
+            try:
+                prices = normalize_gameline(event)
+            except ValueError as e:
+                logger.warning(f"Skipping event {event.get('away_team')} @ {event.get('home_team')}: {e}")
+                continue
+            rows.append((
+                event['game_day'],
+                event.get('start_time'),
+                canonical_name(event['home_team']),
+                canonical_name(event['away_team']),
+                *[prices[field] for field in PRICE_FIELDS],
+                event.get('status', 'TBD'),
+                event.get('source', 'schedule')
+            ))
         
         try:
-            for event in events:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO events 
+            with conn:
+                # Only rows that actually changed are updated (and reach the change feed)
+                conn.executemany(f'''
+                    INSERT INTO events 
                     (game_day, start_time, home_team, away_team, 
-                     home_ml, away_ml, home_spread, away_spread, 
-                     home_spread_odds, away_spread_odds, over_under, 
-                     over_odds, under_odds, status, source, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    event['game_day'],
-                    event.get('start_time'),
-                    event['home_team'],
-                    event['away_team'],
-                    event.get('home_ml', '---'),
-                    event.get('away_ml', '---'),
-                    event.get('home_spread', '---'),
-                    event.get('away_spread', '---'),
-                    event.get('home_spread_odds', '---'),
-                    event.get('away_spread_odds', '---'),
-                    event.get('over_under', '---'),
-                    event.get('over_odds', '---'),
-                    event.get('under_odds', '---'),
-                    event.get('status', 'TBD'),
-                    event.get('source', 'schedule')
-                ))
-                updated_count += 1
-            
-            conn.commit()
+                     {', '.join(PRICE_FIELDS)}, status, source, updated_at)
+                    VALUES (?, ?, ?, ?, {', '.join('?' for _ in PRICE_FIELDS)}, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (game_day, home_team, away_team) DO UPDATE SET
+                        {', '.join(f'{name} = excluded.{name}' for name in EVENT_COLUMNS)},
+                        updated_at = excluded.updated_at
+                    WHERE ({', '.join(EVENT_COLUMNS)}) IS NOT ({', '.join(f'excluded.{name}' for name in EVENT_COLUMNS)})
+                ''', rows)
+            return len(rows)
             
         except Exception as e:
             logger.error(f"Error updating database: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
-        
-        return updated_count
+            return 0
 
     def get_events(self, days: int = 7) -> List[Dict]:
         """Get NCAAF events from database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        conn = get_connection(self.db_file)
         
         try:
-            cursor.execute('''
+            cursor = conn.execute('''
                 SELECT * FROM events 
-                WHERE game_day BETWEEN date('now') AND date('now', ?)
+                WHERE game_day BETWEEN ? AND ?
                 ORDER BY game_day, start_time
-            ''', (f'+{days} days',))
+            ''', self._window(days))
             
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -403,43 +590,38 @@ class NCAAFEventsManager:
         except Exception as e:
             logger.error(f"Error reading events: {e}")
             return []
-        finally:
-            conn.close()
 
     def get_upcoming_tbd_events(self, days: int = 7) -> List[Dict]:
-        """Get upcoming events without gamelines"""
+        """
+        Get upcoming events without gamelines
+        Served from the schedule store with one indexed query, never scrapes inline
+        """
         try:
-            scheduled_games = self.get_schedule(days)
-            existing_gamelines = self.get_existing_gamelines(days)
-            
-            # Create set of games that already have gamelines
-            existing_games_set = {
-                (gl['game_day'], gl['home_team'], gl['away_team']) 
-                for gl in existing_gamelines
-            }
-            
-            # Filter scheduled games to only include those without gamelines
+            scheduled_games = self._query_unlined_schedule(days)
+
+            if scheduled_games is None:
+                # Nothing stored for the window yet, fall back to the known 2025 schedule
+                existing_games_set = {
+                    (gl['game_day'], canonical_id(gl['home_team']), canonical_id(gl['away_team']))
+                    for gl in self.get_existing_gamelines(days)
+                }
+                scheduled_games = [
+                    game for game in self.get_real_2025_schedule()
+                    if (game['game_day'], canonical_id(game['home_team']), canonical_id(game['away_team']))
+                    not in existing_games_set
+                ]
+
             tbd_events = []
             for game in scheduled_games:
-                game_key = (game['game_day'], game['home_team'], game['away_team'])
-                if game_key not in existing_games_set:
-                    tbd_events.append({
-                        'game_day': game['game_day'],
-                        'start_time': game.get('start_time', 'TBD'),
-                        'home_team': game['home_team'],
-                        'away_team': game['away_team'],
-                        'home_ml': '',
-                        'away_ml': '',
-                        'home_spread': '',
-                        'away_spread': '',
-                        'home_spread_odds': '',
-                        'away_spread_odds': '',
-                        'over_under': '',
-                        'over_odds': '',
-                        'under_odds': '',
-                        'status': 'TBD',
-                        'source': game.get('source', 'schedule')
-                    })
+                tbd_events.append({
+                    'game_day': game['game_day'],
+                    'start_time': game.get('start_time', 'TBD'),
+                    'home_team': game['home_team'],
+                    'away_team': game['away_team'],
+                    **dict.fromkeys(PRICE_FIELDS),
+                    'status': 'TBD',
+                    'source': game.get('source', 'schedule')
+                })
             
             logger.info(f"Found {len(tbd_events)} TBD events without gamelines")
             return tbd_events
@@ -448,20 +630,62 @@ class NCAAFEventsManager:
             logger.error(f"Error getting TBD events: {e}")
             return []
 
-    def cleanup_old_events(self):
-        """Remove old events"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+    def _query_unlined_schedule(self, days: int) -> Optional[List[Dict]]:
+        """
+        Stored games in the next X days that have no gameline yet.
+        Returns None if the store has nothing for the window.
+        """
+        conn = get_connection(self.db_file)
+        attach(conn, self.gameline_db_file, 'gl')
+
+        has_gamelines = conn.execute(
+            "SELECT 1 FROM gl.sqlite_master WHERE type = 'table' AND name = 'gamelines'"
+        ).fetchone()
+
+        window = "s.game_day BETWEEN ? AND ?"
+        params = self._window(days)
+        if not conn.execute(f'SELECT 1 FROM schedule_games s WHERE {window} LIMIT 1', params).fetchone():
+            return None
+
+        query = f'''
+            SELECT s.game_day, s.start_time, s.home_team, s.away_team, s.source
+            FROM schedule_games s
+            WHERE {window}
+        '''
+        if has_gamelines:
+            query += '''
+            AND NOT EXISTS (
+                SELECT 1 FROM gl.gamelines g
+                WHERE g.game_day = s.game_day
+                  AND g.home_team = s.home_team
+                  AND g.away_team = s.away_team
+            )
+            '''
+        query += ' ORDER BY s.game_day, s.start_time'
+
+        cursor = conn.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def cleanup_old_events(self) -> int:
+        """Remove events before today, and schedule games older than SCHEDULE_RETENTION_DAYS"""
+        conn = get_connection(self.db_file)
+        today = clock.today()
         
         try:
-            cursor.execute("DELETE FROM events WHERE game_day < date('now')")
-            deleted_count = cursor.rowcount
-            conn.commit()
-            logger.info(f"Cleaned up {deleted_count} old events")
+            with conn:
+                cursor = conn.execute('DELETE FROM events WHERE game_day < ?', (today.isoformat(),))
+                deleted_count = cursor.rowcount
+                cursor = conn.execute(
+                    'DELETE FROM schedule_games WHERE game_day < ?',
+                    ((today - dt.timedelta(days=SCHEDULE_RETENTION_DAYS)).isoformat(),)
+                )
+                deleted_count += cursor.rowcount
+            logger.info(f"Cleaned up {deleted_count} old events and schedule games")
+            return deleted_count
         except Exception as e:
             logger.error(f"Error cleaning up events: {e}")
-        finally:
-            conn.close()
+            return 0
 
 # Global instance
 ncaaf_events_manager = NCAAFEventsManager()
@@ -0,0 +1,31 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Configuration
+DB_WORKERS = int(os.environ.get('NCAAF_DB_WORKERS', '8'))
+HTTP_WORKERS = int(os.environ.get('NCAAF_HTTP_WORKERS', '8'))
+JOB_WORKERS = int(os.environ.get('NCAAF_JOB_WORKERS', '2'))
+
+# Separate, sized pools: a burst of scrapes or a long bulk write can only use
+# up its own threads, never the ones serving reads
+db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='ncaaf-db')
+http_executor = ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix='ncaaf-http')
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='ncaaf-job')
+
+
+async def run_in(executor, function, *args, **kwargs):
+    """Await a blocking call on the given pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+
+async def run_db(function, *args, **kwargs):
+    """Await blocking SQLite work on the database pool"""
+    return await run_in(db_executor, function, *args, **kwargs)
+
+
+async def run_http(function, *args, **kwargs):
+    """Await blocking HTTP (and the parsing that goes with it) on the HTTP pool"""
+    return await run_in(http_executor, function, *args, **kwargs)
@@ -0,0 +1,123 @@
+import time
+import asyncio
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+from ncaafHttp import http_client, DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+FETCH_CONCURRENCY = 6          # requests in flight at once
+FETCH_RATE_PER_HOST = 1.0      # sustained requests per second to any one host (the old serial loop slept 1s)
+FETCH_BURST_PER_HOST = 1       # requests a host may receive back to back
+FETCH_TIMEOUT = 10
+
+
+class HostLimiter:
+    """
+    Request slots for one host, shared by every fetch in the process (any
+    thread or event loop): each request is given the next free slot,
+    1/rate seconds after the one before, up to `burst` at once when idle.
+    """
+
+    def __init__(self):
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, rate, burst=1):
+        """Claim a slot; returns how many seconds to wait for it"""
+        interval = 1 / rate
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot - (burst - 1) * interval)
+            self._next_slot = max(self._next_slot, slot) + interval
+        return slot - now
+
+    async def acquire(self, rate, burst=1):
+        delay = self.reserve(rate, burst)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+
+def host_limiter(url):
+    """The process-wide HostLimiter for url's host"""
+    host = urlparse(url).netloc
+    with _host_limiters_lock:
+        if host not in _host_limiters:
+            _host_limiters[host] = HostLimiter()
+        return _host_limiters[host]
+
+
+class AsyncFetcher:
+    """
+    Fetch many URLs concurrently with a concurrency cap per call and a
+    per-host rate shared by every fetch in the process, so neither
+    parallelism nor overlapping jobs mean hammering one site.
+    """
+
+    def __init__(self, concurrency=FETCH_CONCURRENCY, rate_per_host=FETCH_RATE_PER_HOST,
+                 burst_per_host=FETCH_BURST_PER_HOST, timeout=FETCH_TIMEOUT, headers=None):
+        self.concurrency = concurrency
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+
+    async def _get(self, url):
+        return await http_client.get_async(url, headers=self.headers, timeout=self.timeout)
+
+    async def fetch_all(self, items, handle, skip=None):
+        """
+        Fetch every (key, url) in items and call handle(key, response) as each
+        finishes. skip(key), checked just before a request is sent, lets the
+        caller cancel work that earlier results have made unnecessary.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(key, url):
+            if skip and skip(key):
+                return
+            async with semaphore:
+                if skip and skip(key):
+                    return
+                await host_limiter(url).acquire(self.rate_per_host, self.burst_per_host)
+                try:
+                    response = await self._get(url)
+                except requests.exceptions.RequestException as e:
+                    logger.debug(f"Error fetching {url}: {e}")
+                    response = None
+            # Parsing is CPU work, keep it off the event loop
+            await asyncio.to_thread(handle, key, response)
+
+        await asyncio.gather(*(run(key, url) for key, url in items))
+
+
+def run_async(coro):
+    """Run a coroutine to completion from sync code, even if a loop is already running here"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
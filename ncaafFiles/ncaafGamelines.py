@@ -1,7 +1,6 @@
 import re
 import json
 import requests
-import pickle
 import sys
 import os
 from datetime import timedelta
@@ -10,9 +9,19 @@ from time import sleep
 from pprint import pprint
 import logging
 import sqlite3
+import base64
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-now = dt.datetime.now()
-today = now.date()
+from ncaafDatabase import get_connection, init_schema, data_version
+from ncaafCache import SharedCache
+from ncaafClock import clock
+from ncaafIngest import ingest_chunks, iter_file_chunks
+from ncaafLines import normalize_gameline, clean_stored_prices, PRICE_FIELDS
+from ncaafTeamRegistry import canonical_id, canonical_name, migrate_stored_teams
+from ncaafChanges import install_change_log
 
 # Add paths
 sys.path.append(os.path.dirname(__file__) + "/api_scrapers/")
@@ -34,10 +43,15 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 # Configuration
-CACHE_FILE = 'ncaaf_gamelines_cache.pkl'
+CACHE_KEY = 'gamelines:all_sportsbooks'
 CACHE_EXPIRY_MINUTES = 2
+SHARED_FETCH_TTL_SECONDS = 30   # workers refreshing the same sources within this long share one scrape
 REQUEST_DELAY = 1
 DB_FILE = 'ncaaf_gamelines.db'
+UPSERT_CHUNK_SIZE = 500
+MAX_PAGE_SIZE = 1000
+MAX_HISTORY_POINTS = 1000
+SOURCE_TIMEOUT_SECONDS = 20     # per-sportsbook deadline unless its config sets 'timeout'
 
 # Sportsbook configurations with priority order
 SPORTSBOOKS = {
@@ -46,28 +60,136 @@ SPORTSBOOKS = {
         'type': 'web',  # web or api
         'function': get_draftkings_ncaaf_gamelines,
         'enabled': True,
-        'priority': 1
+        'priority': 1,
+        'timeout': 30
     },
     'espn_bets': {
         'name': 'ESPN Bets', 
         'type': 'api',
         'function': get_espn_bets_gamelines,
         'enabled': True,
-        'priority': 2
+        'priority': 2,
+        'timeout': 15
     }
 }
 
+# Updating in place keeps each game's id and created_at, and lets the history
+# trigger see the old prices next to the new ones. Rows whose fingerprint
+# hasn't changed are left alone (updated_at included).
+UPSERT_GAMELINE_SQL = '''
+    INSERT INTO gamelines 
+    (source, game_day, start_time, home_team, away_team, home_ml, away_ml, 
+     home_spread, away_spread, home_spread_odds, away_spread_odds, 
+     over_under, over_odds, under_odds, fingerprint, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (source, game_day, home_team, away_team) DO UPDATE SET
+        start_time = excluded.start_time, home_ml = excluded.home_ml, away_ml = excluded.away_ml,
+        home_spread = excluded.home_spread, away_spread = excluded.away_spread,
+        home_spread_odds = excluded.home_spread_odds, away_spread_odds = excluded.away_spread_odds,
+        over_under = excluded.over_under, over_odds = excluded.over_odds, under_odds = excluded.under_odds,
+        fingerprint = excluded.fingerprint, updated_at = excluded.updated_at
+    WHERE gamelines.fingerprint IS NOT excluded.fingerprint
+'''
+
+# Columns copied into gameline_history for every price change
+HISTORY_COLUMNS = ['source', 'game_day', 'start_time', 'home_team', 'away_team', *PRICE_FIELDS]
+
+def _fingerprint(row):
+    """
+    Hash of a line's content (start time and prices) for a row laid out like
+    UPSERT_GAMELINE_SQL's parameters: equal fingerprints mean a write would change nothing
+    """
+    content = (row[2],) + tuple(row[5:5 + len(PRICE_FIELDS)])
+    return hashlib.sha1(repr(content).encode('utf-8')).hexdigest()[:16]
+
+def _gameline_key(row):
+    """(source, game_day, home_team, away_team) of a row laid out like UPSERT_GAMELINE_SQL's parameters"""
+    return row[0], row[1], row[3], row[4]
+
+def _gameline_row(source, game_data):
+    """
+    Build the UPSERT_GAMELINE_SQL parameters for one game, raising ValueError
+    if it can't be stored. Prices are stored as numbers, NULL when missing.
+    """
+    home = game_data.get('home') or game_data.get('home_team')
+    away = game_data.get('away') or game_data.get('away_team')
+    if not source:
+        raise ValueError("missing source")
+    if not home or not away:
+        raise ValueError("missing home/away team")
+    prices = normalize_gameline(game_data)
+    
+    row = (
+        source,
+        game_data.get('game_day') or clock.today().isoformat(),
+        game_data.get('start_time'),
+        canonical_name(home),
+        canonical_name(away),
+        prices['home_ml'],
+        prices['away_ml'],
+        prices['home_spread'],
+        prices['away_spread'],
+        prices['home_spread_odds'],
+        prices['away_spread_odds'],
+        prices['over_under'],
+        prices['over_odds'],
+        prices['under_odds']
+    )
+    return row + (_fingerprint(row),)
+
+class GamelineSnapshot:
+    """Serialized gamelines payload and its strong ETag"""
+    def __init__(self, version, gamelines):
+        self.version = version
+        self.gamelines = gamelines
+        self.body = json.dumps({"Gamelines": {"manual": gamelines}}).encode('utf-8')
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+
+# Latest snapshot per database file
+_snapshots = {}
+_snapshot_lock = threading.Lock()
+
+# Stored fingerprint per (source, game_day, home, away), per database file, with the
+# data_version and change_log seq it is current to. Writes hold the lock so threads
+# don't race on it.
+_fingerprints = {}
+_fingerprint_lock = threading.Lock()
+
+# Scraped sportsbook results, shared by every worker (see ncaafCache)
+gamelines_cache = SharedCache()
+
+def _invalidate_snapshot(db_file):
+    """Drop the cached snapshot after a write (other workers notice through data_version)"""
+    _snapshots.pop(os.path.abspath(db_file), None)
+
+def gameline_cursor(gameline):
+    """Opaque paging cursor for the row after which the next page starts"""
+    key = [gameline['game_day'], gameline['start_time'], gameline['id']]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+def parse_gameline_cursor(cursor):
+    """Inverse of gameline_cursor, raises ValueError on anything malformed"""
+    try:
+        game_day, start_time, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(game_day, str) or not isinstance(row_id, int) or not (start_time is None or isinstance(start_time, str)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return game_day, start_time, row_id
+
 class GamelineManager:
     def __init__(self, db_file=DB_FILE):
         self.db_file = db_file
         self.init_database()
     
     def init_database(self):
-        """Initialize SQLite database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        """Initialize SQLite database (runs once per process)"""
+        if init_schema(self.db_file, 'gamelines', self._create_schema):
+            logger.info("NCAAF database initialized")
+    
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute('''
             CREATE TABLE IF NOT EXISTS gamelines (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 source TEXT NOT NULL,
@@ -84,63 +206,265 @@ class GamelineManager:
                 over_under REAL,
                 over_odds INTEGER,
                 under_odds INTEGER,
+                fingerprint TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(source, game_day, home_team, away_team)
             )
         ''')
+        if 'fingerprint' not in {row[1] for row in conn.execute('PRAGMA table_info(gamelines)')}:
+            conn.execute('ALTER TABLE gamelines ADD COLUMN fingerprint TEXT')
+        # Date-ordered reads and keyset pages (rowid is implicitly the last key column)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_gamelines_day ON gamelines (game_day, start_time)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_gamelines_source_day ON gamelines (source, game_day, start_time)')
+        # Team filters and the schedule's "already has a line" lookup
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_gamelines_home ON gamelines (home_team, game_day)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_gamelines_away ON gamelines (away_team, game_day)')
+        # Rows written before prices were normalized may hold '---' / 'N/A' / '+3.5' text
+        clean_stored_prices(conn, 'gamelines')
+        # ...and team names as each scraper spelled them ('OSU', '5 Ohio State')
+        migrate_stored_teams(conn, ['gamelines'])
+        GamelineManager._refresh_fingerprints(conn)
+        GamelineManager._create_history_schema(conn)
+        # Every write also lands in change_log for /ncaaf/gamelines/stream
+        install_change_log(conn, 'gamelines')
+    
+    @staticmethod
+    def _refresh_fingerprints(conn):
+        """Fill in fingerprints for rows written before they existed (or changed by the cleanups above)"""
+        rows = conn.execute(f'''
+            SELECT source, game_day, start_time, home_team, away_team, {', '.join(PRICE_FIELDS)}, fingerprint, id
+            FROM gamelines
+        ''').fetchall()
+        stale = [(_fingerprint(row), row[-1]) for row in rows if _fingerprint(row) != row[-2]]
+        conn.executemany('UPDATE gamelines SET fingerprint = ? WHERE id = ?', stale)
+    
+    @staticmethod
+    def _create_history_schema(conn):
+        """
+        Append-only line movement: gamelines holds the current line per game and
+        source, and triggers add a gameline_history row whenever a price changes.
+        History outlives the expiry of the game's current line.
+        """
+        price_columns = '\n'.join(f'{name} {"INTEGER" if kind is int else "REAL"},' for name, kind in PRICE_FIELDS.items())
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS gameline_history (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                game_day DATE NOT NULL,
+                start_time TEXT,
+                home_team TEXT NOT NULL,
+                away_team TEXT NOT NULL,
+                {price_columns}
+                recorded_at TIMESTAMP NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_gameline_history_game
+            ON gameline_history (home_team, away_team, game_day, recorded_at)
+        ''')
         
-        conn.commit()
-        conn.close()
-        logger.info("NCAAF database initialized")
+        columns = ', '.join(HISTORY_COLUMNS)
+        new_values = ', '.join(f'NEW.{name}' for name in HISTORY_COLUMNS)
+        price_changed = ' OR '.join(f'NEW.{name} IS NOT OLD.{name}' for name in PRICE_FIELDS)
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS gamelines_history_insert AFTER INSERT ON gamelines
+            BEGIN
+                INSERT INTO gameline_history ({columns}, recorded_at) VALUES ({new_values}, NEW.updated_at);
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS gamelines_history_update AFTER UPDATE ON gamelines
+            WHEN {price_changed}
+            BEGIN
+                INSERT INTO gameline_history ({columns}, recorded_at) VALUES ({new_values}, NEW.updated_at);
+            END
+        ''')
+        # Lines stored before history existed become each game's first point
+        conn.execute(f'''
+            INSERT INTO gameline_history ({columns}, recorded_at)
+            SELECT {columns}, updated_at FROM gamelines
+            WHERE NOT EXISTS (SELECT 1 FROM gameline_history)
+        ''')
     
     def update_gameline(self, source, game_data):
         """Update or insert gameline into database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        result = self.upsert_many([game_data], source=source)[0]
+        if result['accepted'] and not result['written']:
+            logger.debug(f"NCAAF gameline for {game_data.get('home') or game_data.get('home_team')} vs {game_data.get('away') or game_data.get('away_team')} from {source} unchanged")
+        elif result['accepted']:
+            logger.info(f"Updated NCAAF gameline for {game_data.get('home') or game_data.get('home_team')} vs {game_data.get('away') or game_data.get('away_team')} from {source}")
+        else:
+            logger.error(f"Error updating NCAAF gameline: {result['error']}")
+    
+    def upsert_many(self, games, source=None, default_source=None, chunk_size=UPSERT_CHUNK_SIZE):
+        """
+        Insert or update many gamelines in a single transaction.
         
-        try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO gamelines 
-                (source, game_day, start_time, home_team, away_team, home_ml, away_ml, 
-                 home_spread, away_spread, home_spread_odds, away_spread_odds, 
-                 over_under, over_odds, under_odds, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                source,
-                game_data.get('game_day', now),
-                game_data.get('start_time'),
-                game_data['home'],
-                game_data['away'],
-                game_data.get('home_ml'),
-                game_data.get('away_ml'),
-                game_data.get('home_spread'),
-                game_data.get('away_spread'),
-                game_data.get('home_spread_odds'),
-                game_data.get('away_spread_odds'),
-                game_data.get('over_under'),
-                game_data.get('over_odds'),
-                game_data.get('under_odds')
-            ))
-            
-            conn.commit()
-            logger.info(f"Updated NCAAF gameline for {game_data['home']} vs {game_data['away']} from {source}")
+        Each game is a dict in the update_gameline format (home/away or
+        home_team/away_team). The source is `source` if given, else the game's
+        own 'source' key, else `default_source`. Games whose start time and
+        prices match what is stored are skipped without touching the database.
+        Returns one result per game, in order:
+        {'index': i, 'accepted': bool, 'written': bool, 'error': str or None}
+        """
+        results = []
+        valid = []
+        for index, game in enumerate(games):
+            try:
+                row_source = source or game.get('source') or default_source
+                valid.append((index, _gameline_row(row_source, game)))
+                results.append({'index': index, 'accepted': True, 'written': False, 'error': None})
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                results.append({'index': index, 'accepted': False, 'written': False, 'error': str(e)})
+        
+        if not valid:
+            return results
+        
+        with _fingerprint_lock:
+            stored = self._stored_fingerprints()
+            changed = [(index, row) for index, row in valid if stored.get(_gameline_key(row)) != row[-1]]
+            if changed and not self._write_rows(changed, results, chunk_size):
+                return results
             
-        except Exception as e:
-            logger.error(f"Error updating NCAAF gameline: {e}")
-        finally:
-            conn.close()
+            # Our commit moves data_version, so the next call syncs from change_log and
+            # picks up these rows along with anything another connection wrote meanwhile
+            for index, row in changed:
+                if results[index]['accepted']:
+                    results[index]['written'] = True
+                    stored[_gameline_key(row)] = row[-1]
+        
+        written = sum(1 for result in results if result['written'])
+        accepted = sum(1 for result in results if result['accepted'])
+        if written:
+            _invalidate_snapshot(self.db_file)
+            logger.info(f"Wrote {written} of {len(results)} NCAAF gamelines ({accepted - written} unchanged)")
+        else:
+            logger.debug(f"All {accepted} accepted NCAAF gamelines unchanged, nothing written")
+        return results
     
-    def read_gamelines(self, source=None):
-        """Read gamelines from database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+    def _stored_fingerprints(self):
+        """
+        {(source, game_day, home_team, away_team): fingerprint} for stored lines,
+        kept in memory. After any write (ours included) it is brought up to date
+        from change_log, or re-read if the changes it missed have been pruned.
+        """
+        key = os.path.abspath(self.db_file)
+        version = data_version(self.db_file)
+        cached = _fingerprints.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[2]
         
+        conn = get_connection(self.db_file)
+        oldest = conn.execute('SELECT MIN(seq) FROM change_log').fetchone()[0]
+        if cached is not None and oldest is not None and oldest <= cached[1] + 1:
+            seq, fingerprints = cached[1], cached[2]
+            changes = conn.execute('''
+                SELECT seq, op, json_extract(payload, '$.source'), json_extract(payload, '$.game_day'),
+                       json_extract(payload, '$.home_team'), json_extract(payload, '$.away_team'),
+                       json_extract(payload, '$.fingerprint')
+                FROM change_log WHERE seq > ? AND table_name = 'gamelines' ORDER BY seq
+            ''', (seq,)).fetchall()
+            for seq, op, *game, fingerprint in changes:
+                if op == 'delete':
+                    fingerprints.pop(tuple(game), None)
+                else:
+                    fingerprints[tuple(game)] = fingerprint
+        else:
+            # Rows changed after seq is read are replayed on the next sync
+            seq = conn.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log').fetchone()[0]
+            rows = conn.execute(
+                'SELECT source, game_day, home_team, away_team, fingerprint FROM gamelines'
+            ).fetchall()
+            fingerprints = {tuple(row[:4]): row[4] for row in rows}
+        _fingerprints[key] = (version, seq, fingerprints)
+        return fingerprints
+    
+    def _write_rows(self, rows, results, chunk_size):
+        """Upsert (index, row) pairs in one transaction, marking failures in results. False if it rolled back."""
+        conn = get_connection(self.db_file)
         try:
-            if source:
-                cursor.execute('SELECT * FROM gamelines WHERE source = ? ORDER BY game_day, start_time', (source,))
+            with conn:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    try:
+                        conn.executemany(UPSERT_GAMELINE_SQL, [row for _, row in chunk])
+                    except sqlite3.DatabaseError:
+                        # Find the offending rows; the upsert makes re-running the rest harmless
+                        for index, row in chunk:
+                            try:
+                                conn.execute(UPSERT_GAMELINE_SQL, row)
+                            except sqlite3.DatabaseError as e:
+                                results[index].update(accepted=False, error=str(e))
+        except Exception as e:
+            logger.error(f"Error upserting NCAAF gamelines: {e}")
+            for index, _ in rows:
+                results[index].update(accepted=False, error=str(e))
+            return False
+        return True
+    
+    def read_snapshot(self):
+        """
+        All gamelines, pre-serialized for GET /ncaaf/gamelines.
+        Served from memory until something writes to the table.
+        """
+        key = os.path.abspath(self.db_file)
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and snapshot.version == data_version(self.db_file):
+            return snapshot
+        
+        with _snapshot_lock:
+            version = data_version(self.db_file)
+            snapshot = _snapshots.get(key)
+            if snapshot is None or snapshot.version != version:
+                snapshot = _snapshots[key] = GamelineSnapshot(version, self.read_gamelines())
+        return snapshot
+    
+    def read_gamelines(self, source=None, team=None, start_date=None, end_date=None, after=None, limit=None):
+        """
+        Read gamelines from database, ordered by game_day, start_time, id.
+        
+        All filters are optional: source, team (home or away), and an
+        inclusive start_date/end_date range (YYYY-MM-DD). For keyset paging
+        pass limit, then the key of the last row seen as `after`
+        (see gameline_cursor/parse_gameline_cursor).
+        """
+        conn = get_connection(self.db_file)
+        
+        conditions = []
+        params = []
+        if source:
+            conditions.append('source = ?')
+            params.append(source)
+        if team:
+            conditions.append('(home_team = ? OR away_team = ?)')
+            params.extend([canonical_name(team)] * 2)
+        if start_date:
+            conditions.append('game_day >= ?')
+            params.append(start_date)
+        if end_date:
+            conditions.append('game_day <= ?')
+            params.append(end_date)
+        if after:
+            game_day, start_time, row_id = after
+            # Both forms seek on idx_gamelines_day. NULL start times sort first within a day
+            if start_time is None:
+                conditions.append('game_day >= ? AND (game_day > ? OR start_time IS NOT NULL OR id > ?)')
+                params.extend([game_day, game_day, row_id])
             else:
-                cursor.execute('SELECT * FROM gamelines ORDER BY game_day, start_time')
+                conditions.append('(game_day, start_time, id) > (?, ?, ?)')
+                params.extend([game_day, start_time, row_id])
+        
+        query = 'SELECT * FROM gamelines'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY game_day, start_time, id'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        try:
+            cursor = conn.execute(query, params)
             
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -149,12 +473,91 @@ class GamelineManager:
         except Exception as e:
             logger.error(f"Error reading NCAAF gamelines: {e}")
             return []
-        finally:
-            conn.close()
+            
+    def read_games(self, games=None, chunk_size=UPSERT_CHUNK_SIZE):
+        """
+        Every book's current line for the given (game_day, home_team, away_team)
+        games, or for all games when games is None. Unlike read_gamelines, errors
+        are raised: callers keeping derived state must not mistake them for "no rows".
+        """
+        conn = get_connection(self.db_file)
+        if games is None:
+            cursor = conn.execute('SELECT * FROM gamelines ORDER BY game_day, start_time, id')
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        games = list(games)
+        results = []
+        for start in range(0, len(games), chunk_size):
+            chunk = games[start:start + chunk_size]
+            values = ', '.join(['(?, ?, ?)'] * len(chunk))
+            cursor = conn.execute(f'''
+                SELECT * FROM gamelines WHERE (game_day, home_team, away_team) IN (VALUES {values})
+                ORDER BY game_day, start_time, id
+            ''', [field for game in chunk for field in game])
+            columns = [col[0] for col in cursor.description]
+            results.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+        return results
+
+    def read_history(self, home_team, away_team, game_day=None, source=None, start=None, end=None,
+                     interval=None, points=None):
+        """
+        Price changes for one matchup, oldest first (all game days unless game_day).
+        
+        start/end bound recorded_at ('YYYY-MM-DD HH:MM:SS', UTC like updated_at).
+        To downsample, pass interval (seconds) or points (interval = time span /
+        points): each source then keeps only the last change in each interval,
+        i.e. the line that stood at the end of it.
+        """
+        conn = get_connection(self.db_file)
+        
+        conditions = ['home_team = ?', 'away_team = ?']
+        params = [canonical_name(home_team), canonical_name(away_team)]
+        if game_day:
+            conditions.append('game_day = ?')
+            params.append(game_day)
+        if source:
+            conditions.append('source = ?')
+            params.append(source)
+        if start:
+            conditions.append('recorded_at >= ?')
+            params.append(start)
+        if end:
+            conditions.append('recorded_at <= ?')
+            params.append(end)
+        where = ' AND '.join(conditions)
+        
+        try:
+            if points and not interval:
+                first, last = conn.execute(
+                    f"SELECT strftime('%s', MIN(recorded_at)), strftime('%s', MAX(recorded_at)) FROM gameline_history WHERE {where}",
+                    params
+                ).fetchone()
+                span = int(last) - int(first) if first else 0
+                interval = max(1, -(-span // points))
+            
+            if interval:
+                query = f'''
+                    SELECT * FROM gameline_history WHERE id IN (
+                        SELECT MAX(id) FROM gameline_history WHERE {where}
+                        GROUP BY source, game_day, CAST(strftime('%s', recorded_at) AS INTEGER) / ?
+                    )
+                    ORDER BY recorded_at, id
+                '''
+                params.append(interval)
+            else:
+                query = f'SELECT * FROM gameline_history WHERE {where} ORDER BY recorded_at, id'
+            
+            cursor = conn.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Error reading NCAAF gameline history: {e}")
+            return []
             
     def delete_gamelines(self, source=None):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        conn = get_connection(self.db_file)
         
         try:
             # More efficient single query approach
@@ -166,17 +569,21 @@ class GamelineManager:
             '''
             
             # Format current time for comparison
+            now = clock.now()
+            today = now.date().isoformat()
             current_time_str = now.strftime('%H:%M:%S')
             
-            cursor.execute(query, (
-                today,           # game_day < today
-                today,           # game_day = today AND start_time < now
-                current_time_str,
-                today            # game_day = today AND start_time IS NULL (assume past)
-            ))
+            with _fingerprint_lock, conn:
+                cursor = conn.execute(query, (
+                    today,           # game_day < today
+                    today,           # game_day = today AND start_time < now
+                    current_time_str,
+                    today            # game_day = today AND start_time IS NULL (assume past)
+                ))
             
             deleted_count = cursor.rowcount
-            conn.commit()
+            if deleted_count:
+                _invalidate_snapshot(self.db_file)
             
             if deleted_count > 0:
                 logger.info(f"Successfully deleted {deleted_count} expired NCAAF gamelines")
@@ -187,10 +594,7 @@ class GamelineManager:
             
         except Exception as e:
             logger.error(f"Error deleting NCAAF gamelines: {e}")
-            conn.rollback()
             return 0
-        finally:
-            conn.close()
     
     def export_gamelines(self, export_dir='exports'):
         """Export all gamelines to a JSON file with sport name and timestamp"""
@@ -230,84 +634,33 @@ class GamelineManager:
             return None
     
     def import_gamelines(self, filepath):
-        """Import gamelines from a JSON export file"""
+        """Import gamelines from a JSON export file (streamed, so file size doesn't matter)"""
         try:
             if not os.path.exists(filepath):
                 logger.error(f"Import file not found: {filepath}")
                 return False
             
-            # Read the export file
-            with open(filepath, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
+            # Parse the export incrementally, writing each batch in one transaction
+            with open(filepath, 'rb') as f:
+                summary = ingest_chunks(iter_file_chunks(f), self.upsert_many)
             
-            # Validate import data structure
-            if 'gamelines' not in import_data:
-                logger.error("Invalid import file: missing 'gamelines' key")
+            if not summary['total_processed']:
+                logger.error("Invalid import file: no gamelines found")
                 return False
             
-            gamelines = import_data['gamelines']
-            imported_count = 0
+            for result in summary['rejected']:
+                logger.warning(f"Skipping gameline {result['index']}: {result['error']}")
             
-            # Import each gameline
-            for game_data in gamelines:
-                try:
-                    # Extract source from the game data
-                    source = game_data.get('source')
-                    if not source:
-                        logger.warning("Skipping gameline with missing source")
-                        continue
-                    
-                    # Update the gameline in database
-                    self.update_gameline(source, game_data)
-                    imported_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error importing gameline {game_data}: {e}")
-                    continue
-            
-            logger.info(f"Successfully imported {imported_count} NCAAF gamelines from {filepath}")
+            logger.info(f"Successfully imported {summary['accepted']} NCAAF gamelines from {filepath} ({summary['written']} written, {summary['skipped']} unchanged)")
             return True
             
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Invalid JSON in import file: {e}")
             return False
         except Exception as e:
             logger.error(f"Error importing NCAAF gamelines: {e}")
             return False
 
-# Cache functions
-def cache_data(data, filename=CACHE_FILE):
-    """Cache data with timestamp"""
-    cache_data = {
-        'timestamp': now,
-        'data': data
-    }
-    try:
-        with open(filename, 'wb') as f:
-            pickle.dump(cache_data, f)
-        logger.info(f"NCAAF data cached to {filename}")
-    except Exception as e:
-        logger.error(f"Error caching NCAAF data: {e}")
-
-def load_cached_data(filename=CACHE_FILE, expiry_minutes=CACHE_EXPIRY_MINUTES):
-    """Load cached data if it hasn't expired"""
-    try:
-        with open(filename, 'rb') as f:
-            cache_data = pickle.load(f)
-        
-        cache_age = now - cache_data['timestamp']
-        if cache_age < timedelta(minutes=expiry_minutes):
-            logger.info(f"Using cached NCAAF data (age: {cache_age.total_seconds():.0f}s)")
-            return cache_data['data']
-        else:
-            logger.info(f"NCAAF cache expired (age: {cache_age.total_seconds():.0f}s)")
-    except FileNotFoundError:
-        logger.info("No NCAAF cache file found")
-    except Exception as e:
-        logger.error(f"Error loading NCAAF cache: {e}")
-    
-    return None
-
 def validate_gamelines(gamelines):
     """Validate that gamelines data is complete and reasonable"""
     if not gamelines or len(gamelines) == 0:
@@ -324,78 +677,126 @@ def validate_gamelines(gamelines):
     # Consider valid if at least 50% of games have data
     return valid_count >= len(gamelines) * 0.5
 
-def get_gamelines_with_fallback():
-    """Get gamelines with fallback strategy: API -> Web -> Manual"""
+def fetch_sportsbooks(sportsbooks=None):
+    """
+    Run every enabled scraper in `sportsbooks` (default SPORTSBOOKS) at once, each
+    against its own deadline ('timeout' seconds from the start). Returns
+    {source: {'gamelines': list or None, 'error': str or None, 'seconds': float}}
+    as soon as every source has finished or passed its deadline, so the wait
+    is the slowest in-time source rather than the sum of them.
+    """
+    configs = {
+        source: config for source, config in (sportsbooks or SPORTSBOOKS).items()
+        if config['enabled'] and config['function']
+    }
+    results = {}
+    if not configs:
+        return results
+
+    started = time.monotonic()
+    # Not a with-block: a scraper past its deadline is abandoned, not waited for
+    executor = ThreadPoolExecutor(max_workers=len(configs), thread_name_prefix='ncaaf-sportsbook')
+    futures = {executor.submit(config['function']): source for source, config in configs.items()}
+    deadlines = {
+        future: started + configs[source].get('timeout', SOURCE_TIMEOUT_SECONDS)
+        for future, source in futures.items()
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            for future in [future for future in pending if deadlines[future] <= now]:
+                pending.discard(future)
+                future.cancel()
+                results[futures[future]] = {
+                    'gamelines': None,
+                    'error': f"timed out after {deadlines[future] - started:g}s",
+                    'seconds': round(now - started, 3)
+                }
+            if not pending:
+                break
+            done, pending = wait(pending, timeout=min(deadlines[future] for future in pending) - now,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                source = futures[future]
+                result = {'gamelines': None, 'error': None, 'seconds': round(time.monotonic() - started, 3)}
+                try:
+                    gamelines = future.result()
+                    if validate_gamelines(gamelines):
+                        result['gamelines'] = gamelines
+                    else:
+                        result['error'] = "no usable gamelines returned"
+                except Exception as e:
+                    result['error'] = str(e)
+                results[source] = result
+    finally:
+        executor.shutdown(wait=False)
+
+    for source, result in results.items():
+        if result['error']:
+            logger.warning(f"✗ NCAAF {configs[source]['name']}: {result['error']}")
+        else:
+            logger.info(f"✓ NCAAF {configs[source]['name']}: {len(result['gamelines'])} games in {result['seconds']}s")
+    return results
+
+def fetch_sportsbooks_shared(sportsbooks=None):
+    """
+    fetch_sportsbooks through gamelines_cache, single-flight across workers:
+    when several refresh the same sources at once, one scrapes and the others
+    wait for its results instead of scraping again. Results are reused for
+    SHARED_FETCH_TTL_SECONDS, never served stale (an older result written
+    after a newer one would roll prices back).
+    """
+    sportsbooks = sportsbooks or SPORTSBOOKS
+    key = f"{CACHE_KEY}:{','.join(sorted(sportsbooks))}"
+    return gamelines_cache.get_or_refresh(
+        key, SHARED_FETCH_TTL_SECONDS, lambda: fetch_sportsbooks(sportsbooks), serve_stale=False
+    )
+
+def merge_gamelines(gamelines):
+    """
+    Group per-book gameline rows (stored rows or scraper output) by game.
+    Returns one entry per (game_day, home id, away id), in first-seen order,
+    with each book's prices under 'books'.
+    """
+    games = {}
+    for row in gamelines:
+        home = canonical_name(row.get('home_team') or row.get('home'))
+        away = canonical_name(row.get('away_team') or row.get('away'))
+        key = (row.get('game_day'), canonical_id(home), canonical_id(away))
+        game = games.setdefault(key, {
+            'game_day': row.get('game_day'),
+            'start_time': row.get('start_time'),
+            'home_team': home,
+            'away_team': away,
+            'books': {}
+        })
+        if not game['start_time']:
+            game['start_time'] = row.get('start_time')
+        game['books'][row.get('source') or 'unknown'] = normalize_gameline(row, strict=False)
+    return list(games.values())
+
+def get_gamelines_from_sportsbooks():
+    """Fetch every sportsbook concurrently and store each book's lines"""
     manager = GamelineManager()
-    
-    # Try API scrapers first
-    api_sources = {k: v for k, v in SPORTSBOOKS.items() if v['type'] == 'api' and v['enabled']}
-    web_sources = {k: v for k, v in SPORTSBOOKS.items() if v['type'] == 'web' and v['enabled']}
-    
     all_gamelines = {}
-    
-    # Try API sources first
-    for source_id, config in sorted(api_sources.items(), key=lambda x: x[1]['priority']):
-        if not config['function']:
-            continue
-            
-        logger.info(f"Trying NCAAF API scraper: {config['name']}")
-        try:
-            gamelines = config['function']()
-            if validate_gamelines(gamelines):
-                all_gamelines[source_id] = gamelines
-                logger.info(f"✓ NCAAF API {config['name']} successful: {len(gamelines)} games")
-                
-                # Update database
-                for game in gamelines:
-                    manager.update_gameline(source_id, game)
-                    
-                break  # Stop after first successful API source
-            else:
-                logger.warning(f"✗ NCAAF API {config['name']} returned invalid data")
-        except Exception as e:
-            logger.error(f"Error with NCAAF API {config['name']}: {e}")
-    
-    # If no API sources worked, try web scrapers
-    if not all_gamelines:
-        logger.info("No NCAAF API sources successful, trying web scrapers...")
-        for source_id, config in sorted(web_sources.items(), key=lambda x: x[1]['priority']):
-            if not config['function']:
-                continue
-                
-            logger.info(f"Trying NCAAF web scraper: {config['name']}")
-            try:
-                gamelines = config['function']()
-                if validate_gamelines(gamelines):
-                    all_gamelines[source_id] = gamelines
-                    logger.info(f"✓ NCAAF Web {config['name']} successful: {len(gamelines)} games")
-                    
-                    # Update database
-                    for game in gamelines:
-                        manager.update_gameline(source_id, game)
-                        
-                    break  # Stop after first successful web source
-                else:
-                    logger.warning(f"✗ NCAAF Web {config['name']} returned invalid data")
-            except Exception as e:
-                logger.error(f"Error with NCAAF web {config['name']}: {e}")
-    
+    for source, result in fetch_sportsbooks_shared().items():
+        if result['gamelines']:
+            manager.upsert_many(result['gamelines'], source=source)
+            all_gamelines[source] = result['gamelines']
     return all_gamelines
 
 def get_all_ncaaf_gamelines(use_cache=True):
-    """Get gamelines from all sources with caching and fallback"""
-    
+    """
+    Gamelines from every sportsbook, shared by all workers for
+    CACHE_EXPIRY_MINUTES (only one worker scrapes when it expires)
+    """
     if use_cache:
-        cached_data = load_cached_data()
-        if cached_data is not None:
-            return cached_data
+        return gamelines_cache.get_or_refresh(CACHE_KEY, CACHE_EXPIRY_MINUTES * 60, get_gamelines_from_sportsbooks)
     
-    all_gamelines = get_gamelines_with_fallback()
-    
-    # Cache the results
+    all_gamelines = get_gamelines_from_sportsbooks()
     if all_gamelines:
-        cache_data(all_gamelines)
-    
+        gamelines_cache.set(CACHE_KEY, all_gamelines)
     return all_gamelines
 
 def main():
@@ -419,8 +820,10 @@ def main():
         print("Please use the manual input route in the web app.")
         return {"gamelines": []}
 
-# Clean up old gamelines and fetch new ones
-deleter = GamelineManager()
-deleter.delete_gamelines()
+if __name__ == "__main__":
+    # Clean up old gamelines and fetch new ones
+    deleter = GamelineManager()
+    deleter.delete_gamelines()
+
+    ncaaf_game_lines = main()
 
-ncaaf_game_lines = main()
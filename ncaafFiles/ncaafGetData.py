@@ -1,10 +1,8 @@
 
-import datetime as dt
-import requests
 from bs4 import BeautifulSoup
 
-now = dt.datetime.now()
-today = f'{now.month},{now.day},{now.year}'
+from ncaafHttp import http_client
+from ncaafTeamRegistry import canonical_id
 
 off_headers = [
     'Date','Home','Opp','Result','Cmp','Att','Pct','Yds','TD','Att','Yds','Avg','TD','Plays',
@@ -17,38 +15,26 @@ def_headers = [
 ]
 
 def get_team_stats(team,year):
-    url = f'https://www.sports-reference.com/cfb/schools/{team}/{year}/gamelog/'
-    response = requests.get(url)
+    url = f'https://www.sports-reference.com/cfb/schools/{canonical_id(team)}/{year}/gamelog/'
+    response = http_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     tbody = soup.find('tbody')
-
-    if tbody:
-        print('Body found!')
-    else:
-        print('Noooooooobody!')
-
-    off_rows = tbody.find_all('tr')   
+    if not tbody:
+        return []
 
     all_data = []
-    for row in off_rows:
+    for row in tbody.find_all('tr'):
         cells = row.find_all('td')
-        print(len(cells))
         if not cells:
             continue
 
         data = {
-        header: cells[idx].text if len(cells) > idx else None
-        for idx, header in enumerate(off_headers)
-    }
-        
+            header: cells[idx].text if len(cells) > idx else None
+            for idx, header in enumerate(off_headers)
+        }
         all_data.append(data)
 
-    print(all_data)
-    print(type(all_data))
-    try:
-        return all_data
-    except Exception as e:
-        return e
+    return all_data
 
 
 
@@ -57,12 +43,11 @@ def get_player_stats(player,year):
     fname = fname_lname[0]
     lname = fname_lname[1]
     letter = lname[0].lower()
-    print(letter)
     player_id = lname[0:5] + fname[0:2] +'01'
     player_id = player_id.lower()
-    print(player_id)
 
 def get_coach_stats(coach):
     pass
 
-get_team_stats("ohio-state",'2024')
+if __name__ == "__main__":
+    print(get_team_stats("ohio-state", "2024"))
@@ -0,0 +1,287 @@
+import os
+import re
+import gzip
+import hashlib
+import logging
+import threading
+import datetime as dt
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ncaafDatabase import get_connection, init_schema
+from ncaafClock import clock
+from ncaafExecutors import run_http
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+HTTP_CACHE_DIR = os.environ.get('NCAAF_HTTP_CACHE_DIR', 'ncaaf_http_cache')
+HTTP_TIMEOUT = 10
+HTTP_POOL_SIZE = 10            # keep-alive connections kept per host
+HTTP_CACHE_MAX_BYTES = int(os.environ.get('NCAAF_HTTP_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+HTTP_CACHE_MAX_AGE = 30 * 24 * 3600     # entries not fetched or revalidated for this long are dropped
+ORPHAN_GRACE_SECONDS = 3600    # unreferenced objects younger than this may be a write in progress
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# How long a cached response is served without asking the server again.
+# None means never (a finished season doesn't change), 0 means always revalidate.
+HTTP_TTL_CURRENT_SEASON = 15 * 60
+HTTP_TTL_DEFAULT = 0
+
+# URL classes whose pages belong to one season (the captured year)
+SEASON_URL_PATTERNS = [
+    re.compile(r'sports-reference\.com/cfb/schools/[^/]+/(\d{4})'),
+    re.compile(r'espn\.com/college-football/schedule/.*/year/(\d{4})'),
+]
+
+
+def current_season(today=None):
+    """Season year in progress: a season runs from August into January"""
+    today = today or clock.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def ttl_for(url):
+    """Cache TTL rule for a URL (see SEASON_URL_PATTERNS)"""
+    for pattern in SEASON_URL_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return None if int(match.group(1)) < current_season() else HTTP_TTL_CURRENT_SEASON
+    return HTTP_TTL_DEFAULT
+
+
+class HttpClient:
+    """
+    Shared HTTP client for every scraper.
+
+    - keep-alive pooled sessions (one per thread, requests.Session isn't thread safe)
+    - on-disk cache: gzipped bodies stored by content hash under objects/,
+      indexed by URL in index.db
+    - responses past their TTL are revalidated with If-None-Match /
+      If-Modified-Since, a 304 serves the cached body
+    - a stale copy is served if the server can't be reached
+    - an object is deleted once no URL points at it; prune() caps the
+      cache by age and size
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, timeout=HTTP_TIMEOUT, headers=None):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self._sessions = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys(['hits', 'revalidated', 'misses', 'stale', 'uncached'], 0)
+
+    @property
+    def index_file(self):
+        return os.path.join(self.cache_dir, 'index.db')
+
+    def _index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        init_schema(self.index_file, 'http_cache', self._create_schema)
+        return get_connection(self.index_file)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        if 'size' not in {row[1] for row in conn.execute('PRAGMA table_info(responses)')}:
+            conn.execute('ALTER TABLE responses ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+        # "is this object still used" and oldest-first eviction
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_digest ON responses (digest)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_fetched ON responses (fetched_at)')
+
+    def _session(self):
+        session = getattr(self._sessions, 'session', None)
+        if session is None:
+            session = self._sessions.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        return session
+
+    def _count(self, outcome):
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+    def stats(self):
+        """Hit/miss counters since the process started"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        served = stats['hits'] + stats['revalidated'] + stats['misses'] + stats['stale']
+        stats['hit_ratio'] = round((stats['hits'] + stats['revalidated']) / served, 3) if served else None
+        return stats
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest + '.gz')
+
+    def _read_object(self, digest):
+        try:
+            with gzip.open(self._object_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_object(self, content):
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return digest
+
+    def _delete_unreferenced(self, conn, digests):
+        """Remove the objects of digests no row points at any more"""
+        for digest in set(digests):
+            if conn.execute('SELECT 1 FROM responses WHERE digest = ? LIMIT 1', (digest,)).fetchone():
+                continue
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete cached object {digest}: {e}")
+
+    def prune(self, max_bytes=HTTP_CACHE_MAX_BYTES, max_age=HTTP_CACHE_MAX_AGE):
+        """
+        Drop entries not fetched for max_age seconds, then the least recently
+        fetched ones until the cache is under max_bytes, and sweep objects no
+        entry points at. Returns the number of entries dropped.
+        """
+        conn = self._index()
+        with conn:
+            # Entries written before sizes were recorded
+            unsized = conn.execute('SELECT url, digest FROM responses WHERE size = 0').fetchall()
+            conn.executemany('UPDATE responses SET size = ? WHERE url = ?', [
+                (os.path.getsize(self._object_path(digest)), url)
+                for url, digest in unsized if os.path.exists(self._object_path(digest))
+            ])
+
+            cutoff = clock.time() - max_age
+            expired = conn.execute('SELECT digest FROM responses WHERE fetched_at < ?', (cutoff,)).fetchall()
+            conn.execute('DELETE FROM responses WHERE fetched_at < ?', (cutoff,))
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            evicted = []
+            if total > max_bytes:
+                for url, digest, size in conn.execute('SELECT url, digest, size FROM responses ORDER BY fetched_at'):
+                    if total <= max_bytes:
+                        break
+                    evicted.append((url, digest))
+                    total -= size
+                conn.executemany('DELETE FROM responses WHERE url = ?', [(url,) for url, _ in evicted])
+            self._delete_unreferenced(conn, [digest for digest, in expired] + [digest for _, digest in evicted])
+
+        # Objects left behind by a crash, or by a write that raced a delete
+        referenced = {digest for digest, in conn.execute('SELECT DISTINCT digest FROM responses')}
+        objects_dir = os.path.join(self.cache_dir, 'objects')
+        for root, _, files in os.walk(objects_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                digest = name.split('.')[0]
+                try:
+                    if digest not in referenced and clock.time() - os.path.getmtime(path) > ORPHAN_GRACE_SECONDS:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+        dropped = len(expired) + len(evicted)
+        if dropped:
+            logger.info(f"Pruned {dropped} HTTP cache entries")
+        return dropped
+
+    @staticmethod
+    def _cached_response(url, entry, content):
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = content
+        response.headers = CaseInsensitiveDict({'Content-Type': entry['content_type'] or ''})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def get(self, url, headers=None, timeout=None, ttl='auto'):
+        """
+        GET url through the cache. ttl overrides the URL's rule (seconds, None
+        for never expires, 0 to always revalidate). Raises the usual requests
+        exceptions when the server can't be reached and nothing is cached.
+        """
+        if ttl == 'auto':
+            ttl = ttl_for(url)
+
+        conn = self._index()
+        row = conn.execute(
+            'SELECT digest, etag, last_modified, content_type, fetched_at FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+        entry = dict(zip(['digest', 'etag', 'last_modified', 'content_type', 'fetched_at'], row)) if row else None
+        cached = self._read_object(entry['digest']) if entry else None
+
+        if cached is not None and (ttl is None or clock.time() - entry['fetched_at'] < ttl):
+            self._count('hits')
+            return self._cached_response(url, entry, cached)
+
+        request_headers = dict(headers or self.headers)
+        if cached is not None:
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self._session().get(url, headers=request_headers, timeout=timeout or self.timeout)
+        except requests.exceptions.RequestException as e:
+            if cached is None:
+                raise
+            logger.warning(f"Serving stale cache for {url}: {e}")
+            self._count('stale')
+            return self._cached_response(url, entry, cached)
+
+        if response.status_code == 304 and cached is not None:
+            with conn:
+                conn.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (clock.time(), url))
+            self._count('revalidated')
+            return self._cached_response(url, entry, cached)
+
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            self._count('uncached')
+            response.from_cache = False
+            return response
+
+        digest = self._write_object(response.content)
+        with conn:
+            previous = conn.execute('SELECT digest FROM responses WHERE url = ?', (url,)).fetchone()
+            conn.execute('''
+                INSERT OR REPLACE INTO responses (url, digest, etag, last_modified, content_type, fetched_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (url, digest, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                  response.headers.get('Content-Type'), clock.time(), os.path.getsize(self._object_path(digest))))
+            # The URL's old content is garbage unless another URL has the same body
+            if previous and previous[0] != digest:
+                self._delete_unreferenced(conn, [previous[0]])
+        self._count('misses')
+        response.from_cache = False
+        return response
+
+    async def get_async(self, url, headers=None, timeout=None, ttl='auto'):
+        """get() for async callers: runs on the HTTP pool, the event loop keeps serving"""
+        return await run_http(self.get, url, headers=headers, timeout=timeout, ttl=ttl)
+
+
+# Global instance
+http_client = HttpClient()
@@ -0,0 +1,230 @@
+import re
+import ast
+import json
+import codecs
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+INGEST_BATCH_SIZE = 500
+INGEST_CHUNK_BYTES = 64 * 1024
+MAX_OBJECT_CHARS = 64 * 1024    # a single gameline is a few hundred characters
+MAX_REPORTED_REJECTS = 100
+
+_STRUCTURE = re.compile(r'[{}\[\]"\'#]')
+_STRING_END = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+
+
+class GamelineStreamParser:
+    """
+    Incremental parser that pulls gameline objects out of a text stream.
+
+    Accepts any of:
+      - JSON: {"gamelines": [{...}, ...]}, an export file, or a bare [{...}, ...]
+      - JSON lines: one {...} per line
+      - Python literals: gamelines = [{'home_team': 'X', 'home_ml': None}, ...]
+
+    feed() takes text in arbitrary chunks and returns the objects completed so
+    far, so memory stays at one object no matter how large the stream is.
+    Objects are the dicts found directly inside a list, or at the top level
+    of the stream. A top-level dict whose list holds dicts is a wrapper and is
+    not returned itself; one with a list of scalars ("tags": [1]) is an object.
+    """
+
+    def __init__(self, max_object_chars=MAX_OBJECT_CHARS):
+        self.max_object_chars = max_object_chars
+        self._stack = []
+        self._quote = None
+        self._escape = False
+        self._comment = False
+        self._capture_depth = None
+        self._parts = []
+        self._captured_chars = 0
+
+    def feed(self, text):
+        objects = []
+        pos = 0
+        end = len(text)
+        capture_from = 0
+
+        while pos < end:
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+
+            if self._comment:
+                newline = text.find('\n', pos)
+                if newline == -1:
+                    pos = end
+                    break
+                self._comment = False
+                pos = newline + 1
+                continue
+
+            if self._quote:
+                match = _STRING_END[self._quote].search(text, pos)
+                if match is None:
+                    pos = end
+                elif match.group() == '\\':
+                    self._escape = True
+                    pos = match.end()
+                else:
+                    self._quote = None
+                    pos = match.end()
+                continue
+
+            match = _STRUCTURE.search(text, pos)
+            if match is None:
+                break
+            char = match.group()
+            pos = match.end()
+
+            if char in '"\'':
+                self._quote = char
+            elif char == '#':
+                self._comment = True
+            elif char == '{':
+                if self._capture_depth == 1 and self._stack == ['{', '[']:
+                    # An object inside a top-level dict's list: that dict is a
+                    # wrapper like {"gamelines": [...]}, capture its items instead
+                    self._capture_depth = None
+                    self._parts = []
+                if self._capture_depth is None and (not self._stack or self._stack[-1] == '['):
+                    self._capture_depth = len(self._stack) + 1
+                    self._parts = []
+                    self._captured_chars = 0
+                    capture_from = match.start()
+                self._stack.append('{')
+            elif char == '[':
+                self._stack.append('[')
+            else:
+                opening = '{' if char == '}' else '['
+                if not self._stack or self._stack[-1] != opening:
+                    raise ValueError(f"Unbalanced '{char}' in gamelines stream")
+                if char == '}' and self._capture_depth == len(self._stack):
+                    self._parts.append(text[capture_from:pos])
+                    objects.append(_parse_object(''.join(self._parts)))
+                    self._capture_depth = None
+                    self._parts = []
+                self._stack.pop()
+
+        if self._capture_depth is not None:
+            piece = text[capture_from:]
+            self._captured_chars += len(piece)
+            if self._captured_chars > self.max_object_chars:
+                raise ValueError(f"Gameline object longer than {self.max_object_chars} characters")
+            self._parts.append(piece)
+
+        return objects
+
+    def close(self):
+        if self._stack or self._quote:
+            raise ValueError("Gamelines stream ended in the middle of an object")
+
+
+def _parse_object(text):
+    """Parse one object as JSON, falling back to a Python literal"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError) as e:
+        raise ValueError(f"Invalid gameline object: {text[:80]}") from e
+
+
+class _BatchCollector:
+    """Groups parsed objects into bounded batches and totals the write results"""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.batch = []
+        self.total = 0
+        self.accepted = 0
+        self.written = 0
+        self.rejected = []
+
+    def record(self, results):
+        offset = self.total
+        for result in results:
+            if result['accepted']:
+                self.accepted += 1
+                self.written += 1 if result.get('written', True) else 0
+            elif len(self.rejected) < MAX_REPORTED_REJECTS:
+                self.rejected.append({**result, 'index': offset + result['index']})
+        self.total += len(results)
+        self.batch = []
+
+    def summary(self):
+        return {
+            'total_processed': self.total,
+            'accepted': self.accepted,
+            'written': self.written,
+            'skipped': self.accepted - self.written,     # accepted but identical to the stored line
+            'rejected_count': self.total - self.accepted,
+            'rejected': self.rejected
+        }
+
+
+def ingest_chunks(chunks, write_batch, batch_size=INGEST_BATCH_SIZE):
+    """
+    Parse gamelines from an iterable of bytes/str chunks and hand them to
+    write_batch(list) -> results in batches of batch_size.
+    """
+    parser = GamelineStreamParser()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    collector = _BatchCollector(batch_size)
+
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        for obj in parser.feed(text):
+            collector.batch.append(obj)
+            if len(collector.batch) >= batch_size:
+                collector.record(write_batch(collector.batch))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    if collector.batch:
+        collector.record(write_batch(collector.batch))
+
+    return collector.summary()
+
+
+async def ingest_chunks_async(chunks, write_batch, batch_size=INGEST_BATCH_SIZE):
+    """ingest_chunks for an async chunk iterator and an async write_batch"""
+    parser = GamelineStreamParser()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    collector = _BatchCollector(batch_size)
+
+    async for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        for obj in parser.feed(text):
+            collector.batch.append(obj)
+            if len(collector.batch) >= batch_size:
+                collector.record(await write_batch(collector.batch))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    if collector.batch:
+        collector.record(await write_batch(collector.batch))
+
+    return collector.summary()
+
+
+def iter_file_chunks(file_obj, chunk_bytes=INGEST_CHUNK_BYTES):
+    """Read a binary file object in fixed-size chunks"""
+    while True:
+        chunk = file_obj.read(chunk_bytes)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def iter_upload_chunks(upload, chunk_bytes=INGEST_CHUNK_BYTES):
+    """Read a FastAPI UploadFile in fixed-size chunks"""
+    while True:
+        chunk = await upload.read(chunk_bytes)
+        if not chunk:
+            return
+        yield chunk
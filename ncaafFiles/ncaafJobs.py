@@ -0,0 +1,134 @@
+import os
+import json
+import uuid
+import sqlite3
+import logging
+import datetime as dt
+
+from ncaafDatabase import get_connection, init_schema
+from ncaafExecutors import job_executor
+from ncaafClock import clock
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+JOBS_DB_FILE = os.environ.get('NCAAF_JOBS_DB', 'ncaaf_jobs.db')
+JOB_RETENTION_SECONDS = 24 * 60 * 60
+ACTIVE_STATUSES = ('queued', 'running')
+SUBMIT_ATTEMPTS = 5            # inserts to try while racing other workers for a (kind, key)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobStore:
+    """
+    Background jobs with ids, so endpoints that scrape can answer right away.
+
+    Jobs run on the job pool of the worker that accepted them. Their state
+    lives in SQLite so any worker can report on a job id. Submitting a job
+    whose (kind, key) is already queued or running returns that job instead
+    of starting a second one.
+    """
+
+    def __init__(self, db_file=JOBS_DB_FILE, executor=job_executor):
+        self.db_file = db_file
+        self.executor = executor
+
+    def _conn(self):
+        init_schema(self.db_file, 'jobs', self._create_schema)
+        return get_connection(self.db_file)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                pid INTEGER,
+                created_at TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                result TEXT,
+                error TEXT
+            )
+        ''')
+        conn.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active
+            ON jobs (kind, key) WHERE status IN ('queued', 'running')
+        ''')
+
+    def submit(self, kind, key, function, *args, **kwargs):
+        """Run function(*args, **kwargs) in the background. Returns (job id, whether it is new)."""
+        conn = self._conn()
+        now = clock.now()
+        cutoff = (now - dt.timedelta(seconds=JOB_RETENTION_SECONDS)).isoformat()
+        job_id = uuid.uuid4().hex
+
+        for _ in range(SUBMIT_ATTEMPTS):
+            try:
+                with conn:
+                    conn.execute('DELETE FROM jobs WHERE finished_at < ?', (cutoff,))
+                    conn.execute('''
+                        INSERT INTO jobs (id, kind, key, status, pid, created_at)
+                        VALUES (?, ?, ?, 'queued', ?, ?)
+                    ''', (job_id, kind, key, os.getpid(), now.isoformat()))
+                break
+            except sqlite3.IntegrityError:
+                row = conn.execute(
+                    'SELECT id, pid FROM jobs WHERE kind = ? AND key = ? AND status IN (?, ?)',
+                    (kind, key, *ACTIVE_STATUSES)
+                ).fetchone()
+                if row and _alive(row[1]):
+                    return row[0], False
+                if row:
+                    # The worker running it died; let this submit take over
+                    self._update(row[0], status='lost', finished_at=now.isoformat())
+                # Otherwise the active job finished in between: try the insert again
+        else:
+            raise RuntimeError(f"Could not submit {kind} job {key}: still contended after {SUBMIT_ATTEMPTS} attempts")
+
+        self.executor.submit(self._run, job_id, function, args, kwargs)
+        return job_id, True
+
+    def get(self, job_id):
+        """Job state, or None for an unknown (or long finished) id"""
+        cursor = self._conn().execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        job = dict(zip([col[0] for col in cursor.description], row))
+        if job['status'] in ACTIVE_STATUSES and not _alive(job['pid']):
+            job['status'] = 'lost'
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        del job['pid']
+        return job
+
+    def _update(self, job_id, **fields):
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self._conn() as conn:
+            conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+
+    def _run(self, job_id, function, args, kwargs):
+        self._update(job_id, status='running', started_at=clock.now().isoformat())
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"NCAAF job {job_id} failed: {e}")
+            self._update(job_id, status='failed', finished_at=clock.now().isoformat(), error=str(e))
+            return
+        self._update(job_id, status='done', finished_at=clock.now().isoformat(),
+                     result=json.dumps(result, default=str))
+
+
+# Global instance
+job_store = JobStore()
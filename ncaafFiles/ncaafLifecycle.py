@@ -0,0 +1,202 @@
+import os
+import time
+import logging
+import threading
+import datetime as dt
+
+from ncaafScheduler import gameline_scheduler, SCHEDULER_TICK_SECONDS
+from ncaafGamelines import GamelineManager
+from ncaafEvents import ncaaf_events_manager
+from ncaafBackfill import run_backfill
+from ncaafCache import FileLock
+from ncaafChanges import prune_changes
+from ncaafClock import clock
+from ncaafHttp import http_client
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+LOCK_DIR = os.environ.get('NCAAF_LOCK_DIR', '.')
+REFRESH_ENABLED = os.environ.get('NCAAF_REFRESH_ENABLED', '1') == '1'
+LOOP_TICK_SECONDS = 5
+
+
+class RefreshLifecycle:
+    """
+    Owns the scheduled refresh jobs for the app.
+
+    Importing the app only builds in-process state. When the app starts, every
+    worker calls start(), but only the worker that wins the owner lock runs the
+    schedule. On-demand refreshes take a per-job lock so a job never runs twice
+    at the same time across workers.
+    """
+
+    def __init__(self, lock_dir=LOCK_DIR):
+        self.lock_dir = lock_dir
+        self.jobs = {}
+        self.status = {}
+        self.is_owner = False
+        self._owner_lock = FileLock(os.path.join(lock_dir, 'ncaaf_refresh_owner.lock'))
+        self._stop = threading.Event()
+        self._thread = None
+        self._status_lock = threading.Lock()
+
+    def register(self, name, function, interval_seconds, run_on_start=True):
+        """Register a refresh job (interval_seconds=None: only runs when triggered)"""
+        self.jobs[name] = {
+            'function': function,
+            'interval': interval_seconds,
+            'run_on_start': run_on_start
+        }
+        self.status[name] = {
+            'running': False,
+            'last_run': None,
+            'last_duration_seconds': None,
+            'last_error': None,
+            'next_run': None
+        }
+
+    def start(self):
+        """Become the refresh owner if no other worker is, and start the schedule"""
+        if not REFRESH_ENABLED or self._thread is not None:
+            return
+        os.makedirs(self.lock_dir, exist_ok=True)
+        self.is_owner = self._owner_lock.acquire()
+        if not self.is_owner:
+            logger.info("NCAAF refresh owned by another worker")
+            return
+
+        logger.info(f"NCAAF refresh owner is pid {os.getpid()}")
+        now = time.monotonic()
+        self._next_due = {
+            name: now if job['run_on_start'] else now + job['interval']
+            for name, job in self.jobs.items()
+            if job['interval'] is not None
+        }
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='ncaaf-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the schedule and give up ownership"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=LOOP_TICK_SECONDS * 2)
+            self._thread = None
+        if self.is_owner:
+            self._owner_lock.release()
+            self.is_owner = False
+
+    def trigger(self, name, **kwargs):
+        """Run a job now in the background (kwargs go to the job). Returns False if it is already running."""
+        if name not in self.jobs:
+            raise KeyError(name)
+        job_lock = self._job_lock(name)
+        if not job_lock.acquire():
+            return False
+        thread = threading.Thread(target=self._run_locked, args=(name, job_lock), kwargs=kwargs, daemon=True)
+        thread.start()
+        return True
+
+    def run(self, name):
+        """Run a job now in the calling thread. Returns False if it is already running."""
+        job_lock = self._job_lock(name)
+        if not job_lock.acquire():
+            return False
+        self._run_locked(name, job_lock)
+        return True
+
+    def get_status(self):
+        with self._status_lock:
+            return {
+                'owner': self.is_owner,
+                'pid': os.getpid(),
+                'jobs': {name: dict(status) for name, status in self.status.items()}
+            }
+
+    def _job_lock(self, name):
+        return FileLock(os.path.join(self.lock_dir, f'ncaaf_refresh_{name}.lock'))
+
+    def _run_locked(self, name, job_lock, **kwargs):
+        try:
+            self._run_job(name, **kwargs)
+        finally:
+            job_lock.release()
+
+    def _run_job(self, name, **kwargs):
+        job = self.jobs[name]
+        with self._status_lock:
+            self.status[name]['running'] = True
+        started = time.monotonic()
+        error = None
+        try:
+            job['function'](**kwargs)
+        except Exception as e:
+            error = str(e)
+            logger.error(f"NCAAF refresh job {name} failed: {e}")
+        with self._status_lock:
+            self.status[name].update({
+                'running': False,
+                'last_run': clock.now().isoformat(),
+                'last_duration_seconds': round(time.monotonic() - started, 3),
+                'last_error': error
+            })
+
+    def _loop(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for name, job in self.jobs.items():
+                if name not in self._next_due or now < self._next_due[name]:
+                    continue
+                self.run(name)
+                self._next_due[name] = time.monotonic() + job['interval']
+                with self._status_lock:
+                    self.status[name]['next_run'] = (
+                        clock.now() + dt.timedelta(seconds=job['interval'])
+                    ).isoformat()
+            self._stop.wait(LOOP_TICK_SECONDS)
+
+
+def refresh_gamelines():
+    """Pull fresh lines from every sportsbook now, whatever their schedule says"""
+    gameline_scheduler.run_due(force=True)
+
+
+def refresh_schedule():
+    """Re-fetch stale ESPN schedule weeks into the schedule store"""
+    ncaaf_events_manager.refresh_schedule()
+
+
+def expire_old_data():
+    """Prune lines, events and schedule games that are over, so tables stay season-sized"""
+    GamelineManager().delete_gamelines()
+    ncaaf_events_manager.cleanup_old_events()
+    prune_changes()
+    http_client.prune()
+
+
+# Global instance
+lifecycle = RefreshLifecycle()
+# Each sportsbook has its own interval (see ncaafScheduler), the tick only checks what is due
+lifecycle.register('gameline_scheduler', gameline_scheduler.run_due, SCHEDULER_TICK_SECONDS)
+lifecycle.register('gamelines', refresh_gamelines, None)
+lifecycle.register('schedule', refresh_schedule,
+                   int(os.environ.get('NCAAF_SCHEDULE_REFRESH_SECONDS', '1800')))
+lifecycle.register('backfill', run_backfill, None)
+lifecycle.register('expiry', expire_old_data,
+                   int(os.environ.get('NCAAF_EXPIRY_SECONDS', '600')))
+
+
+if __name__ == "__main__":
+    # Standalone refresh worker: run the schedule here and start the web
+    # workers with NCAAF_REFRESH_ENABLED=0 (or let them lose the owner lock)
+    logging.basicConfig(level=logging.INFO)
+    lifecycle.start()
+    if not lifecycle.is_owner:
+        logger.error("Another process already owns the NCAAF refresh schedule")
+    else:
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            lifecycle.stop()
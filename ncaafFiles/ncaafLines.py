@@ -0,0 +1,107 @@
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Price columns shared by the gamelines and events tables, with their storage type
+PRICE_FIELDS = {
+    'home_ml': int,
+    'away_ml': int,
+    'home_spread': float,
+    'away_spread': float,
+    'home_spread_odds': int,
+    'away_spread_odds': int,
+    'over_under': float,
+    'over_odds': int,
+    'under_odds': int,
+}
+
+# Placeholders scrapers and old rows use for "no line"
+MISSING_MARKERS = {'', '-', '--', '---', 'n/a', 'na', 'none', 'null', 'tbd', 'off'}
+PICKEM_MARKERS = {'pk', 'pick', "pick'em", 'pickem'}      # spread of 0
+EVEN_MARKERS = {'ev', 'even', 'evens'}                    # American odds of +100
+
+
+def parse_price(value, kind, field='value'):
+    """
+    Convert a scraped or user-supplied price to int/float, or None when missing.
+
+    Accepts numbers and strings like "-7.5", "+130", "−3½", "PK", "EVEN",
+    "N/A" and "---". Raises ValueError for anything else.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{field}: not a number: {value!r}")
+
+    if isinstance(value, str):
+        text = value.strip().lower().replace('−', '-').replace('½', '.5')
+        if text in MISSING_MARKERS:
+            return None
+        if kind is float and text in PICKEM_MARKERS:
+            return 0.0
+        if kind is int and text in EVEN_MARKERS:
+            return 100
+        try:
+            value = float(text)
+        except ValueError:
+            raise ValueError(f"{field}: not a number: {value!r}")
+
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        if math.isinf(value):
+            raise ValueError(f"{field}: not a number: {value!r}")
+        if kind is int:
+            if value != int(value):
+                raise ValueError(f"{field}: expected whole-number odds, got {value!r}")
+            return int(value)
+        return float(value)
+
+    raise ValueError(f"{field}: not a number: {value!r}")
+
+
+def normalize_gameline(game_data, strict=True):
+    """
+    Typed price fields for one gameline/event dict ('total' is accepted for
+    over_under). With strict=False unparseable values become None instead of
+    raising ValueError.
+    """
+    prices = {}
+    for field, kind in PRICE_FIELDS.items():
+        value = game_data.get(field)
+        if field == 'over_under' and value is None:
+            value = game_data.get('total')
+        try:
+            prices[field] = parse_price(value, kind, field)
+        except ValueError:
+            if strict:
+                raise
+            logger.warning(f"Dropping unparseable {field}: {value!r}")
+            prices[field] = None
+    return prices
+
+
+def clean_stored_prices(conn, table):
+    """
+    Rewrite price values stored as text ('---', 'N/A', '+3.5', ...) in table
+    as numbers or NULL. Returns the number of rows fixed.
+    """
+    columns = list(PRICE_FIELDS)
+    rows = conn.execute(
+        f"SELECT id, {', '.join(columns)} FROM {table} WHERE "
+        + ' OR '.join(f"typeof({column}) = 'text'" for column in columns)
+    ).fetchall()
+    if not rows:
+        return 0
+
+    updates = []
+    for row in rows:
+        prices = normalize_gameline(dict(zip(columns, row[1:])), strict=False)
+        updates.append([prices[column] for column in columns] + [row[0]])
+    conn.executemany(
+        f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+        updates
+    )
+    logger.info(f"Converted text prices to numbers in {len(rows)} {table} rows")
+    return len(rows)
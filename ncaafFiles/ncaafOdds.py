@@ -0,0 +1,134 @@
+import numpy as np
+
+# Configuration
+MAX_FRACTION_DENOMINATOR = 100     # fractional odds are shown as n/d with d up to this
+FRACTION_TOLERANCE = 1e-3
+# Two-way markets priced on a gameline: (market, (side, price column) x2)
+MARKETS = {
+    'moneyline': (('home', 'home_ml'), ('away', 'away_ml')),
+    'spread': (('home', 'home_spread_odds'), ('away', 'away_spread_odds')),
+    'total': (('over', 'over_odds'), ('under', 'under_odds')),
+}
+
+_DENOMINATORS = np.arange(1, MAX_FRACTION_DENOMINATOR + 1)
+
+
+def price_array(rows, column):
+    """One price column of many rows as a float array, NaN where there's no price"""
+    return np.array([row.get(column) for row in rows], dtype=float)
+
+
+def american_to_decimal(american):
+    """-150 -> 1.667, +130 -> 2.3; anything in (-100, 100) is not a valid price and gives NaN"""
+    american = np.asarray(american, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal = np.where(american >= 100, 1 + american / 100, 1 + 100 / -american)
+    return np.where(np.abs(american) >= 100, decimal, np.nan)
+
+
+def decimal_to_american(decimal):
+    decimal = np.asarray(decimal, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        american = np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1))
+    return np.where(decimal > 1, american, np.nan)
+
+
+def decimal_to_fractional(decimal):
+    """
+    (numerator, denominator) int arrays for the profit per unit staked:
+    2.5 -> 3/2, 1.667 -> 2/3. The smallest denominator within
+    FRACTION_TOLERANCE wins, else the closest one; missing prices give 0/0.
+    Prices repeat heavily across a slate, so only distinct ones are searched.
+    """
+    profit, inverse = np.unique(np.asarray(decimal, dtype=float) - 1, return_inverse=True)
+    valid = profit > 0
+    profit = np.where(valid, profit, 1)[:, None]
+    numerators = np.rint(profit * _DENOMINATORS)
+    errors = np.abs(numerators / _DENOMINATORS - profit)
+    close = errors <= FRACTION_TOLERANCE
+    best = np.where(close.any(axis=1), close.argmax(axis=1), errors.argmin(axis=1))
+    numerator = np.where(valid, numerators[np.arange(len(best)), best].astype(int), 0)
+    denominator = np.where(valid, _DENOMINATORS[best], 0)
+    return numerator[inverse.ravel()], denominator[inverse.ravel()]
+
+
+def implied_probability(american):
+    """Break-even win probability of a price, vig included"""
+    return 1 / american_to_decimal(american)
+
+
+def overround(first, second):
+    """Bookmaker margin of a two-way market from its implied probabilities (0.045 = 4.5%)"""
+    return first + second - 1
+
+
+def no_vig(first, second):
+    """Fair probabilities with the margin removed in proportion to each side's implied probability"""
+    total = first + second
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return first / total, second / total
+
+
+def _values(array, digits, cast=float):
+    """JSON-ready list, None for NaN"""
+    missing = np.isnan(array)
+    values = np.where(missing, 0, np.round(array, digits)).astype(cast).astype(object)
+    values[missing] = None
+    return values.tolist()
+
+
+def _fractions(decimal):
+    prices, inverse = np.unique(decimal, return_inverse=True)
+    numerator, denominator = decimal_to_fractional(prices)
+    labels = np.array([f'{n}/{d}' if d else None for n, d in zip(numerator.tolist(), denominator.tolist())],
+                      dtype=object)
+    return labels[inverse.ravel()].tolist()
+
+
+def fair_columns(rows):
+    """
+    Implied probability, overround and no-vig fair prices for every market of
+    every row (gamelines or gameline_history rows), computed a column at a time.
+
+    Returns {market: {'overround': [...], side: {field: [...]}}} with lists
+    parallel to rows. Each side has its price as american/decimal/fractional,
+    the implied probability, and the fair probability/decimal/american.
+    Values are None where a price is missing.
+    """
+    markets = {}
+    for market, ((first_side, first_column), (second_side, second_column)) in MARKETS.items():
+        american = {first_side: price_array(rows, first_column), second_side: price_array(rows, second_column)}
+        decimal = {side: american_to_decimal(prices) for side, prices in american.items()}
+        implied = {side: 1 / prices for side, prices in decimal.items()}
+        fair = dict(zip((first_side, second_side), no_vig(implied[first_side], implied[second_side])))
+
+        columns = {'overround': _values(overround(implied[first_side], implied[second_side]), 4)}
+        for side in (first_side, second_side):
+            with np.errstate(divide='ignore'):
+                fair_decimal = 1 / fair[side]
+            columns[side] = {
+                'american': _values(american[side], 0, int),
+                'decimal': _values(decimal[side], 3),
+                'fractional': _fractions(decimal[side]),
+                'implied_probability': _values(implied[side], 4),
+                'fair_probability': _values(fair[side], 4),
+                'fair_decimal': _values(fair_decimal, 3),
+                'fair_american': _values(decimal_to_american(fair_decimal), 1),
+            }
+
+        markets[market] = columns
+    return markets
+
+
+def fair_lines(rows):
+    """fair_columns turned into one {market: {'overround': x, side: {field: value}}} per row"""
+    per_market = []
+    for market, sides in fair_columns(rows).items():
+        names = list(sides)
+        columns = [
+            values if name == 'overround' else [dict(zip(values, fields)) for fields in zip(*values.values())]
+            for name, values in sides.items()
+        ]
+        per_market.append((market, [dict(zip(names, entries)) for entries in zip(*columns)]))
+    markets = [market for market, _ in per_market]
+    return [dict(zip(markets, entries)) for entries in zip(*(lines for _, lines in per_market))]
@@ -0,0 +1,231 @@
+import json
+import logging
+import threading
+
+import numpy as np
+
+from ncaafDatabase import data_version
+from ncaafChanges import latest_seq, oldest_seq, read_changes, CHANGE_PAGE_SIZE
+from ncaafGamelines import GamelineManager, DB_FILE
+from ncaafOdds import american_to_decimal, price_array
+from ncaafTeamRegistry import canonical_name
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# (market, side): (price column, line column, +1 if a higher line is better for the bettor else -1)
+SIDES = {
+    ('moneyline', 'home'): ('home_ml', None, 1),
+    ('moneyline', 'away'): ('away_ml', None, 1),
+    ('spread', 'home'): ('home_spread_odds', 'home_spread', 1),
+    ('spread', 'away'): ('away_spread_odds', 'away_spread', 1),
+    ('total', 'over'): ('over_odds', 'over_under', -1),
+    ('total', 'under'): ('under_odds', 'over_under', 1),
+}
+MARKET_SIDES = {
+    'moneyline': ('home', 'away'),
+    'spread': ('home', 'away'),
+    'total': ('over', 'under'),
+}
+
+
+def _game_key(row):
+    return row['game_day'], row['home_team'], row['away_team']
+
+
+def _best_rows(groups, decimal, line):
+    """
+    Index of the best row per group (groups are 0..n-1, all present): the most
+    favourable line first, then the highest price. Also whether it has a price.
+    """
+    valid = ~np.isnan(decimal) & ~np.isnan(line)
+    order = np.lexsort((-decimal, -line, ~valid, groups))
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    best = order[starts]
+    return best, valid[best]
+
+
+def scan_lines(rows):
+    """
+    Best price per side plus arbitrages and middles for every game in rows
+    (current gamelines of any number of books), keyed by (game_day, home_team, away_team).
+
+    Each side's best line is found with one sort over all rows: grouped by
+    game, most favourable line (a higher spread, a lower total for the over)
+    first, then the highest price. A market is an arbitrage when the two best
+    sides can't both lose (their lines don't cross) and their implied
+    probabilities add up to under 1; it is a middle when there's a gap
+    between the lines in which both sides win.
+    """
+    if not rows:
+        return {}
+    keys = {}
+    groups = np.array([keys.setdefault(_game_key(row), len(keys)) for row in rows])
+    first_rows = np.unique(groups, return_index=True)[1]
+    sources = np.array([row['source'] for row in rows], dtype=object)
+
+    best = {}
+    for (market, side), (price_column, line_column, direction) in SIDES.items():
+        american = price_array(rows, price_column)
+        decimal = american_to_decimal(american)
+        line = price_array(rows, line_column) if line_column else np.zeros(len(rows))
+        index, valid = _best_rows(groups, decimal, line * direction)
+        best[market, side] = {
+            'valid': valid,
+            'source': sources[index],
+            'american': american[index],
+            'decimal': decimal[index],
+            'line': line[index],
+            'favourable': line[index] * direction,
+        }
+
+    opportunities = {}
+    for market, (first, second) in MARKET_SIDES.items():
+        first_best, second_best = best[market, first], best[market, second]
+        priced = first_best['valid'] & second_best['valid']
+        # Width of the window in which both sides win: 0 when the lines meet, negative when both can lose
+        width = first_best['favourable'] + second_best['favourable']
+        implied = 1 / first_best['decimal'] + 1 / second_best['decimal']
+        opportunities[market] = {
+            'arbitrage': priced & (width >= 0) & (implied < 1),
+            'middle': priced & (width > 0),
+            'width': width,
+            'implied': implied,
+        }
+
+    books = {}
+    for group, source in zip(groups.tolist(), sources.tolist()):
+        books.setdefault(group, []).append(source)
+
+    results = {}
+    for key, group in keys.items():
+        row = rows[first_rows[group]]
+        result = {
+            'game_day': row['game_day'],
+            'start_time': row['start_time'],
+            'home_team': row['home_team'],
+            'away_team': row['away_team'],
+            'books': books[group],
+            'best': {},
+            'arbitrage': {},
+            'middle': {},
+        }
+        for market, sides in MARKET_SIDES.items():
+            first, second = sides
+            result['best'][market] = {
+                side: {
+                    'source': best[market, side]['source'][group],
+                    'american': int(best[market, side]['american'][group]),
+                    'decimal': round(float(best[market, side]['decimal'][group]), 3),
+                    'line': float(best[market, side]['line'][group]) if market != 'moneyline' else None,
+                } if best[market, side]['valid'][group] else None
+                for side in sides
+            }
+            found = opportunities[market]
+            if found['arbitrage'][group]:
+                implied = float(found['implied'][group])
+                result['arbitrage'][market] = {
+                    'margin': round(1 - implied, 4),
+                    # Share of the total stake per side for the same payout either way
+                    'stakes': {
+                        side: round(1 / float(best[market, side]['decimal'][group]) / implied, 4) for side in sides
+                    },
+                }
+            if found['middle'][group]:
+                # Final margins (home minus away) or totals strictly inside the window win both bets
+                result['middle'][market] = {
+                    'window': [-float(best[market, first]['favourable'][group]),
+                               float(best[market, second]['favourable'][group])],
+                    'width': float(found['width'][group]),
+                    'cost': round(float(found['implied'][group]) - 1, 4),
+                }
+        results[key] = result
+    return results
+
+
+class LineScanner:
+    """
+    Cross-book scan of the gamelines table, kept up to date incrementally.
+
+    Reads check the database's data_version. After a write, only the games
+    named in change_log since the last scan are read back and rescanned; the
+    whole table is rescanned on first use or when the changes it missed have
+    been pruned.
+    """
+
+    def __init__(self, db_file=DB_FILE):
+        self.db_file = db_file
+        self.games = {}
+        self.seq = None
+        self.version = None
+        self._ordered = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Bring the scan up to date with the table; returns how many games were
+        rescanned. If the database can't be read the previous results are kept
+        and the same changes are retried on the next call.
+        """
+        manager = GamelineManager(self.db_file)
+        with self._lock:
+            version = data_version(self.db_file)
+            if version == self.version:
+                return 0
+
+            try:
+                oldest = oldest_seq(self.db_file)
+                if self.seq is None or oldest is None or oldest > self.seq + 1:
+                    seq = latest_seq(self.db_file)
+                    games = scan_lines(manager.read_games())
+                    rescanned = len(games)
+                else:
+                    seq = self.seq
+                    changed = set()
+                    while True:
+                        rows = read_changes(self.db_file, seq)
+                        for seq, _, payload in rows:
+                            changed.add(_game_key(json.loads(payload)))
+                        if len(rows) < CHANGE_PAGE_SIZE:
+                            break
+                    games = {key: game for key, game in self.games.items() if key not in changed}
+                    games.update(scan_lines(manager.read_games(changed)))
+                    rescanned = len(changed)
+            except Exception as e:
+                logger.error(f"Error scanning NCAAF gamelines across books: {e}")
+                return 0
+
+            self.games = games
+            self.seq = seq
+            self.version = version
+            self._ordered = None
+            if rescanned:
+                logger.debug(f"Rescanned {rescanned} NCAAF games across books")
+            return rescanned
+
+    def read(self, team=None, start_date=None, end_date=None, kind=None):
+        """
+        Scan results ordered by game_day and start_time. Optional filters: team
+        (home or away), game_day range, and kind ('arbitrage' or
+        'middle') to keep only games with that opportunity.
+        """
+        self.refresh()
+        team = canonical_name(team) if team else None
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = [self.games[key] for key in sorted(
+                    self.games, key=lambda key: (key[0], self.games[key]['start_time'] or '', key[1:])
+                )]
+            games = self._ordered
+        return [
+            game for game in games
+            if (not team or team in (game['home_team'], game['away_team']))
+            and (not start_date or game['game_day'] >= start_date)
+            and (not end_date or game['game_day'] <= end_date)
+            and (not kind or game[kind])
+        ]
+
+
+# Global instance
+line_scanner = LineScanner()
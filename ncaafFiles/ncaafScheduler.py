@@ -0,0 +1,211 @@
+import os
+import random
+import logging
+import threading
+import datetime as dt
+
+from ncaafDatabase import get_connection, init_schema
+from ncaafGamelines import GamelineManager, SPORTSBOOKS, DB_FILE, fetch_sportsbooks_shared
+from ncaafEvents import ncaaf_events_manager
+from ncaafClock import clock
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SCHEDULER_TICK_SECONDS = int(os.environ.get('NCAAF_GAMELINES_TICK_SECONDS', '30'))
+DEFAULT_SOURCE_INTERVAL = int(os.environ.get('NCAAF_GAMELINES_REFRESH_SECONDS', '900'))
+SOURCE_INTERVALS = {          # seconds between runs far from kickoff, per SPORTSBOOKS key
+    'espn_bets': 600,
+    'draftkings': 900,
+}
+# (next kickoff within seconds, longest allowed interval): lines move most right before games
+KICKOFF_TIERS = [
+    (60 * 60, 60),
+    (6 * 60 * 60, 180),
+    (24 * 60 * 60, 300),
+]
+JITTER_FRACTION = 0.1         # +/- share of the interval, so sources don't fire in lockstep
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 60 * 60
+KICKOFF_CHECK_DAYS = 2
+
+
+def _kickoff(game_day, start_time):
+    """Local kickoff datetime for a stored game; games without a usable time count as noon"""
+    try:
+        day = dt.date.fromisoformat(str(game_day))
+    except ValueError:
+        return None
+    start_time = (start_time or '').strip()
+    if start_time.endswith('Z'):
+        try:
+            utc = dt.datetime.strptime(f'{day} {start_time[:-1]}', '%Y-%m-%d %H:%M')
+            return utc.replace(tzinfo=dt.timezone.utc).astimezone().replace(tzinfo=None)
+        except ValueError:
+            pass
+    for fmt in ('%I:%M %p', '%H:%M:%S', '%H:%M'):
+        try:
+            return dt.datetime.combine(day, dt.datetime.strptime(start_time, fmt).time())
+        except ValueError:
+            continue
+    return dt.datetime.combine(day, dt.time(12))
+
+
+class GamelineScheduler:
+    """
+    Runs each enabled SPORTSBOOKS source on its own schedule and writes the
+    results through GamelineManager.
+
+    A source's interval is its SOURCE_INTERVALS entry, capped by KICKOFF_TIERS
+    as the next known kickoff gets closer, with jitter. Failures back off
+    exponentially from BACKOFF_BASE_SECONDS. Per-source state lives in the
+    gamelines database so every worker can report it and restarts keep backoff.
+    """
+
+    def __init__(self, db_file=DB_FILE, sportsbooks=SPORTSBOOKS):
+        self.db_file = db_file
+        self.sportsbooks = sportsbooks
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        init_schema(self.db_file, 'gameline_refresh', self._create_schema)
+        return get_connection(self.db_file)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS gameline_refresh (
+                source TEXT PRIMARY KEY,
+                last_run TIMESTAMP,
+                last_success TIMESTAMP,
+                last_error TEXT,
+                consecutive_failures INTEGER DEFAULT 0,
+                last_count INTEGER,
+                interval_seconds REAL,
+                next_run REAL
+            )
+        ''')
+
+    def sources(self):
+        """Enabled sources that have a scraper function"""
+        return {
+            source: config for source, config in self.sportsbooks.items()
+            if config['enabled'] and config['function']
+        }
+
+    def seconds_to_kickoff(self, now=None):
+        """Seconds until the next known kickoff (gamelines + schedule store), None if none soon"""
+        now = now or clock.now()
+        end = (now + dt.timedelta(days=KICKOFF_CHECK_DAYS)).date().isoformat()
+        games = GamelineManager(self.db_file).read_gamelines(start_date=now.date().isoformat(), end_date=end)
+        games += ncaaf_events_manager.get_stored_schedule(KICKOFF_CHECK_DAYS)
+
+        upcoming = [
+            kickoff for kickoff in (_kickoff(game['game_day'], game.get('start_time')) for game in games)
+            if kickoff and kickoff >= now
+        ]
+        return (min(upcoming) - now).total_seconds() if upcoming else None
+
+    def interval_for(self, source, seconds_to_kickoff=None):
+        """Seconds until the next run of a healthy source, before jitter"""
+        interval = SOURCE_INTERVALS.get(source, DEFAULT_SOURCE_INTERVAL)
+        if seconds_to_kickoff is not None:
+            for within, cap in KICKOFF_TIERS:
+                if seconds_to_kickoff <= within:
+                    interval = min(interval, cap)
+                    break
+        return interval
+
+    @staticmethod
+    def _jittered(interval):
+        return interval * (1 + random.uniform(-JITTER_FRACTION, JITTER_FRACTION))
+
+    def _state(self):
+        conn = self._conn()
+        cursor = conn.execute('SELECT * FROM gameline_refresh')
+        columns = [col[0] for col in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
+    def run_due(self, force=False):
+        """
+        Run every source whose next_run has passed (all of them with force).
+        Returns {source: games stored, or None on failure}.
+        """
+        if not self._lock.acquire(blocking=False):
+            return {}
+        try:
+            state = self._state()
+            now = clock.time()
+            due = [
+                source for source in self.sources()
+                if force or (state.get(source) or {}).get('next_run') is None or state[source]['next_run'] <= now
+            ]
+            if not due:
+                return {}
+
+            # Due sources are fetched concurrently, each against its own timeout. Other
+            # workers due at the same time wait for this scrape and reuse its results
+            started = clock.now().isoformat()
+            fetched = fetch_sportsbooks_shared({source: self.sportsbooks[source] for source in due})
+            results = {}
+            for source in due:
+                results[source] = self._record(source, state.get(source) or {}, started, fetched.get(source))
+
+            if any(count for count in results.values()):
+                GamelineManager(self.db_file).delete_gamelines()
+            return results
+        finally:
+            self._lock.release()
+
+    def _record(self, source, previous, started, fetched):
+        """Store one source's fetch result and schedule its next run"""
+        count = None
+        error = fetched['error'] if fetched else "not run"
+        if not error:
+            results = GamelineManager(self.db_file).upsert_many(fetched['gamelines'], source=source)
+            count = sum(result['accepted'] for result in results)
+            written = sum(result['written'] for result in results)
+            logger.info(f"{source}: {count} NCAAF gamelines, {written} changed")
+
+        if error:
+            failures = (previous.get('consecutive_failures') or 0) + 1
+            interval = min(BACKOFF_BASE_SECONDS * 2 ** (failures - 1), BACKOFF_MAX_SECONDS)
+        else:
+            failures = 0
+            # Kickoffs are looked up after the write, so a first scrape tightens its own schedule
+            interval = self.interval_for(source, self.seconds_to_kickoff())
+        interval = self._jittered(interval)
+
+        with self._conn() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO gameline_refresh
+                (source, last_run, last_success, last_error, consecutive_failures, last_count, interval_seconds, next_run)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (source, started, previous.get('last_success') if error else started, error, failures,
+                  count if count is not None else previous.get('last_count'), round(interval, 1),
+                  clock.time() + interval))
+        return count
+
+    def get_status(self):
+        """Last/next run per source, readable from any worker"""
+        state = self._state()
+        status = {}
+        for source, config in self.sportsbooks.items():
+            row = state.get(source) or {}
+            next_run = row.get('next_run')
+            status[source] = {
+                'name': config['name'],
+                'enabled': bool(config['enabled'] and config['function']),
+                'last_run': row.get('last_run'),
+                'last_success': row.get('last_success'),
+                'last_error': row.get('last_error'),
+                'consecutive_failures': row.get('consecutive_failures') or 0,
+                'last_count': row.get('last_count'),
+                'interval_seconds': row.get('interval_seconds'),
+                'next_run': dt.datetime.fromtimestamp(next_run).isoformat() if next_run else None
+            }
+        return status
+
+
+# Global instance
+gameline_scheduler = GamelineScheduler()
@@ -0,0 +1,236 @@
+import os
+import sys
+import sqlite3
+import logging
+
+from ncaafDatabase import get_connection, init_schema
+from ncaafTeamRegistry import canonical_id
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+STATS_DB_FILE = 'ncaaf_stats.db'
+LEGACY_STATS_DIR = 'ncaafDb'
+
+# Game log columns with their storage type. The first 33 are the legacy Stats
+# table, in order; the rest are the college gamelog columns added after it
+STAT_COLUMNS = [
+    ('Week', 'INTEGER'), ('Day', 'TEXT'), ('Date', 'TEXT'), ('OT', 'TEXT'),
+    ('Opp', 'TEXT'), ('Tm', 'INTEGER'), ('Opp2', 'INTEGER'),
+    ('Cmp', 'INTEGER'), ('Att', 'INTEGER'), ('PassYds', 'INTEGER'), ('PassTD', 'INTEGER'),
+    ('Int', 'INTEGER'), ('Sk', 'INTEGER'), ('SkYds', 'INTEGER'),
+    ('PassYA', 'REAL'), ('PassNYA', 'REAL'), ('CmpPct', 'REAL'), ('PasserRate', 'REAL'),
+    ('RushAtt', 'INTEGER'), ('RushYds', 'INTEGER'), ('RushYA', 'REAL'), ('RushTD', 'INTEGER'),
+    ('FGM', 'INTEGER'), ('FGA', 'INTEGER'), ('XPM', 'INTEGER'), ('XPA', 'INTEGER'),
+    ('Pnt', 'INTEGER'), ('PuntYds', 'INTEGER'),
+    ('ThirdDownConv', 'INTEGER'), ('ThirdDownAtt', 'INTEGER'),
+    ('FourthDownConv', 'INTEGER'), ('FourthDownAtt', 'INTEGER'), ('ToP', 'TEXT'),
+    ('Location', 'TEXT'), ('Result', 'TEXT'),
+    ('TotPlays', 'INTEGER'), ('TotYds', 'INTEGER'), ('TotYA', 'REAL'),
+    ('FirstDownPass', 'INTEGER'), ('FirstDownRush', 'INTEGER'), ('FirstDownPen', 'INTEGER'),
+    ('FirstDowns', 'INTEGER'), ('Penalties', 'INTEGER'), ('PenaltyYds', 'INTEGER'),
+    ('FumblesLost', 'INTEGER'), ('Turnovers', 'INTEGER'),
+]
+STAT_NAMES = [name for name, _ in STAT_COLUMNS]
+STAT_TYPES = dict(STAT_COLUMNS)
+
+
+def team_key(team):
+    """Store key for a team: its canonical id (the sports-reference slug)"""
+    return canonical_id(team)
+
+
+class GameLogStore:
+    """
+    Every scraped team game log in one table, one row per (team, season, week).
+    Re-scraping a season replaces its rows instead of appending duplicates.
+    """
+
+    def __init__(self, db_file=STATS_DB_FILE):
+        self.db_file = db_file
+        self.init_database()
+
+    def init_database(self):
+        """Create the game_logs table (runs once per process)"""
+        if init_schema(self.db_file, 'game_logs', self._create_schema):
+            logger.info("NCAAF stats store initialized")
+
+    @staticmethod
+    def _create_schema(conn):
+        columns = ',\n'.join(f'{name} {kind}' for name, kind in STAT_COLUMNS)
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS game_logs (
+                team TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                {columns},
+                opp_id TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (team, season, Week)
+            )
+        ''')
+        # Stores created before a column was added get it appended
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(game_logs)')}
+        for name, kind in STAT_COLUMNS:
+            if name not in existing:
+                conn.execute(f'ALTER TABLE game_logs ADD COLUMN {name} {kind}')
+        if 'opp_id' not in existing:
+            conn.execute('ALTER TABLE game_logs ADD COLUMN opp_id TEXT')
+        GameLogStore._refresh_opp_ids(conn)
+        # Cross-team reads: a whole week of a season, or every game against an opponent
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_game_logs_season_week ON game_logs (season, Week)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_game_logs_opp ON game_logs (Opp, season)')
+        # The opponent's row for a game: Week is a game number, so it's matched on Date
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_game_logs_team_date ON game_logs (team, season, Date)')
+
+    @staticmethod
+    def _refresh_opp_ids(conn):
+        """Resolve Opp to its canonical id for rows stored before opp_id existed (or before the registry knew the team)"""
+        opponents = [row[0] for row in conn.execute('SELECT DISTINCT Opp FROM game_logs WHERE Opp IS NOT NULL')]
+        conn.executemany(
+            'UPDATE game_logs SET opp_id = ? WHERE Opp = ? AND opp_id IS NOT ?',
+            [(canonical_id(opp), opp, canonical_id(opp)) for opp in opponents]
+        )
+
+    def upsert_games(self, team, season, games):
+        """
+        Insert or update game rows (dicts keyed by STAT_NAMES, or sequences in
+        STAT_NAMES order) for one team-season in a single transaction. Rows
+        without a week number (header rows, blanks) are skipped.
+        Returns the number of rows written.
+        """
+        rows = []
+        for game in games:
+            if isinstance(game, dict):
+                game = [game.get(name) for name in STAT_NAMES]
+            values = [None if value in ('', None) else value for value in game]
+            values += [None] * (len(STAT_NAMES) - len(values))
+            if not str(values[0]).isdigit():
+                continue
+            values[0] = int(values[0])
+            opp = values[STAT_NAMES.index('Opp')]
+            opp_id = canonical_id(str(opp)) if opp is not None else None
+            rows.append([team_key(team), int(season)] + values[:len(STAT_NAMES)] + [opp_id])
+
+        placeholders = ', '.join('?' for _ in range(len(STAT_NAMES) + 3))
+        updates = ', '.join(f'{name} = excluded.{name}' for name in STAT_NAMES[1:])
+        conn = get_connection(self.db_file)
+        with conn:
+            conn.executemany(f'''
+                INSERT INTO game_logs (team, season, {', '.join(STAT_NAMES)}, opp_id)
+                VALUES ({placeholders})
+                ON CONFLICT (team, season, Week) DO UPDATE SET
+                    {updates}, opp_id = excluded.opp_id, updated_at = CURRENT_TIMESTAMP
+            ''', rows)
+        return len(rows)
+
+    def read_games(self, team, season, last=None):
+        """Game rows (tuples in STAT_NAMES order) for a team-season by week, optionally only the last N"""
+        conn = get_connection(self.db_file)
+        query = f'''
+            SELECT {', '.join(STAT_NAMES)} FROM game_logs
+            WHERE team = ? AND season = ?
+            ORDER BY Week DESC
+        '''
+        params = [team_key(team), int(season)]
+        if last:
+            query += ' LIMIT ?'
+            params.append(last)
+        return conn.execute(query, params).fetchall()[::-1]
+
+    def read_opponent_games(self, team, season):
+        """
+        The opponents' own rows for the same games, where the opponent's season
+        has been scraped. Opponents are matched by canonical id (opp_id, stored
+        with each row) and games on Date: Week is each team's game number,
+        which differs between teams with byes in different weeks.
+        """
+        conn = get_connection(self.db_file)
+        columns = ', '.join(f'o.{name}' for name in STAT_NAMES)
+        return conn.execute(f'''
+            SELECT {columns} FROM game_logs g
+            JOIN game_logs o
+              ON o.team = g.opp_id
+             AND o.season = g.season
+             AND o.Date = g.Date
+            WHERE g.team = ? AND g.season = ?
+            ORDER BY g.Week
+        ''', (team_key(team), int(season))).fetchall()
+
+    def win_loss(self, team, season):
+        """(wins, losses) from the final scores of a team-season"""
+        conn = get_connection(self.db_file)
+        wins, losses = conn.execute('''
+            SELECT COALESCE(SUM(Tm > Opp2), 0), COALESCE(SUM(Tm < Opp2), 0)
+            FROM game_logs
+            WHERE team = ? AND season = ?
+              AND typeof(Tm) = 'integer' AND typeof(Opp2) = 'integer'
+        ''', (team_key(team), int(season))).fetchone()
+        return wins, losses
+
+    def stored_seasons(self):
+        """{(team, season): games stored} for every team-season in the store"""
+        conn = get_connection(self.db_file)
+        return {
+            (team, season): games
+            for team, season, games in conn.execute(
+                'SELECT team, season, COUNT(*) FROM game_logs GROUP BY team, season'
+            )
+        }
+
+    def summary(self):
+        """Row, team and season counts for health checks"""
+        conn = get_connection(self.db_file)
+        games, teams, first_season, last_season = conn.execute('''
+            SELECT COUNT(*), COUNT(DISTINCT team), MIN(season), MAX(season) FROM game_logs
+        ''').fetchone()
+        return {
+            "db_file": self.db_file,
+            "games": games,
+            "teams": teams,
+            "first_season": first_season,
+            "last_season": last_season
+        }
+
+    def migrate_legacy(self, directory=LEGACY_STATS_DIR):
+        """
+        Ingest the old per-file {team}-{year}-stats.db databases. Safe to re-run:
+        duplicate rows (from re-scrapes) collapse onto their week, newest wins.
+        """
+        result = {"files": 0, "games": 0, "skipped_files": []}
+        if not os.path.isdir(directory):
+            return result
+
+        for filename in sorted(os.listdir(directory)):
+            parts = filename[:-len('.db')].rsplit('-', 2) if filename.endswith('-stats.db') else []
+            if len(parts) != 3 or not parts[1].isdigit():
+                result["skipped_files"].append(filename)
+                continue
+            team, season = parts[0], int(parts[1])
+
+            try:
+                legacy = sqlite3.connect(os.path.join(directory, filename))
+                try:
+                    games = legacy.execute('SELECT * FROM Stats ORDER BY rowid').fetchall()
+                finally:
+                    legacy.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read {filename}: {e}")
+                result["skipped_files"].append(filename)
+                continue
+
+            result["files"] += 1
+            result["games"] += self.upsert_games(team, season, games)
+
+        logger.info(f"Migrated {result['games']} games from {result['files']} legacy stats files")
+        return result
+
+
+# Global instance
+game_log_store = GameLogStore()
+
+
+if __name__ == "__main__":
+    # python ncaafStats.py [legacy_dir]  - import ncaafDb/*.db into ncaaf_stats.db
+    logging.basicConfig(level=logging.INFO)
+    print(game_log_store.migrate_legacy(sys.argv[1] if len(sys.argv) > 1 else LEGACY_STATS_DIR))
+    print(game_log_store.summary())
@@ -0,0 +1,310 @@
+import re
+import difflib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+FUZZY_MATCH_CUTOFF = 0.9     # difflib ratio; "miami-oh" vs "miami-fl" is 0.875 and must not match
+# Bump when a TEAMS change renames stored teams; each database records the
+# version its team names were migrated to in PRAGMA user_version
+TEAM_NAMES_VERSION = 1
+
+# Canonical id (sports-reference school slug), display name, ESPN abbreviation, other aliases
+TEAMS = [
+    ("air-force", "Air Force", "AF", []),
+    ("akron", "Akron", "AKR", []),
+    ("alabama", "Alabama", "ALA", ["Bama"]),
+    ("alabama-birmingham", "UAB", "UAB", []),
+    ("appalachian-state", "Appalachian State", "APP", ["App State", "App St"]),
+    ("arizona", "Arizona", "ARIZ", []),
+    ("arizona-state", "Arizona State", "ASU", []),
+    ("arkansas", "Arkansas", "ARK", []),
+    ("arkansas-state", "Arkansas State", "ARST", []),
+    ("army", "Army", "ARMY", ["Army West Point"]),
+    ("auburn", "Auburn", "AUB", []),
+    ("ball-state", "Ball State", "BALL", []),
+    ("baylor", "Baylor", "BAY", []),
+    ("boise-state", "Boise State", "BSU", []),
+    ("boston-college", "Boston College", "BC", []),
+    ("bowling-green-state", "Bowling Green", "BGSU", ["Bowling Green State"]),
+    ("brigham-young", "BYU", "BYU", []),
+    ("buffalo", "Buffalo", "BUFF", []),
+    ("california", "California", "CAL", ["Cal"]),
+    ("central-florida", "UCF", "UCF", []),
+    ("central-michigan", "Central Michigan", "CMU", []),
+    ("charlotte", "Charlotte", "CLT", []),
+    ("cincinnati", "Cincinnati", "CIN", []),
+    ("clemson", "Clemson", "CLEM", []),
+    ("coastal-carolina", "Coastal Carolina", "CCU", []),
+    ("colorado", "Colorado", "COLO", []),
+    ("colorado-state", "Colorado State", "CSU", []),
+    ("connecticut", "Connecticut", "CONN", ["UConn"]),
+    ("delaware", "Delaware", "DEL", []),
+    ("duke", "Duke", "DUKE", []),
+    ("east-carolina", "East Carolina", "ECU", []),
+    ("eastern-illinois", "Eastern Illinois", "EIU", []),
+    ("eastern-michigan", "Eastern Michigan", "EMU", []),
+    ("florida", "Florida", "FLA", []),
+    ("florida-atlantic", "Florida Atlantic", "FAU", []),
+    ("florida-international", "Florida International", "FIU", []),
+    ("florida-state", "Florida State", "FSU", []),
+    ("fresno-state", "Fresno State", "FRES", []),
+    ("georgia", "Georgia", "UGA", []),
+    ("georgia-southern", "Georgia Southern", "GASO", []),
+    ("georgia-state", "Georgia State", "GAST", []),
+    ("georgia-tech", "Georgia Tech", "GT", []),
+    ("hawaii", "Hawaii", "HAW", ["Hawai'i"]),
+    ("houston", "Houston", "HOU", []),
+    ("illinois", "Illinois", "ILL", []),
+    ("indiana", "Indiana", "IU", []),
+    ("iowa", "Iowa", "IOWA", []),
+    ("iowa-state", "Iowa State", "ISU", []),
+    ("jacksonville-state", "Jacksonville State", "JVST", ["Jax State"]),
+    ("james-madison", "James Madison", "JMU", []),
+    ("kansas", "Kansas", "KU", []),
+    ("kansas-state", "Kansas State", "KSU", []),
+    ("kennesaw-state", "Kennesaw State", "KENN", []),
+    ("kent-state", "Kent State", "KENT", []),
+    ("kentucky", "Kentucky", "UK", []),
+    ("liberty", "Liberty", "LIB", []),
+    ("louisiana-lafayette", "Louisiana", "UL", ["Louisiana-Lafayette", "Louisiana Ragin' Cajuns", "ULL"]),
+    ("louisiana-monroe", "Louisiana-Monroe", "ULM", ["UL Monroe"]),
+    ("louisiana-state", "LSU", "LSU", []),
+    ("louisiana-tech", "Louisiana Tech", "LT", []),
+    ("louisville", "Louisville", "LOU", []),
+    ("marshall", "Marshall", "MRSH", []),
+    ("maryland", "Maryland", "MD", []),
+    ("massachusetts", "Massachusetts", "MASS", ["UMass"]),
+    ("memphis", "Memphis", "MEM", []),
+    ("miami-fl", "Miami", "MIA", ["Miami (FL)", "Miami FL", "Miami Florida"]),
+    ("miami-oh", "Miami (OH)", "M-OH", ["Miami OH", "Miami Ohio", "Miami (Ohio)"]),
+    ("michigan", "Michigan", "MICH", []),
+    ("michigan-state", "Michigan State", "MSU", []),
+    ("middle-tennessee-state", "Middle Tennessee", "MTSU", ["Middle Tennessee State"]),
+    ("minnesota", "Minnesota", "MINN", []),
+    ("mississippi", "Mississippi", "MISS", ["Ole Miss"]),
+    ("mississippi-state", "Mississippi State", "MSST", []),
+    ("missouri", "Missouri", "MIZ", ["Mizzou"]),
+    ("missouri-state", "Missouri State", "MOST", []),
+    ("navy", "Navy", "NAVY", []),
+    ("nebraska", "Nebraska", "NEB", []),
+    ("nevada", "Nevada", "NEV", []),
+    ("nevada-las-vegas", "UNLV", "UNLV", ["Nevada-Las Vegas"]),
+    ("new-mexico", "New Mexico", "UNM", []),
+    ("new-mexico-state", "New Mexico State", "NMSU", []),
+    ("north-carolina", "North Carolina", "UNC", []),
+    ("north-carolina-state", "NC State", "NCST", ["North Carolina State"]),
+    ("north-texas", "North Texas", "UNT", []),
+    ("northern-illinois", "Northern Illinois", "NIU", []),
+    ("northwestern", "Northwestern", "NU", []),
+    ("notre-dame", "Notre Dame", "ND", []),
+    ("ohio", "Ohio", "OHIO", []),
+    ("ohio-state", "Ohio State", "OSU", []),
+    ("oklahoma", "Oklahoma", "OU", []),
+    ("oklahoma-state", "Oklahoma State", "OKST", []),
+    ("old-dominion", "Old Dominion", "ODU", []),
+    ("oregon", "Oregon", "ORE", []),
+    ("oregon-state", "Oregon State", "ORST", []),
+    ("penn-state", "Penn State", "PSU", []),
+    ("pittsburgh", "Pittsburgh", "PITT", ["Pitt"]),
+    ("purdue", "Purdue", "PUR", []),
+    ("rice", "Rice", "RICE", []),
+    ("rutgers", "Rutgers", "RUTG", []),
+    ("sam-houston-state", "Sam Houston", "SHSU", ["Sam Houston State"]),
+    ("samford", "Samford", "SAM", []),
+    ("san-diego-state", "San Diego State", "SDSU", []),
+    ("san-jose-state", "San Jose State", "SJSU", ["San José State"]),
+    ("south-alabama", "South Alabama", "USA", []),
+    ("south-carolina", "South Carolina", "SC", []),
+    ("south-florida", "South Florida", "USF", []),
+    ("southern-california", "USC", "USC", ["Southern California", "Southern Cal"]),
+    ("southern-methodist", "SMU", "SMU", ["Southern Methodist"]),
+    ("southern-mississippi", "Southern Miss", "USM", ["Southern Mississippi"]),
+    ("stanford", "Stanford", "STAN", []),
+    ("syracuse", "Syracuse", "SYR", []),
+    ("temple", "Temple", "TEM", []),
+    ("tennessee", "Tennessee", "TENN", []),
+    ("texas", "Texas", "TEX", []),
+    ("texas-am", "Texas A&M", "TA&M", ["Texas AM"]),
+    ("texas-christian", "TCU", "TCU", ["Texas Christian"]),
+    ("texas-el-paso", "UTEP", "UTEP", []),
+    ("texas-san-antonio", "UTSA", "UTSA", []),
+    ("texas-state", "Texas State", "TXST", []),
+    ("texas-tech", "Texas Tech", "TTU", []),
+    ("toledo", "Toledo", "TOL", []),
+    ("troy", "Troy", "TROY", []),
+    ("tulane", "Tulane", "TULN", []),
+    ("tulsa", "Tulsa", "TLSA", []),
+    ("ucla", "UCLA", "UCLA", []),
+    ("utah", "Utah", "UTAH", []),
+    ("utah-state", "Utah State", "USU", []),
+    ("vanderbilt", "Vanderbilt", "VAN", []),
+    ("virginia", "Virginia", "UVA", []),
+    ("virginia-tech", "Virginia Tech", "VT", []),
+    ("wake-forest", "Wake Forest", "WAKE", []),
+    ("washington", "Washington", "WASH", []),
+    ("washington-state", "Washington State", "WSU", []),
+    ("west-virginia", "West Virginia", "WVU", []),
+    ("western-kentucky", "Western Kentucky", "WKU", []),
+    ("western-michigan", "Western Michigan", "WMU", []),
+    ("wisconsin", "Wisconsin", "WIS", []),
+    ("wyoming", "Wyoming", "WYO", []),
+]
+
+# "5 Ohio State", "#5 Ohio State", "(5) Ohio State"
+_RANK_PREFIX = re.compile(r'^\s*(?:#\s*\d+|\(\d+\)|\d+)\s+')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def clean_team_text(name):
+    """Scraped team text without a rankings prefix or surrounding whitespace"""
+    return _RANK_PREFIX.sub('', name or '').strip()
+
+
+def alias_key(name):
+    """Lookup key for any spelling: rank-stripped, lowercase, hyphen-separated"""
+    text = clean_team_text(name).lower().replace('&', '').replace("'", '').replace('.', '')
+    return _NON_ALNUM.sub('-', text).strip('-')
+
+
+class TeamRegistry:
+    """
+    One canonical id per team (the sports-reference slug) and hash maps from
+    every known alias to it: display names, slugs, ESPN abbreviations, "St."
+    spellings and the aliases in TEAMS. Anything else goes through a difflib
+    match against the alias keys once, and the answer (hit or miss) is memoized.
+    Unknown teams resolve to their own alias key, so they still join exactly.
+    """
+
+    def __init__(self, teams=TEAMS):
+        self.names = {}
+        self.abbreviations = {}
+        self.aliases = {}
+        for team_id, name, abbreviation, aliases in teams:
+            self.names[team_id] = name
+            self.abbreviations[team_id] = abbreviation
+            for alias in [team_id, name, abbreviation, *aliases]:
+                self._add_alias(alias, team_id)
+                if alias.endswith(' State'):
+                    self._add_alias(alias[:-len('State')] + 'St', team_id)
+        self._alias_keys = list(self.aliases)
+        self._fuzzy = {}
+        self._fuzzy_lock = threading.Lock()
+
+    def _add_alias(self, alias, team_id):
+        key = alias_key(alias)
+        existing = self.aliases.setdefault(key, team_id)
+        if existing != team_id:
+            logger.warning(f"Team alias {alias!r} is claimed by {existing} and {team_id}")
+
+    def resolve(self, name):
+        """Canonical id for a known team, None when nothing matches"""
+        key = alias_key(name)
+        if not key:
+            return None
+        team_id = self.aliases.get(key)
+        if team_id is not None:
+            return team_id
+
+        with self._fuzzy_lock:
+            if key in self._fuzzy:
+                return self._fuzzy[key]
+        matches = difflib.get_close_matches(key, self._alias_keys, n=1, cutoff=FUZZY_MATCH_CUTOFF)
+        team_id = self.aliases[matches[0]] if matches else None
+        if team_id:
+            logger.info(f"Fuzzy matched team {name!r} to {team_id}")
+        with self._fuzzy_lock:
+            self._fuzzy[key] = team_id
+        return team_id
+
+    def canonical_id(self, name):
+        """Join/store key for a team: its canonical id, or its alias key if unknown"""
+        return self.resolve(name) or alias_key(name)
+
+    def canonical_name(self, name):
+        """Display name stored in gamelines/events/schedule rows (cleaned input if unknown)"""
+        team_id = self.resolve(name)
+        return self.names[team_id] if team_id else clean_team_text(name)
+
+    def display_names(self):
+        return sorted(self.names.values())
+
+
+# Global instance
+team_registry = TeamRegistry()
+canonical_id = team_registry.canonical_id
+canonical_name = team_registry.canonical_name
+
+
+def _unique_key(conn, table):
+    """Columns of the table's UNIQUE(...) constraint"""
+    for _, name, unique, origin, *_ in conn.execute(f'PRAGMA index_list({table})'):
+        if unique and origin == 'u':
+            return [row[2] for row in conn.execute(f'PRAGMA index_info({name})')]
+    raise ValueError(f"{table} has no UNIQUE constraint")
+
+
+def canonicalize_stored_teams(conn, table):
+    """
+    Rewrite home_team/away_team values in table to canonical display names.
+    A row that would collide with one already stored under the canonical
+    names is merged with it: the most recently updated of the two is kept,
+    its NULL columns filled from the other, and the other is dropped (and
+    logged). Returns the number of rows renamed or merged.
+    """
+    names = [row[0] for row in conn.execute(f'SELECT home_team FROM {table} UNION SELECT away_team FROM {table}')]
+    renames = {name: canonical_name(name) for name in names if name and canonical_name(name) != name}
+    if not renames:
+        return 0
+
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+    key = _unique_key(conn, table)
+    recency = 'updated_at' if 'updated_at' in columns else 'row_id'
+    fill = [name for name in columns if name not in key and name not in ('id', 'created_at', 'updated_at')]
+    matches = ' AND '.join(f'{name} = ?' for name in key)
+    placeholders = ', '.join('?' for _ in renames)
+
+    cursor = conn.execute(
+        f'SELECT rowid AS row_id, * FROM {table} WHERE home_team IN ({placeholders}) OR away_team IN ({placeholders})',
+        [*renames, *renames]
+    )
+    fields = [col[0] for col in cursor.description]
+    rows = [dict(zip(fields, row)) for row in cursor.fetchall()]
+
+    merged = 0
+    for row in rows:
+        home = renames.get(row['home_team'], row['home_team'])
+        away = renames.get(row['away_team'], row['away_team'])
+        target = {**row, 'home_team': home, 'away_team': away}
+        existing = conn.execute(f'SELECT rowid AS row_id, * FROM {table} WHERE {matches}', [target[name] for name in key]).fetchone()
+        if existing is None:
+            conn.execute(f'UPDATE {table} SET home_team = ?, away_team = ? WHERE rowid = ?', (home, away, row['row_id']))
+            continue
+
+        existing = dict(zip(fields, existing))
+        keep, drop = sorted((row, existing), key=lambda r: (r[recency] or '', r['row_id']), reverse=True)
+        values = [keep[name] if keep[name] is not None else drop[name] for name in fill]
+        conn.execute(f'DELETE FROM {table} WHERE rowid = ?', (drop['row_id'],))
+        conn.execute(
+            f'UPDATE {table} SET home_team = ?, away_team = ?, {", ".join(f"{name} = ?" for name in fill)} WHERE rowid = ?',
+            [home, away, *values, keep['row_id']]
+        )
+        merged += 1
+        logger.warning(f"Merged duplicate {table} row into row {keep['row_id']} ({away} at {home}), dropped: {drop}")
+
+    logger.info(f"Canonicalized {len(renames)} team names in {table}: {len(rows)} rows, {merged} merged")
+    return len(rows)
+
+
+def migrate_stored_teams(conn, tables):
+    """
+    Canonicalize team names in tables (all in conn's main database) unless
+    the database is already at TEAM_NAMES_VERSION. Returns the rows changed.
+    """
+    if conn.execute('PRAGMA user_version').fetchone()[0] >= TEAM_NAMES_VERSION:
+        return 0
+    changed = sum(canonicalize_stored_teams(conn, table) for table in tables)
+    conn.execute(f'PRAGMA user_version = {TEAM_NAMES_VERSION}')
+    return changed
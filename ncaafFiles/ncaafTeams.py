@@ -1,12 +1,4 @@
-import datetime as dt
-import sqlite3
-import pandas as pd
-import os
-
-dirname = os.path.dirname(__file__)
-
-now = dt.datetime.now()
-todays_date = dt.date(now.year, now.month, now.day)
+from ncaafStats import game_log_store, STAT_NAMES
 
 class NcaafTeam:
     w = 0
@@ -15,15 +7,7 @@ class NcaafTeam:
     def __init__(self, Name='', **kwargs):
         self.name = Name
         # Initialize all stats attributes
-        stats_attrs = [
-            'Week', 'Day', 'Date', 'OT', 'Opp', 'Tm', 'Opp2', 'Cmp', 'Att', 
-            'PassYds', 'PassTD', 'Int', 'Sk', 'SkYds', 'PassYA', 'PassNYA', 
-            'CmpPct', 'PasserRate', 'RushAtt', 'RushYds', 'RushYA', 'RushTD',
-            'FGM', 'FGA', 'XPM', 'XPA', 'Pnt', 'PuntYds', 'ThirdDownConv',
-            'ThirdDownAtt', 'FourthDownConv', 'FourthDownAtt', 'ToP'
-        ]
-        
-        for attr in stats_attrs:
+        for attr in STAT_NAMES:
             setattr(self, attr.lower(), '')
             
         # Set attributes from kwargs
@@ -35,35 +19,51 @@ class NcaafTeam:
         """Get all stats for a team"""
         self.w = 0
         self.l = 0
-        filename = os.path.join(dirname, f'ncaafDb/{team}-{year}-stats.db')
-        
-        if not os.path.exists(filename):
-            print(f"Database file not found: {filename}")
-            return None
-            
-        conn = sqlite3.connect(filename)
-        cur = conn.cursor()
         
         try:
-            cur.execute('SELECT * FROM Stats')
-            rows = cur.fetchall()
-            conn.close()
+            selected_team = game_log_store.read_games(team, year)
             
-            if not rows:
+            if not selected_team:
+                print(f"No stored games for {team} {year}")
                 return None
                 
             # Return both team stats and opponent stats
-            mid_point = len(rows) // 2
-            selected_team = rows[:mid_point]
-            opp_team = rows[mid_point:]
+            opp_team = game_log_store.read_opponent_games(team, year)
             
             return [selected_team, opp_team]
             
         except Exception as e:
             print(f"Error reading stats: {e}")
-            conn.close()
             return None
 
+    def season_report(self, team, year):
+        """
+        A stored team-season as {games, summary} (games are dicts keyed by
+        STAT_NAMES), or None if the season hasn't been scraped
+        """
+        games = [dict(zip(STAT_NAMES, row)) for row in game_log_store.read_games(team, year)]
+        if not games:
+            return None
+
+        wins, losses = self.calculate_win_loss(team, year)
+
+        def per_game(column):
+            values = [game[column] for game in games if isinstance(game[column], (int, float))]
+            return round(sum(values) / len(values), 1) if values else None
+
+        return {
+            "team": team,
+            "year": year,
+            "games": games,
+            "summary": {
+                "record": f"{wins}-{losses}",
+                "points_per_game": per_game('Tm'),
+                "points_against_per_game": per_game('Opp2'),
+                "pass_yards_per_game": per_game('PassYds'),
+                "rush_yards_per_game": per_game('RushYds'),
+            },
+        }
+
     def last2(self, team, year):
         """Get last 2 games stats"""
         return self._get_recent_games(team, year, 2)
@@ -81,78 +81,27 @@ class NcaafTeam:
         self.w = 0
         self.l = 0
         
-        filename = os.path.join(dirname, f'ncaafDb/{team}-{year}-stats.db')
-        
-        if not os.path.exists(filename):
-            print(f"Database file not found: {filename}")
-            return False
-            
-        conn = sqlite3.connect(filename)
-        
         try:
-            # Read data into pandas DataFrame
-            query = "SELECT * FROM Stats"
-            team_stats = pd.read_sql_query(query, conn)
-            conn.close()
+            recent_games = game_log_store.read_games(team, year, last=num_games)
             
-            if len(team_stats) < num_games:
-                print(f"Not enough games found. Have {len(team_stats)}, need {num_games}")
+            if len(recent_games) < num_games:
+                print(f"Not enough games found. Have {len(recent_games)}, need {num_games}")
                 return False
             
-            # Define column names based on database structure
-            columns = [
-                'Week', 'Day', 'Date', 'OT', 'Opp', 'Tm', 'Opp2', 'Cmp', 'Att',
-                'PassYds', 'PassTD', 'Int', 'Sk', 'SkYds', 'PassYA', 'PassNYA',
-                'CmpPct', 'PasserRate', 'RushAtt', 'RushYds', 'RushYA', 'RushTD',
-                'FGM', 'FGA', 'XPM', 'XPA', 'Pnt', 'PuntYds', 'ThirdDownConv',
-                'ThirdDownAtt', 'FourthDownConv', 'FourthDownAtt', 'ToP'
-            ]
-            
-            team_stats.columns = columns
-            
-            # Get recent games
-            recent_games = team_stats.tail(num_games)
-            
             # Set attributes for recent games
-            for col in columns:
-                setattr(self, col.lower(), recent_games[col].tolist())
+            for index, col in enumerate(STAT_NAMES):
+                setattr(self, col.lower(), [game[index] for game in recent_games])
             
             return True
             
         except Exception as e:
             print(f"Error getting recent games: {e}")
-            conn.close()
             return False
 
     def calculate_win_loss(self, team, year):
         """Calculate win-loss record from database"""
-        filename = os.path.join(dirname, f'ncaafDb/{team}-{year}-stats.db')
-        
-        if not os.path.exists(filename):
-            return 0, 0
-            
-        conn = sqlite3.connect(filename)
-        
         try:
-            team_stats = pd.read_sql_query("SELECT * FROM Stats", conn)
-            conn.close()
-            
-            # Simple win-loss calculation based on scores
-            # This would need adjustment based on actual data structure
-            wins = 0
-            losses = 0
-            
-            for _, game in team_stats.iterrows():
-                try:
-                    tm_score = int(game['Tm']) if game['Tm'] and game['Tm'].isdigit() else 0
-                    opp_score = int(game['Opp2']) if game['Opp2'] and game['Opp2'].isdigit() else 0
-                    
-                    if tm_score > opp_score:
-                        wins += 1
-                    elif tm_score < opp_score:
-                        losses += 1
-                except (ValueError, KeyError):
-                    continue
+            wins, losses = game_log_store.win_loss(team, year)
             
             self.w = wins
             self.l = losses